@@ -0,0 +1,173 @@
+"""Per-user event stream behind GET /api/events.
+
+Routes publish small events (timer started/stopped, entries changed) for a
+user; every open stream of that user receives them. ``EventHub`` fans events
+out to the subscribers connected to this process, and an ``EventBroker``
+carries them between processes:
+
+- ``LocalBroker`` hands events straight back to the hub (single worker).
+- ``MongoBroker`` appends them to a capped collection that every worker
+  tails, so a timer started through one worker reaches tabs connected to
+  another.
+
+``create_event_hub()`` picks the broker from the EVENT_BROKER environment
+variable (``local`` by default).
+"""
+
+import asyncio
+import logging
+import os
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before it is considered too slow and told to resync
+EVENT_QUEUE_SIZE = 100
+
+Deliver = Callable[[str, dict], Awaitable[None]]
+
+
+class EventBroker(ABC):
+    """Transport between publishers and the hubs of every worker process."""
+
+    @abstractmethod
+    async def publish(self, user_id: str, event: dict):
+        ...
+
+    @abstractmethod
+    async def start(self, deliver: Deliver):
+        """Begin passing every published event (from any worker) to ``deliver``."""
+
+    async def stop(self):
+        pass
+
+
+class LocalBroker(EventBroker):
+    def __init__(self):
+        self.deliver: Optional[Deliver] = None
+
+    async def publish(self, user_id, event):
+        if self.deliver:
+            await self.deliver(user_id, event)
+
+    async def start(self, deliver):
+        self.deliver = deliver
+
+
+class MongoBroker(EventBroker):
+    """Fan-out across workers through a capped collection and tailable cursors."""
+
+    def __init__(self, db, collection: str = "events", size_bytes: int = 16 * 1024 * 1024, retry_seconds: float = 1.0):
+        self.db = db
+        self.collection_name = collection
+        self.size_bytes = size_bytes
+        self.retry_seconds = retry_seconds
+        self.task: Optional[asyncio.Task] = None
+
+    async def publish(self, user_id, event):
+        await self.db[self.collection_name].insert_one({"user_id": user_id, "event": event})
+
+    async def start(self, deliver):
+        from pymongo.errors import CollectionInvalid
+
+        try:
+            await self.db.create_collection(self.collection_name, capped=True, size=self.size_bytes)
+        except CollectionInvalid:
+            pass
+        self.task = asyncio.create_task(self._tail(deliver))
+
+    async def stop(self):
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+    async def _tail(self, deliver):
+        from pymongo import CursorType, DESCENDING
+
+        collection = self.db[self.collection_name]
+        # A tailable cursor on an empty capped collection dies at once, so make sure there is a marker
+        latest = await collection.find_one(sort=[("$natural", DESCENDING)])
+        if latest is None:
+            await collection.insert_one({"user_id": None, "event": None})
+            latest = await collection.find_one(sort=[("$natural", DESCENDING)])
+        last_id = latest["_id"]
+
+        while True:
+            try:
+                cursor = collection.find({"_id": {"$gt": last_id}}, cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive:
+                    async for doc in cursor:
+                        last_id = doc["_id"]
+                        if doc.get("event"):
+                            await deliver(doc["user_id"], doc["event"])
+                    await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Event tail interrupted: %s", e)
+            await asyncio.sleep(self.retry_seconds)
+
+
+class EventHub:
+    def __init__(self, broker: EventBroker):
+        self.broker = broker
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    async def start(self):
+        await self.broker.start(self.deliver)
+
+    async def stop(self):
+        await self.broker.stop()
+
+    async def publish(self, user_id: str, event_type: str, data: Optional[dict] = None):
+        # Serialized once here so brokers and subscribers only ever move strings
+        event = {"type": event_type, "data": orjson.dumps(data or {}, option=orjson.OPT_UTC_Z).decode()}
+        try:
+            await self.broker.publish(user_id, event)
+        except Exception as e:
+            # The write that triggered the event already succeeded; clients resync on reconnect
+            logger.warning("Could not publish %s event: %s", event_type, e)
+
+    async def deliver(self, user_id: str, event: dict):
+        for queue in self.subscribers.get(user_id, ()):
+            if queue.full():
+                # Drop the backlog of a slow client and tell it to refetch instead
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"type": "resync", "data": "{}"})
+            else:
+                queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: str):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self.subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self.subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self.subscribers[user_id]
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self.subscribers),
+            "connections": sum(len(queues) for queues in self.subscribers.values())
+        }
+
+
+def create_event_hub(storage) -> EventHub:
+    broker = os.environ.get('EVENT_BROKER', 'local').lower()
+    if broker == 'local':
+        return EventHub(LocalBroker())
+    if broker == 'mongo':
+        db = getattr(storage, "db", None)
+        if db is None:
+            raise ValueError("EVENT_BROKER=mongo requires STORAGE_BACKEND=mongo")
+        return EventHub(MongoBroker(db))
+    raise ValueError(f"Unknown EVENT_BROKER: {broker}")
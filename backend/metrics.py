@@ -0,0 +1,196 @@
+"""Prometheus metrics behind GET /metrics.
+
+- ``MetricsMiddleware`` times every HTTP request by method, route template
+  (``/api/entries/{entry_id}``, never the raw path) and status, and tracks
+  requests in flight.
+- ``MongoCommandMetrics`` is a PyMongo command listener timing every database
+  command by command name and collection.
+- ``MongoPoolMetrics`` is a PyMongo pool listener tracking open and checked-out
+  connections, checkout waits and failures per server.
+
+``register_mongo_listeners()`` must run before the Motor client is created.
+Each worker process keeps its own numbers; when PROMETHEUS_MULTIPROC_DIR is
+set (one empty directory shared by all workers) ``render()`` merges them.
+"""
+
+import os
+import threading
+import time
+from typing import Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from pymongo import monitoring
+
+# Long-lived event streams would swamp the latency histograms and the in-flight gauge
+UNTIMED_PATHS = frozenset({"/api/events"})
+
+# Database commands are mostly sub-millisecond, so the buckets start lower than the HTTP ones
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled",
+    ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time from receiving an HTTP request to sending the last byte of its response",
+    ["method", "route", "status"]
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled",
+    ["method"], multiprocess_mode="livesum"
+)
+
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command round trips as reported by the driver",
+    ["command", "collection"], buckets=MONGO_BUCKETS
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongo_command_failures_total", "MongoDB commands that returned an error",
+    ["command", "collection"]
+)
+
+MONGO_POOL_CONNECTIONS = Gauge(
+    "mongo_pool_connections", "Open connections in the driver pool",
+    ["address"], multiprocess_mode="livesum"
+)
+MONGO_POOL_CHECKED_OUT = Gauge(
+    "mongo_pool_checked_out_connections", "Pool connections currently checked out by an operation",
+    ["address"], multiprocess_mode="livesum"
+)
+MONGO_POOL_CHECKOUTS = Counter(
+    "mongo_pool_checkouts_total", "Connections checked out of the pool",
+    ["address"]
+)
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "mongo_pool_checkout_wait_seconds", "Time an operation waited for a pool connection",
+    ["address"], buckets=MONGO_BUCKETS
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures_total", "Pool checkouts that failed (timeout, pool closed, connection error)",
+    ["address", "reason"]
+)
+
+
+def address_label(address: Tuple[str, int]) -> str:
+    return f"{address[0]}:{address[1]}"
+
+
+class MetricsMiddleware:
+    """Plain ASGI middleware, so streamed responses pass through untouched."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in UNTIMED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            # The router leaves the matched route in the scope; unmatched paths share one label
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUESTS.labels(method, route, status).inc()
+            HTTP_LATENCY.labels(method, route, status).observe(elapsed)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def __init__(self):
+        # Only the started event carries the command document, so its collection is kept until the reply
+        self.collections = {}
+
+    @staticmethod
+    def collection_of(event: monitoring.CommandStartedEvent) -> str:
+        if event.command_name == "getMore":
+            return event.command.get("collection", "")
+        target = event.command.get(event.command_name)
+        # Database-level commands (ping, aggregate: 1, ...) have no collection
+        return target if isinstance(target, str) else ""
+
+    def started(self, event):
+        self.collections[(event.connection_id, event.request_id)] = self.collection_of(event)
+
+    def succeeded(self, event):
+        collection = self.collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_LATENCY.labels(event.command_name, collection).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        collection = self.collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_LATENCY.labels(event.command_name, collection).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(event.command_name, collection).inc()
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        # A checkout starts and finishes on the same driver thread
+        self.local = threading.local()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        MONGO_POOL_CONNECTIONS.labels(address_label(event.address)).inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        MONGO_POOL_CONNECTIONS.labels(address_label(event.address)).dec()
+
+    def connection_check_out_started(self, event):
+        self.local.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self.local.started = None
+        MONGO_POOL_CHECKOUT_FAILURES.labels(address_label(event.address), event.reason).inc()
+
+    def connection_checked_out(self, event):
+        address = address_label(event.address)
+        started = getattr(self.local, "started", None)
+        if started is not None:
+            MONGO_POOL_CHECKOUT_WAIT.labels(address).observe(time.perf_counter() - started)
+            self.local.started = None
+        MONGO_POOL_CHECKOUTS.labels(address).inc()
+        MONGO_POOL_CHECKED_OUT.labels(address).inc()
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_CHECKED_OUT.labels(address_label(event.address)).dec()
+
+
+def register_mongo_listeners():
+    monitoring.register(MongoCommandMetrics())
+    monitoring.register(MongoPoolMetrics())
+
+
+def render() -> Tuple[bytes, str]:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,30 @@
+"""Rebuild the daily_rollups collection (and project counters) from time_entries.
+
+The server builds them once on its own at startup (the "daily_rollups"
+migration); this script is for repairing them by hand afterwards.
+
+Usage: python rebuild_rollups.py [user_id]
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from storage import create_storage
+
+load_dotenv(Path(__file__).parent / '.env')
+
+
+async def main():
+    user_id = sys.argv[1] if len(sys.argv) > 1 else None
+    # Its own connection, without the server's startup work (index builds, migrations, event broker)
+    storage = create_storage()
+    written = await storage.summaries.rebuild_rollups(user_id)
+    scope = f"user {user_id}" if user_id else "all users"
+    print(f"✅ Rebuilt {written} daily rollups for {scope}")
+    await storage.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
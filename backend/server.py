@@ -1,42 +1,105 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
-from typing import List, Optional
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, ValidationError, model_validator
+from typing import List, Literal, Optional
+from collections import OrderedDict
+import time
+from concurrent.futures import ThreadPoolExecutor
 import uuid
+import asyncio
+import base64
+import hashlib
+import json
 from datetime import datetime, timezone, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import jwt
 from passlib.context import CryptContext
 import io
 import csv
-from fastapi.responses import StreamingResponse
+import codecs
+import zlib
+import tempfile
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
+from storage import TimerConflict, as_datetime, bucket_start, create_storage, local_day_bounds, next_bucket, tokenize
+from events import create_event_hub
+from metrics import MetricsMiddleware, register_mongo_listeners, render as render_metrics
 
-import certifi
+# Driver listeners only see clients created after they are registered
+register_mongo_listeners()
 
-client = AsyncIOMotorClient(
-    mongo_url,
-    tls=True,
-    tlsCAFile=certifi.where()
-)
+# STORAGE_BACKEND=memory swaps MongoDB for process-local storage (benchmarks, offline profiling)
+storage = create_storage()
 
-db = client[os.environ['DB_NAME']]
+# Per-user event streams; EVENT_BROKER=mongo fans events out across worker processes
+events = create_event_hub(storage)
 
 # Security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Changing BCRYPT_ROUNDS makes existing hashes "need update"; they are rehashed on the next login
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '4'))
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
+# bcrypt releases the GIL, so a small dedicated pool hashes in parallel without blocking the event loop
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
 SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
+# The event stream's token travels in the URL (and so into access logs), so it is scoped to the stream and short-lived
+STREAM_TOKEN_EXPIRE_SECONDS = 60
+STREAM_TOKEN_SCOPE = "events"
+
+# Rows pulled from the cursor per round trip, and per chunk written to the client, by exports
+EXPORT_BATCH_SIZE = 1000
+
+# Rows per insert_many (and rollup write) during bulk import; only the first errors are echoed back
+BULK_IMPORT_BATCH_SIZE = 1000
+BULK_IMPORT_MAX_ERRORS = 100
+
+# Upper bound on ids per batch update/delete request
+BATCH_MAX_ENTRIES = 500
+
+# Query words beyond this are ignored; deep pages of a ranked search get no cheaper, so offsets are bounded
+SEARCH_MAX_WORDS = 8
+SEARCH_MAX_OFFSET = 1000
+
+# Upper bound on buckets returned by one range summary (about 2.7 years of days)
+SUMMARY_MAX_BUCKETS = 1000
+
+# Authenticated-user cache; the TTL bounds how long another worker's role/profile change can go unseen
+USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', '60'))
+USER_CACHE_MAX_SIZE = int(os.environ.get('USER_CACHE_MAX_SIZE', '10000'))
+
+# Suggestions are cached by ETag, so a cached answer is never stale; the TTL only ages out superseded versions
+SUGGEST_CACHE_TTL_SECONDS = 300
+SUGGEST_CACHE_MAX_SIZE = 10000
+
+# When set, GET /metrics requires "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# Comment line sent on idle event streams so proxies don't close them
+EVENT_KEEPALIVE_SECONDS = 15
+
+# Entries moved per step of a project-delete job; a worker holds a job for the lease and renews it every step
+PROJECT_DELETE_BATCH_SIZE = 500
+PROJECT_DELETE_LEASE_SECONDS = 60
+
+# Lease owner for background jobs run by this process
+WORKER_ID = uuid.uuid4().hex
 
 security = HTTPBearer()
 
@@ -70,6 +133,10 @@ class Token(BaseModel):
     token_type: str = "bearer"
     user: User
 
+class StreamToken(BaseModel):
+    token: str
+    expires_in: int
+
 class ProjectCreate(BaseModel):
     name: str
     color: str = "#4F46E5"
@@ -79,6 +146,24 @@ class Project(ProjectCreate):
     id: str
     user_id: str
     created_at: datetime
+    # Completed entries only, kept up to date with the daily rollups; last_used is the latest start time
+    # added to the project and is not walked back when entries leave it (a rollup rebuild resets it)
+    total_duration: int = 0
+    entries_count: int = 0
+    last_used: Optional[datetime] = None
+
+class Job(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    type: str
+    status: Literal["pending", "running", "completed", "failed"]
+    project_id: Optional[str] = None
+    reassign_to: Optional[str] = None
+    total: int = 0
+    processed: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
 
 class TimeEntryCreate(BaseModel):
     task_name: str
@@ -86,12 +171,45 @@ class TimeEntryCreate(BaseModel):
     project_id: Optional[str] = None
     tags: List[str] = []
 
+class TimeEntryImport(TimeEntryCreate):
+    start_time: datetime
+    end_time: datetime
+
+    @model_validator(mode="after")
+    def check_times(self):
+        # Naive timestamps from other trackers are taken as UTC
+        if self.start_time.tzinfo is None:
+            self.start_time = self.start_time.replace(tzinfo=timezone.utc)
+        if self.end_time.tzinfo is None:
+            self.end_time = self.end_time.replace(tzinfo=timezone.utc)
+        if self.end_time < self.start_time:
+            raise ValueError("end_time is before start_time")
+        return self
+
+class BulkImportError(BaseModel):
+    row: int  # 1-based position among the uploaded rows
+    error: str
+
+class BulkImportResult(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[BulkImportError]
+
 class TimeEntryUpdate(BaseModel):
     task_name: Optional[str] = None
     description: Optional[str] = None
     project_id: Optional[str] = None
     tags: Optional[List[str]] = None
 
+class TimeEntryBatchUpdateItem(TimeEntryUpdate):
+    id: str
+
+class TimeEntryBatchUpdate(BaseModel):
+    entries: List[TimeEntryBatchUpdateItem] = Field(..., min_length=1, max_length=BATCH_MAX_ENTRIES)
+
+class TimeEntryBatchDelete(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=BATCH_MAX_ENTRIES)
+
 class TimeEntry(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str
@@ -106,6 +224,19 @@ class TimeEntry(BaseModel):
     is_running: bool = False
     created_at: datetime
 
+class TimeEntryPage(BaseModel):
+    entries: List[TimeEntry]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+class BatchItemResult(BaseModel):
+    id: str
+    status: Literal["updated", "deleted", "not_found"]
+    entry: Optional[TimeEntry] = None
+
+class BatchResult(BaseModel):
+    results: List[BatchItemResult]
+
 class TimerStart(BaseModel):
     task_name: str
     description: Optional[str] = ""
@@ -124,13 +255,49 @@ class AdminUserStats(BaseModel):
     total_duration: int
     last_activity: Optional[datetime] = None
 
+class AdminUserPage(BaseModel):
+    users: List[AdminUserStats]
+    total: int
+    skip: int
+    limit: int
+
 # ==================== Helper Functions ====================
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.hash, password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> tuple:
+    """Returns (valid, new_hash); new_hash is set when the stored hash uses an outdated cost."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.verify_and_update, plain_password, hashed_password)
+
+def entry_row(entry: dict) -> dict:
+    # The one decoder from a stored entry to its API shape, shared by every route that returns entries
+    return {
+        "id": entry["id"],
+        "user_id": entry["user_id"],
+        "task_name": entry["task_name"],
+        "description": entry.get("description", ""),
+        "project_id": entry.get("project_id"),
+        "tags": entry.get("tags", []),
+        "start_time": as_datetime(entry["start_time"]),
+        "end_time": as_datetime(entry.get("end_time")),
+        "duration": entry.get("duration", 0),
+        "is_running": entry.get("is_running", False),
+        "created_at": as_datetime(entry["created_at"])
+    }
+
+class EntryJSONResponse(ORJSONResponse):
+    """Renders rows from entry_row() with orjson.
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    Entry routes return this directly, so FastAPI skips re-validating the
+    payload against the declared response_model (kept for the OpenAPI schema).
+    """
+
+    def render(self, content) -> bytes:
+        # "Z" for UTC, as pydantic's serializer wrote it
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -139,34 +306,188 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+def create_stream_token(user_id: str) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS)
+    return jwt.encode({"sub": user_id, "scope": STREAM_TOKEN_SCOPE, "exp": expire}, SECRET_KEY, algorithm=ALGORITHM)
+
+def parse_date_param(value: str, end_of_day: bool = False) -> datetime:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {value}")
+    if len(value) == 10 and end_of_day:
+        # A bare date as an upper bound covers the whole day
+        parsed = datetime.combine(parsed.date(), datetime.max.time())
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def parse_date_range(from_date: Optional[str], to_date: Optional[str]) -> tuple:
+    return (
+        parse_date_param(from_date) if from_date else None,
+        parse_date_param(to_date, end_of_day=True) if to_date else None
+    )
+
+def parse_zone(tz: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown time zone: {tz}")
+
+def local_today(tz: Optional[str] = None):
+    try:
+        zone = ZoneInfo(tz) if tz else timezone.utc
+    except (ZoneInfoNotFoundError, ValueError):
+        zone = timezone.utc
+    return datetime.now(zone).date()
+
+def encode_cursor(entry: dict) -> str:
+    created_at = entry["created_at"]
+    payload = {"i": entry["id"]}
+    if isinstance(created_at, str):
+        payload.update({"c": created_at, "s": True})
+    else:
+        payload["c"] = created_at.isoformat()
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        created_at = payload["c"] if payload.get("s") else datetime.fromisoformat(payload["c"])
+        return created_at, payload["i"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+class TTLCache:
+    """Bounded LRU of dicts with per-entry expiry."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        cached = self._entries.get(key)
+        if cached is None or cached[0] < time.monotonic():
+            if cached is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # Handlers get their own copy so they can't mutate the cached value
+        return dict(cached[1])
+
+    def set(self, key: str, value: dict):
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl
+        }
+
+# User documents by user id
+user_cache = TTLCache(USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS)
+# Suggestion responses by ETag
+suggestion_cache = TTLCache(SUGGEST_CACHE_MAX_SIZE, SUGGEST_CACHE_TTL_SECONDS)
+
+def invalidate_user(user_id: str):
+    # Call after any write to a user document. There is no role/profile route yet; edits made directly in
+    # the database reach this worker when the entry's TTL runs out
+    user_cache.invalidate(user_id)
+
+async def authenticate_token(token: str, scope: Optional[str] = None) -> dict:
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
-        if user_id is None:
+        # Session tokens carry no scope; a scoped token is good for its own endpoint only
+        if user_id is None or payload.get("scope") != scope:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
         
-        user = await db.users.find_one({"id": user_id}, {"_id": 0})
+        user = user_cache.get(user_id)
+        if user is not None:
+            return user
+        
+        user = await storage.users.get(user_id)
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
-        return user
+        user_cache.set(user_id, user)
+        return dict(user)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Could not validate credentials")
 
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    return await authenticate_token(credentials.credentials)
+
+async def get_stream_user(token: str = Query(...)) -> dict:
+    # EventSource cannot send an Authorization header, so the stream takes a token from /events/token as a query parameter
+    return await authenticate_token(token, scope=STREAM_TOKEN_SCOPE)
+
 async def get_admin_user(current_user: dict = Depends(get_current_user)) -> dict:
     if current_user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     return current_user
 
+async def mark_user_data_changed(user_id: str):
+    # Call after a write to a user's projects or entries *and* everything derived from it (rollups, project
+    # counters, vocabulary). It retires every ETag issued for their data; bumping any earlier lets a read in the
+    # gap cache the old body under the new ETag
+    await storage.users.bump_data_version(user_id)
+
+async def require_own_projects(user_id: str, project_ids):
+    # Entries may only point at the caller's projects; the project counters and the delete cascade rely on it
+    wanted = {project_id for project_id in project_ids if project_id}
+    if wanted and await storage.projects.owned_ids(user_id, wanted) != wanted:
+        raise HTTPException(status_code=400, detail="Unknown project")
+
+def conditional_headers(etag: str) -> dict:
+    # no-cache lets the browser keep the body but revalidate on every request
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so a W/ prefix added by a proxy still matches
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+async def data_etag(request: Request, current_user: dict = Depends(get_current_user)) -> str:
+    version = await storage.users.get_data_version(current_user["id"])
+    # Summaries default to "today" (in the requested zone, if any), so the date is part of the key alongside the URL
+    today = local_today(request.query_params.get("tz"))
+    key = f"{current_user['id']}:{storage.data_epoch}:{version}:{today}:{request.url.path}?{request.url.query}"
+    etag = '"' + hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        # Answered before the route runs any query or serialization
+        raise HTTPException(status_code=304, headers=conditional_headers(etag))
+    return etag
+
 # ==================== Auth Routes ====================
 
 @api_router.post("/auth/register", response_model=Token)
 async def register(user_data: UserRegister):
     # Check if user exists
-    existing_user = await db.users.find_one({"email": user_data.email})
+    existing_user = await storage.users.get_by_email(user_data.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
@@ -178,12 +499,12 @@ async def register(user_data: UserRegister):
         "id": user_id,
         "email": user_data.email,
         "name": user_data.name,
-        "password_hash": hash_password(user_data.password),
+        "password_hash": await hash_password(user_data.password),
         "role": role,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": datetime.now(timezone.utc)
     }
     
-    await db.users.insert_one(user_doc)
+    await storage.users.create(user_doc)
     
     # Create token
     access_token = create_access_token(data={"sub": user_id})
@@ -193,7 +514,7 @@ async def register(user_data: UserRegister):
         email=user_data.email,
         name=user_data.name,
         role=role,
-        created_at=datetime.fromisoformat(user_doc["created_at"])
+        created_at=user_doc["created_at"]
     )
     
     return Token(access_token=access_token, user=user)
@@ -201,13 +522,17 @@ async def register(user_data: UserRegister):
 @api_router.post("/auth/login", response_model=Token)
 async def login(credentials: UserLogin):
     # Find user
-    user_doc = await db.users.find_one({"email": credentials.email})
+    user_doc = await storage.users.get_by_email(credentials.email)
     if not user_doc:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Verify password
-    if not verify_password(credentials.password, user_doc["password_hash"]):
+    valid, new_hash = await verify_password(credentials.password, user_doc["password_hash"])
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        await storage.users.set_password_hash(user_doc["id"], new_hash)
+        invalidate_user(user_doc["id"])
     
     # Create token
     access_token = create_access_token(data={"sub": user_doc["id"]})
@@ -217,7 +542,7 @@ async def login(credentials: UserLogin):
         email=user_doc["email"],
         name=user_doc["name"],
         role=user_doc["role"],
-        created_at=datetime.fromisoformat(user_doc["created_at"])
+        created_at=as_datetime(user_doc["created_at"])
     )
     
     return Token(access_token=access_token, user=user)
@@ -236,210 +561,643 @@ async def create_project(project_data: ProjectCreate, current_user: dict = Depen
         "user_id": current_user["id"],
         "name": project_data.name,
         "color": project_data.color,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": datetime.now(timezone.utc),
+        "total_duration": 0,
+        "entries_count": 0,
+        "last_used": None
     }
     
-    await db.projects.insert_one(project_doc)
+    await storage.projects.create(project_doc)
+    await mark_user_data_changed(current_user["id"])
     
-    return Project(
-        id=project_id,
-        user_id=current_user["id"],
-        name=project_data.name,
-        color=project_data.color,
-        created_at=datetime.fromisoformat(project_doc["created_at"])
-    )
+    return Project(**project_doc)
 
 @api_router.get("/projects", response_model=List[Project])
-async def get_projects(current_user: dict = Depends(get_current_user)):
-    projects = await db.projects.find({"user_id": current_user["id"]}, {"_id": 0}).to_list(1000)
-    return [Project(**{**p, "created_at": datetime.fromisoformat(p["created_at"])}) for p in projects]
-
-@api_router.delete("/projects/{project_id}")
-async def delete_project(project_id: str, current_user: dict = Depends(get_current_user)):
-    result = await db.projects.delete_one({"id": project_id, "user_id": current_user["id"]})
-    if result.deleted_count == 0:
+async def get_projects(
+    response: Response,
+    etag: str = Depends(data_etag),
+    current_user: dict = Depends(get_current_user)
+):
+    response.headers.update(conditional_headers(etag))
+    projects = await storage.projects.list_for_user(current_user["id"])
+    return [
+        Project(**{**p, "created_at": as_datetime(p["created_at"]), "last_used": as_datetime(p.get("last_used"))})
+        for p in projects
+    ]
+
+@api_router.delete("/projects/{project_id}", status_code=202)
+async def delete_project(
+    project_id: str,
+    reassign_to: Optional[str] = Query(None, description="Project to move the entries to; they are left without a project if omitted"),
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = current_user["id"]
+    if reassign_to is not None and (reassign_to == project_id or not await storage.projects.get(reassign_to, user_id)):
+        raise HTTPException(status_code=400, detail="reassign_to must be another of your projects")
+    if await storage.jobs.is_reassign_target(user_id, project_id):
+        raise HTTPException(status_code=409, detail="Entries are still being moved into this project")
+    if not await storage.projects.delete(project_id, user_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    return {"message": "Project deleted"}
+    await mark_user_data_changed(user_id)
+
+    # The project is gone at once; its entries are moved in the background
+    now = datetime.now(timezone.utc)
+    job = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "type": "project_delete",
+        "status": "pending",
+        "project_id": project_id,
+        "reassign_to": reassign_to,
+        "total": await storage.entries.count_for_project(user_id, project_id),
+        "processed": 0,
+        "error": None,
+        "owner": None,
+        "lease_until": None,
+        "created_at": now,
+        "updated_at": now
+    }
+    await storage.jobs.create(job)
+    start_job(job)
+    return {"message": "Project deleted", "job": job_view(job)}
+
+# ==================== Background Jobs ====================
+
+# Jobs running in this process, so shutdown can stop them
+job_tasks = {}
+
+def job_view(job: dict) -> Job:
+    return Job(**{**job, "created_at": as_datetime(job["created_at"]), "updated_at": as_datetime(job["updated_at"])})
+
+async def publish_job(job: dict):
+    await events.publish(job["user_id"], "job.updated", {"job": job_view(job).model_dump()})
+
+async def run_project_delete(job: dict):
+    job_id, user_id, project_id = job["id"], job["user_id"], job["project_id"]
+    while True:
+        if not await storage.jobs.claim(job_id, WORKER_ID, PROJECT_DELETE_LEASE_SECONDS):
+            current = await storage.jobs.get(job_id, user_id)
+            if current is None or current["status"] in ("completed", "failed"):
+                return
+            # Another worker holds the lease; take over if it lapses
+            await asyncio.sleep(PROJECT_DELETE_LEASE_SECONDS)
+            continue
+
+        # A target deleted in a race with this job's creation leaves the entries without a project instead
+        if job["reassign_to"] and not await storage.projects.get(job["reassign_to"], user_id):
+            job = await storage.jobs.update(job_id, {"reassign_to": None})
+
+        moved = await storage.entries.reassign_project(user_id, project_id, job["reassign_to"], PROJECT_DELETE_BATCH_SIZE)
+        if not moved:
+            job = await storage.jobs.update(job_id, {"status": "completed", "owner": None, "lease_until": None})
+            await publish_job(job)
+            await events.publish(user_id, "entries.changed", {"project_id": project_id})
+            logger.info("Project %s cascade finished: %s entries", project_id, job["processed"])
+            return
+
+        # Running entries reach the rollups when they stop, under their new project
+        completed = [e for e in moved if not e.get("is_running")]
+        await storage.summaries.apply_rollups([{**e, "project_id": job["reassign_to"]} for e in completed], completed)
+        job = await storage.jobs.update(job_id, {}, processed=len(moved))
+        await mark_user_data_changed(user_id)
+        await publish_job(job)
+
+async def run_job(job: dict):
+    try:
+        await run_project_delete(job)
+    except asyncio.CancelledError:
+        # Let another worker (or the next start of this one) pick it up without waiting out the lease
+        await storage.jobs.update(job["id"], {"owner": None, "lease_until": None})
+        raise
+    except Exception as e:
+        # A batch that failed between the move and the rollup write is repaired by rebuild_rollups
+        logger.exception("Job %s failed", job["id"])
+        await publish_job(await storage.jobs.update(job["id"], {"status": "failed", "error": str(e), "owner": None, "lease_until": None}))
+    finally:
+        job_tasks.pop(job["id"], None)
+
+def start_job(job: dict):
+    if job["id"] not in job_tasks:
+        job_tasks[job["id"]] = asyncio.create_task(run_job(job))
+
+@api_router.get("/jobs/{job_id}", response_model=Job)
+async def get_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = await storage.jobs.get(job_id, current_user["id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_view(job)
 
 # ==================== Timer Routes ====================
 
 @api_router.post("/timer/start", response_model=TimeEntry)
 async def start_timer(timer_data: TimerStart, current_user: dict = Depends(get_current_user)):
-    # Stop any running timer
-    running_entry = await db.time_entries.find_one({"user_id": current_user["id"], "is_running": True})
-    if running_entry:
-        end_time = datetime.now(timezone.utc)
-        start = datetime.fromisoformat(running_entry["start_time"])
-        duration = int((end_time - start).total_seconds())
-        await db.time_entries.update_one(
-            {"id": running_entry["id"]},
-            {"$set": {"is_running": False, "end_time": end_time.isoformat(), "duration": duration}}
-        )
-    
-    # Start new timer
-    entry_id = str(uuid.uuid4())
+    await require_own_projects(current_user["id"], [timer_data.project_id])
     now = datetime.now(timezone.utc)
     entry_doc = {
-        "id": entry_id,
+        "id": str(uuid.uuid4()),
         "user_id": current_user["id"],
         "task_name": timer_data.task_name,
         "description": timer_data.description or "",
         "project_id": timer_data.project_id,
         "tags": timer_data.tags,
-        "start_time": now.isoformat(),
+        "start_time": now,
         "end_time": None,
         "duration": 0,
         "is_running": True,
-        "created_at": now.isoformat()
+        "created_at": now
     }
-    
-    await db.time_entries.insert_one(entry_doc)
-    
-    return TimeEntry(
-        id=entry_id,
-        user_id=current_user["id"],
-        task_name=timer_data.task_name,
-        description=timer_data.description or "",
-        project_id=timer_data.project_id,
-        tags=timer_data.tags,
-        start_time=now,
-        end_time=None,
-        duration=0,
-        is_running=True,
-        created_at=now
-    )
+
+    # Stops any running timer and starts the new one; the running-timer index keeps this to one per user
+    try:
+        stopped = await storage.entries.start(entry_doc)
+    except TimerConflict:
+        raise HTTPException(status_code=409, detail="Timer was started concurrently, please retry")
+    await storage.vocabulary.apply([entry_doc])
+    for entry in stopped:
+        await storage.summaries.apply_rollup(entry["user_id"], entry["start_time"], entry.get("project_id"), entry["duration"])
+    await mark_user_data_changed(current_user["id"])
+
+    for entry in stopped:
+        await events.publish(current_user["id"], "timer.stopped", {"entry": entry_row(entry)})
+    await events.publish(current_user["id"], "timer.started", {"entry": entry_row(entry_doc)})
+
+    return EntryJSONResponse(entry_row(entry_doc))
 
 @api_router.post("/timer/stop", response_model=TimeEntry)
 async def stop_timer(current_user: dict = Depends(get_current_user)):
-    running_entry = await db.time_entries.find_one({"user_id": current_user["id"], "is_running": True})
-    if not running_entry:
+    entry = await storage.entries.stop_running(current_user["id"], datetime.now(timezone.utc))
+    if not entry:
         raise HTTPException(status_code=404, detail="No running timer found")
-    
-    end_time = datetime.now(timezone.utc)
-    start_time = datetime.fromisoformat(running_entry["start_time"])
-    duration = int((end_time - start_time).total_seconds())
-    
-    await db.time_entries.update_one(
-        {"id": running_entry["id"]},
-        {"$set": {"is_running": False, "end_time": end_time.isoformat(), "duration": duration}}
-    )
-    
-    return TimeEntry(
-        id=running_entry["id"],
-        user_id=running_entry["user_id"],
-        task_name=running_entry["task_name"],
-        description=running_entry["description"],
-        project_id=running_entry.get("project_id"),
-        tags=running_entry["tags"],
-        start_time=start_time,
-        end_time=end_time,
-        duration=duration,
-        is_running=False,
-        created_at=datetime.fromisoformat(running_entry["created_at"])
-    )
+
+    await storage.summaries.apply_rollup(entry["user_id"], entry["start_time"], entry.get("project_id"), entry["duration"])
+    await mark_user_data_changed(current_user["id"])
+    await events.publish(current_user["id"], "timer.stopped", {"entry": entry_row(entry)})
+
+    return EntryJSONResponse(entry_row(entry))
 
 @api_router.get("/timer/current", response_model=Optional[TimeEntry])
-async def get_current_timer(current_user: dict = Depends(get_current_user)):
-    running_entry = await db.time_entries.find_one({"user_id": current_user["id"], "is_running": True})
-    if not running_entry:
-        return None
-    
-    return TimeEntry(
-        id=running_entry["id"],
-        user_id=running_entry["user_id"],
-        task_name=running_entry["task_name"],
-        description=running_entry["description"],
-        project_id=running_entry.get("project_id"),
-        tags=running_entry["tags"],
-        start_time=datetime.fromisoformat(running_entry["start_time"]),
-        end_time=None,
-        duration=running_entry["duration"],
-        is_running=True,
-        created_at=datetime.fromisoformat(running_entry["created_at"])
+async def get_current_timer(etag: str = Depends(data_etag), current_user: dict = Depends(get_current_user)):
+    running_entry = await storage.entries.get_running(current_user["id"])
+    return EntryJSONResponse(entry_row(running_entry) if running_entry else None, headers=conditional_headers(etag))
+
+# ==================== Event Stream ====================
+
+def sse_message(event_type: str, data: str) -> str:
+    return f"event: {event_type}\ndata: {data}\n\n"
+
+async def event_stream(user_id: str):
+    async with events.subscribe(user_id) as queue:
+        yield "retry: 5000\n\n"
+        # Every (re)connect starts from the current timer, so clients never need to poll for it
+        running_entry = await storage.entries.get_running(user_id)
+        snapshot = {"entry": entry_row(running_entry) if running_entry else None}
+        yield sse_message("timer.state", orjson.dumps(snapshot, option=orjson.OPT_UTC_Z).decode())
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=EVENT_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield sse_message(event["type"], event["data"])
+
+@api_router.post("/events/token", response_model=StreamToken)
+async def create_events_token(current_user: dict = Depends(get_current_user)):
+    return StreamToken(token=create_stream_token(current_user["id"]), expires_in=STREAM_TOKEN_EXPIRE_SECONDS)
+
+@api_router.get("/events")
+async def stream_events(current_user: dict = Depends(get_stream_user)):
+    return StreamingResponse(
+        event_stream(current_user["id"]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 # ==================== Time Entry Routes ====================
 
-@api_router.get("/entries", response_model=List[TimeEntry])
-async def get_entries(current_user: dict = Depends(get_current_user), limit: int = 100):
-    entries = await db.time_entries.find(
-        {"user_id": current_user["id"]},
-        {"_id": 0}
-    ).sort("created_at", -1).limit(limit).to_list(limit)
-    
-    return [
-        TimeEntry(
-            **{
-                **e,
-                "start_time": datetime.fromisoformat(e["start_time"]),
-                "end_time": datetime.fromisoformat(e["end_time"]) if e.get("end_time") else None,
-                "created_at": datetime.fromisoformat(e["created_at"])
-            }
-        )
-        for e in entries
+@api_router.get("/entries", response_model=TimeEntryPage)
+async def get_entries(
+    limit: int = Query(50, ge=1, le=200),
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    project_id: Optional[str] = None,
+    tag: Optional[str] = None,
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    etag: str = Depends(data_etag),
+    current_user: dict = Depends(get_current_user)
+):
+    if after and before:
+        raise HTTPException(status_code=400, detail="Use either 'after' or 'before', not both")
+
+    start, end = parse_date_range(from_date, to_date)
+    cursor = decode_cursor(after or before) if after or before else None
+    entries = await storage.entries.list_page(
+        current_user["id"],
+        limit + 1,
+        cursor=cursor,
+        newer=bool(before),
+        project_id=project_id,
+        tag=tag,
+        start=start,
+        end=end
+    )
+
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if before:
+        entries.reverse()
+
+    next_cursor = prev_cursor = None
+    if entries:
+        if has_more or before:
+            next_cursor = encode_cursor(entries[-1])
+        if (has_more and before) or after:
+            prev_cursor = encode_cursor(entries[0])
+
+    return EntryJSONResponse({
+        "entries": [entry_row(e) for e in entries],
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
+    }, headers=conditional_headers(etag))
+
+# Declared ahead of /entries/{entry_id}, which would otherwise capture it
+@api_router.get("/entries/summary")
+async def get_range_summary(
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    granularity: Literal["day", "week", "month"] = "day",
+    tz: str = "UTC",
+    etag: str = Depends(data_etag),
+    current_user: dict = Depends(get_current_user)
+):
+    zone = parse_zone(tz)
+    try:
+        end_date = datetime.fromisoformat(to_date).date() if to_date else datetime.now(zone).date()
+        start_date = datetime.fromisoformat(from_date).date() if from_date else end_date - timedelta(days=29)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    except OverflowError:
+        raise HTTPException(status_code=400, detail="Dates out of range")
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+
+    # Only whole buckets are reported, so widen the range to the edges of the first and last one
+    try:
+        first = bucket_start(start_date, granularity)
+        last = next_bucket(bucket_start(end_date, granularity), granularity) - timedelta(days=1)
+        # The queries run to the end of the last local day, which must still be a representable instant
+        local_day_bounds(first, last, tz)
+    except OverflowError:
+        raise HTTPException(status_code=400, detail="Dates out of range")
+    starts = [first]
+    while next_bucket(starts[-1], granularity) <= last:
+        starts.append(next_bucket(starts[-1], granularity))
+        if len(starts) > SUMMARY_MAX_BUCKETS:
+            raise HTTPException(status_code=400, detail=f"Range spans more than {SUMMARY_MAX_BUCKETS} buckets")
+
+    totals = await storage.summaries.range_totals(current_user["id"], first, last, granularity, tz)
+    buckets = [
+        totals.get(day.isoformat(), {"date": day.isoformat(), "total_duration": 0, "entries_count": 0})
+        for day in starts
     ]
+    return EntryJSONResponse({
+        "from": first.isoformat(),
+        "to": last.isoformat(),
+        "granularity": granularity,
+        "tz": tz,
+        "total_duration": sum(b["total_duration"] for b in buckets),
+        "entries_count": sum(b["entries_count"] for b in buckets),
+        "buckets": buckets
+    }, headers=conditional_headers(etag))
+
+@api_router.get("/entries/breakdown")
+async def get_breakdown(
+    by: Literal["project", "tag"] = "project",
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    etag: str = Depends(data_etag),
+    current_user: dict = Depends(get_current_user)
+):
+    start, end = parse_date_range(from_date, to_date)
+    result = await storage.summaries.breakdown(current_user["id"], start, end, by)
+
+    # Shares are of all time in the range; tag shares can add up to more than 1 as entries carry several tags
+    total = result["total_duration"]
+    for group in result["groups"]:
+        group["share"] = round(group["total_duration"] / total, 4) if total else 0.0
+    return EntryJSONResponse({"by": by, "from": from_date, "to": to_date, **result}, headers=conditional_headers(etag))
+
+@api_router.get("/entries/search")
+async def search_entries(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=SEARCH_MAX_OFFSET),
+    project_id: Optional[str] = None,
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    etag: str = Depends(data_etag),
+    current_user: dict = Depends(get_current_user)
+):
+    words = list(dict.fromkeys(tokenize(q)))[:SEARCH_MAX_WORDS]
+    if not words:
+        raise HTTPException(status_code=400, detail="Search query has no words")
+
+    start, end = parse_date_range(from_date, to_date)
+    entries = await storage.entries.search(
+        current_user["id"], words, limit + 1, offset, project_id=project_id, start=start, end=end
+    )
+    has_more = len(entries) > limit
+    return EntryJSONResponse({
+        "entries": [entry_row(e) for e in entries[:limit]],
+        "next_offset": offset + limit if has_more and offset + limit <= SEARCH_MAX_OFFSET else None
+    }, headers=conditional_headers(etag))
 
 @api_router.get("/entries/{entry_id}", response_model=TimeEntry)
-async def get_entry(entry_id: str, current_user: dict = Depends(get_current_user)):
-    entry = await db.time_entries.find_one({"id": entry_id, "user_id": current_user["id"]}, {"_id": 0})
+async def get_entry(entry_id: str, etag: str = Depends(data_etag), current_user: dict = Depends(get_current_user)):
+    entry = await storage.entries.get(entry_id, current_user["id"])
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
     
-    return TimeEntry(
-        **{
-            **entry,
-            "start_time": datetime.fromisoformat(entry["start_time"]),
-            "end_time": datetime.fromisoformat(entry["end_time"]) if entry.get("end_time") else None,
-            "created_at": datetime.fromisoformat(entry["created_at"])
-        }
-    )
+    return EntryJSONResponse(entry_row(entry), headers=conditional_headers(etag))
 
 @api_router.put("/entries/{entry_id}", response_model=TimeEntry)
 async def update_entry(entry_id: str, update_data: TimeEntryUpdate, current_user: dict = Depends(get_current_user)):
-    entry = await db.time_entries.find_one({"id": entry_id, "user_id": current_user["id"]})
+    entry = await storage.entries.get(entry_id, current_user["id"])
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
     
     update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
+    await require_own_projects(current_user["id"], [update_dict.get("project_id")])
     if update_dict:
-        await db.time_entries.update_one({"id": entry_id}, {"$set": update_dict})
+        await storage.entries.update_fields(entry, update_dict)
+        if not entry.get("is_running") and "project_id" in update_dict and update_dict["project_id"] != entry.get("project_id"):
+            # Move the entry's time from the old project's rollup to the new one
+            await storage.summaries.move_rollup(entry, update_dict["project_id"])
+        if {"task_name", "tags"} & update_dict.keys():
+            await storage.vocabulary.apply([{**entry, **update_dict}], [entry])
+        await mark_user_data_changed(current_user["id"])
         entry.update(update_dict)
+        await events.publish(current_user["id"], "entry.updated", {"entry": entry_row(entry)})
     
-    return TimeEntry(
-        **{
-            **entry,
-            "start_time": datetime.fromisoformat(entry["start_time"]),
-            "end_time": datetime.fromisoformat(entry["end_time"]) if entry.get("end_time") else None,
-            "created_at": datetime.fromisoformat(entry["created_at"])
-        }
-    )
+    return EntryJSONResponse(entry_row(entry))
 
 @api_router.delete("/entries/{entry_id}")
 async def delete_entry(entry_id: str, current_user: dict = Depends(get_current_user)):
-    result = await db.time_entries.delete_one({"id": entry_id, "user_id": current_user["id"]})
-    if result.deleted_count == 0:
+    entry = await storage.entries.delete(entry_id, current_user["id"])
+    if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
+    if not entry.get("is_running"):
+        await storage.summaries.apply_rollup(entry["user_id"], entry["start_time"], entry.get("project_id"), -entry.get("duration", 0), -1)
+    await storage.vocabulary.apply([], [entry])
+    await mark_user_data_changed(current_user["id"])
+    await events.publish(current_user["id"], "entry.deleted", {"id": entry_id, "was_running": entry.get("is_running", False)})
     return {"message": "Entry deleted"}
 
-# ==================== Summary Routes ====================
+@api_router.patch("/entries", response_model=BatchResult)
+async def batch_update_entries(batch: TimeEntryBatchUpdate, current_user: dict = Depends(get_current_user)):
+    entry_ids = [item.id for item in batch.entries]
+    if len(set(entry_ids)) != len(entry_ids):
+        raise HTTPException(status_code=400, detail="Each entry may appear only once")
+    await require_own_projects(current_user["id"], [item.project_id for item in batch.entries])
 
-@api_router.get("/entries/summary/daily")
-async def get_daily_summary(date: Optional[str] = None, current_user: dict = Depends(get_current_user)):
-    if date:
-        target_date = datetime.fromisoformat(date).date()
+    # One read for the current state, one write for every change, whatever the batch size
+    entries = {e["id"]: e for e in await storage.entries.get_many(current_user["id"], entry_ids)}
+    changes = {}
+    moved_from = []
+    moved_to = []
+    renamed_from = []
+    renamed_to = []
+    results = []
+    for item in batch.entries:
+        entry = entries.get(item.id)
+        if not entry:
+            results.append({"id": item.id, "status": "not_found", "entry": None})
+            continue
+
+        fields = {k: v for k, v in item.model_dump(exclude={"id"}).items() if v is not None}
+        if fields:
+            changes[item.id] = fields
+            if not entry.get("is_running") and "project_id" in fields and fields["project_id"] != entry.get("project_id"):
+                moved_from.append(dict(entry))
+                moved_to.append({**entry, "project_id": fields["project_id"]})
+            if {"task_name", "tags"} & fields.keys():
+                renamed_from.append(dict(entry))
+                renamed_to.append({**entry, **fields})
+            entry.update(fields)
+
+        results.append({"id": item.id, "status": "updated", "entry": entry_row(entry)})
+
+    if changes:
+        await storage.entries.update_many(current_user["id"], entries, changes)
+    if moved_from:
+        await storage.summaries.apply_rollups(moved_to, moved_from)
+    if renamed_from:
+        await storage.vocabulary.apply(renamed_to, renamed_from)
+    if changes:
+        await mark_user_data_changed(current_user["id"])
+        await events.publish(current_user["id"], "entries.changed", {"ids": list(changes)})
+
+    return EntryJSONResponse({"results": results})
+
+@api_router.post("/entries/delete", response_model=BatchResult)
+async def batch_delete_entries(batch: TimeEntryBatchDelete, current_user: dict = Depends(get_current_user)):
+    entry_ids = list(dict.fromkeys(batch.ids))
+    entries = await storage.entries.get_many(current_user["id"], entry_ids)
+    found = {e["id"] for e in entries}
+
+    if found:
+        await storage.entries.delete_many(current_user["id"], list(found))
+        await storage.summaries.apply_rollups([], [e for e in entries if not e.get("is_running")])
+        await storage.vocabulary.apply([], entries)
+        await mark_user_data_changed(current_user["id"])
+        await events.publish(current_user["id"], "entries.changed", {"ids": list(found), "deleted": True})
+
+    return EntryJSONResponse({"results": [
+        {"id": entry_id, "status": "deleted" if entry_id in found else "not_found", "entry": None}
+        for entry_id in entry_ids
+    ]})
+
+# ==================== Bulk Import ====================
+
+async def iter_upload_lines(request: Request):
+    # Decode incrementally so a large upload is never held in memory at once
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in request.stream():
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer.strip():
+        yield buffer.rstrip("\r")
+
+def csv_import_row(header: List[str], values: List[str]) -> dict:
+    row = dict(zip(header, values))
+    row["tags"] = [tag.strip() for tag in row.get("tags", "").split(",") if tag.strip()]
+    row["project_id"] = row.get("project_id") or None
+    return row
+
+async def iter_csv_rows(lines):
+    header = None
+    record = ""
+    async for line in lines:
+        record = f"{record}\n{line}" if record else line
+        # An odd number of quotes means a quoted field continues on the next line
+        if record.count('"') % 2:
+            continue
+        values = next(csv.reader([record]), [])
+        record = ""
+        if not any(value.strip() for value in values):
+            continue
+        if header is None:
+            # Accept snake_case columns as well as the CSV export's "Start Time" style headers
+            header = [name.strip().lower().replace(" ", "_") for name in values]
+            continue
+        yield csv_import_row(header, values)
+
+async def iter_ndjson_rows(lines):
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield e
+
+async def iter_json_rows(request: Request):
+    try:
+        rows = json.loads(await request.body())
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of entries")
+    for row in rows:
+        yield row
+
+def describe_validation_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in e.errors()
+    )
+
+async def import_entry_rows(user_id: str, rows) -> BulkImportResult:
+    inserted = 0
+    failed = 0
+    errors = []
+    batch = []
+    batch_rows = []
+
+    def record_error(row_number, message):
+        nonlocal failed
+        failed += 1
+        if len(errors) < BULK_IMPORT_MAX_ERRORS:
+            errors.append(BulkImportError(row=row_number, error=message))
+
+    async def flush():
+        nonlocal inserted
+        # Rows naming a project the user doesn't own are reported like any other invalid row
+        owned = await storage.projects.owned_ids(user_id, {e["project_id"] for e in batch if e["project_id"]})
+        foreign = [i for i, entry in enumerate(batch) if entry["project_id"] and entry["project_id"] not in owned]
+        for index in foreign:
+            record_error(batch_rows[index], "project_id: Unknown project")
+        for index in reversed(foreign):
+            del batch[index]
+            del batch_rows[index]
+        rejected = await storage.entries.insert_many(batch) if batch else []
+        rejected_indexes = set()
+        for index, message in rejected:
+            rejected_indexes.add(index)
+            record_error(batch_rows[index], message)
+        written = [entry for index, entry in enumerate(batch) if index not in rejected_indexes]
+        # One rollup write and one vocabulary write per batch rather than one per entry
+        await storage.summaries.apply_rollups(written)
+        await storage.vocabulary.apply(written)
+        if written:
+            await mark_user_data_changed(user_id)
+        inserted += len(written)
+        batch.clear()
+        batch_rows.clear()
+
+    row_number = 0
+    async for row in rows:
+        row_number += 1
+        if isinstance(row, Exception):
+            record_error(row_number, f"Invalid row: {row}")
+            continue
+        try:
+            item = TimeEntryImport.model_validate(row)
+        except ValidationError as e:
+            record_error(row_number, describe_validation_error(e))
+            continue
+
+        batch.append({
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "task_name": item.task_name,
+            "description": item.description or "",
+            "project_id": item.project_id,
+            "tags": item.tags,
+            "start_time": item.start_time,
+            "end_time": item.end_time,
+            "duration": int((item.end_time - item.start_time).total_seconds()),
+            "is_running": False,
+            # Lists are ordered by created_at, so imported history sorts by when the work happened
+            "created_at": item.start_time
+        })
+        batch_rows.append(row_number)
+        if len(batch) >= BULK_IMPORT_BATCH_SIZE:
+            await flush()
+
+    if batch:
+        await flush()
+
+    return BulkImportResult(inserted=inserted, failed=failed, errors=errors)
+
+@api_router.post("/entries/bulk", response_model=BulkImportResult)
+async def bulk_import_entries(request: Request, current_user: dict = Depends(get_current_user)):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "application/json":
+        rows = iter_json_rows(request)
+    elif content_type == "text/csv":
+        rows = iter_csv_rows(iter_upload_lines(request))
+    elif content_type in ("application/x-ndjson", "application/jsonl"):
+        rows = iter_ndjson_rows(iter_upload_lines(request))
     else:
-        target_date = datetime.now(timezone.utc).date()
-    
+        raise HTTPException(
+            status_code=415,
+            detail="Upload entries as application/json, text/csv or application/x-ndjson"
+        )
+
+    result = await import_entry_rows(current_user["id"], rows)
+    if result.inserted:
+        await events.publish(current_user["id"], "entries.changed", {"imported": result.inserted})
+    return result
+
+# ==================== Suggestion Routes ====================
+
+@api_router.get("/suggest")
+async def suggest(
+    prefix: str = Query("", max_length=100),
+    limit: int = Query(8, ge=1, le=25),
+    etag: str = Depends(data_etag),
+    current_user: dict = Depends(get_current_user)
+):
+    # The ETag covers the user's data version and the query, so it is the cache key
+    suggestions = suggestion_cache.get(etag)
+    if suggestions is None:
+        suggestions = await storage.vocabulary.suggest(current_user["id"], prefix, limit)
+        suggestion_cache.set(etag, suggestions)
+    return EntryJSONResponse({"prefix": prefix, **suggestions}, headers=conditional_headers(etag))
+
+# ==================== Summary Routes ====================
+
+async def daily_summary(user_id: str, target_date) -> dict:
     start_of_day = datetime.combine(target_date, datetime.min.time()).replace(tzinfo=timezone.utc)
     end_of_day = datetime.combine(target_date, datetime.max.time()).replace(tzinfo=timezone.utc)
     
-    entries = await db.time_entries.find(
-        {
-            "user_id": current_user["id"],
-            "start_time": {"$gte": start_of_day.isoformat(), "$lte": end_of_day.isoformat()}
-        },
-        {"_id": 0}
-    ).to_list(1000)
+    entries = await storage.entries.list_started_between(user_id, start_of_day, end_of_day)
     
     total_duration = sum(e.get("duration", 0) for e in entries if not e.get("is_running"))
     
@@ -447,143 +1205,320 @@ async def get_daily_summary(date: Optional[str] = None, current_user: dict = Dep
         "date": target_date.isoformat(),
         "total_duration": total_duration,
         "entries_count": len(entries),
-        "entries": [
-            TimeEntry(
-                **{
-                    **e,
-                    "start_time": datetime.fromisoformat(e["start_time"]),
-                    "end_time": datetime.fromisoformat(e["end_time"]) if e.get("end_time") else None,
-                    "created_at": datetime.fromisoformat(e["created_at"])
-                }
-            )
-            for e in entries
-        ]
+        "entries": [entry_row(e) for e in entries]
     }
 
+@api_router.get("/entries/summary/daily")
+async def get_daily_summary(
+    date: Optional[str] = None,
+    etag: str = Depends(data_etag),
+    current_user: dict = Depends(get_current_user)
+):
+    if date:
+        target_date = datetime.fromisoformat(date).date()
+    else:
+        target_date = datetime.now(timezone.utc).date()
+    
+    summary = await daily_summary(current_user["id"], target_date)
+    return EntryJSONResponse(summary, headers=conditional_headers(etag))
+
 @api_router.get("/entries/summary/weekly")
-async def get_weekly_summary(current_user: dict = Depends(get_current_user)):
+async def get_weekly_summary(
+    response: Response,
+    etag: str = Depends(data_etag),
+    current_user: dict = Depends(get_current_user)
+):
+    response.headers.update(conditional_headers(etag))
     now = datetime.now(timezone.utc)
-    start_of_week = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    start_of_week = (now - timedelta(days=now.weekday())).date()
+    end_of_week = start_of_week + timedelta(days=6)
     
-    entries = await db.time_entries.find(
-        {
-            "user_id": current_user["id"],
-            "start_time": {"$gte": start_of_week.isoformat()}
-        },
-        {"_id": 0}
-    ).to_list(1000)
+    totals = await storage.summaries.daily_totals(current_user["id"], start_of_week.isoformat(), end_of_week.isoformat())
     
-    # Group by day
-    daily_summaries = {}
+    summaries = []
     for i in range(7):
-        day = (start_of_week + timedelta(days=i)).date()
-        daily_summaries[day.isoformat()] = {"date": day.isoformat(), "total_duration": 0, "entries_count": 0}
-    
-    for entry in entries:
-        entry_date = datetime.fromisoformat(entry["start_time"]).date().isoformat()
-        if entry_date in daily_summaries and not entry.get("is_running"):
-            daily_summaries[entry_date]["total_duration"] += entry.get("duration", 0)
-            daily_summaries[entry_date]["entries_count"] += 1
+        day = (start_of_week + timedelta(days=i)).isoformat()
+        summaries.append(totals.get(day, {"date": day, "total_duration": 0, "entries_count": 0}))
     
-    return {"summaries": list(daily_summaries.values())}
+    return {"summaries": summaries}
 
 @api_router.get("/entries/summary/monthly")
-async def get_monthly_summary(current_user: dict = Depends(get_current_user)):
+async def get_monthly_summary(
+    response: Response,
+    etag: str = Depends(data_etag),
+    current_user: dict = Depends(get_current_user)
+):
+    response.headers.update(conditional_headers(etag))
     now = datetime.now(timezone.utc)
-    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    start_of_month = now.date().replace(day=1)
     
-    entries = await db.time_entries.find(
-        {
-            "user_id": current_user["id"],
-            "start_time": {"$gte": start_of_month.isoformat()}
-        },
-        {"_id": 0}
-    ).to_list(1000)
+    totals = await storage.summaries.daily_totals(current_user["id"], start_of_month.isoformat(), now.date().isoformat())
     
-    # Group by day
-    daily_summaries = {}
-    for entry in entries:
-        entry_date = datetime.fromisoformat(entry["start_time"]).date().isoformat()
-        if entry_date not in daily_summaries:
-            daily_summaries[entry_date] = {"date": entry_date, "total_duration": 0, "entries_count": 0}
-        
-        if not entry.get("is_running"):
-            daily_summaries[entry_date]["total_duration"] += entry.get("duration", 0)
-            daily_summaries[entry_date]["entries_count"] += 1
-    
-    return {"summaries": list(daily_summaries.values())}
+    return {"summaries": [day for _, day in sorted(totals.items()) if day["entries_count"] > 0]}
+
+# ==================== Dashboard ====================
+
+@api_router.get("/dashboard")
+async def get_dashboard(
+    limit: int = Query(10, ge=1, le=50),
+    etag: str = Depends(data_etag),
+    current_user: dict = Depends(get_current_user)
+):
+    # Authenticated once; the four reads run concurrently, so latency is that of the slowest
+    user_id = current_user["id"]
+    entries, projects, running_entry, today = await asyncio.gather(
+        storage.entries.list_page(user_id, limit),
+        storage.projects.list_for_user(user_id),
+        storage.entries.get_running(user_id),
+        daily_summary(user_id, datetime.now(timezone.utc).date())
+    )
+
+    return EntryJSONResponse({
+        "entries": [entry_row(e) for e in entries],
+        "projects": [
+            {
+                "id": p["id"],
+                "user_id": p["user_id"],
+                "name": p["name"],
+                "color": p["color"],
+                "created_at": as_datetime(p["created_at"])
+            }
+            for p in projects
+        ],
+        "current_timer": entry_row(running_entry) if running_entry else None,
+        "summary": today
+    }, headers=conditional_headers(etag))
 
 # ==================== Export Routes ====================
 
-@api_router.get("/export/csv")
-async def export_csv(current_user: dict = Depends(get_current_user)):
-    entries = await db.time_entries.find(
-        {"user_id": current_user["id"]},
-        {"_id": 0}
-    ).sort("created_at", -1).to_list(10000)
-    
+CSV_EXPORT_HEADER = ["Task Name", "Description", "Start Time", "End Time", "Duration (hours)", "Tags"]
+
+async def csv_export_chunks(cursor):
     output = io.StringIO()
     writer = csv.writer(output)
-    writer.writerow(["Task Name", "Description", "Start Time", "End Time", "Duration (hours)", "Tags"])
-    
-    for entry in entries:
-        duration_hours = round(entry.get("duration", 0) / 3600, 2)
+    writer.writerow(CSV_EXPORT_HEADER)
+    # Send the header right away so the download starts before the first batch arrives
+    yield output.getvalue()
+    output.seek(0)
+    output.truncate()
+
+    rows = 0
+    async for entry in cursor:
         writer.writerow([
             entry["task_name"],
             entry.get("description", ""),
-            entry["start_time"],
-            entry.get("end_time", "Running"),
-            duration_hours,
+            as_datetime(entry["start_time"]).isoformat(),
+            as_datetime(entry["end_time"]).isoformat() if entry.get("end_time") else "Running",
+            round(entry.get("duration", 0) / 3600, 2),
             ", ".join(entry.get("tags", []))
         ])
-    
-    output.seek(0)
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=time_entries.csv"}
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+
+    if output.tell():
+        yield output.getvalue()
+
+async def gzip_chunks(chunks):
+    # wbits=31 produces a gzip container; sync flushes keep each batch flowing to the client
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+@api_router.get("/export/csv")
+async def export_csv(
+    request: Request,
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    project_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    start, end = parse_date_range(from_date, to_date)
+    cursor = storage.entries.iter_entries(
+        current_user["id"], start, end, project_id, newest_first=True, batch_size=EXPORT_BATCH_SIZE
     )
 
+    headers = {"Content-Disposition": "attachment; filename=time_entries.csv", "Vary": "Accept-Encoding"}
+    body = csv_export_chunks(cursor)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        body = gzip_chunks(body)
+
+    return StreamingResponse(body, media_type="text/csv", headers=headers)
+
+EXPORT_FIELDS = [
+    "id", "user_id", "task_name", "description", "project_id", "tags",
+    "start_time", "end_time", "duration", "is_running", "created_at"
+]
+
+async def ndjson_export_chunks(cursor):
+    lines = []
+    async for entry in cursor:
+        lines.append(orjson.dumps(entry_row(entry)))
+        if len(lines) >= EXPORT_BATCH_SIZE:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+async def write_parquet_export(cursor, sink):
+    # Imported lazily so the API process only pays for pyarrow when a parquet export is requested
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    timestamp = pa.timestamp("us", tz="UTC")
+    schema = pa.schema([
+        ("id", pa.string()),
+        ("user_id", pa.string()),
+        ("task_name", pa.string()),
+        ("description", pa.string()),
+        ("project_id", pa.string()),
+        ("tags", pa.list_(pa.string())),
+        ("start_time", timestamp),
+        ("end_time", timestamp),
+        ("duration", pa.int64()),
+        ("is_running", pa.bool_()),
+        ("created_at", timestamp),
+    ])
+
+    async def write_row_group(batch):
+        # One row group per batch; encoding runs off the event loop
+        frame = pd.DataFrame(batch, columns=EXPORT_FIELDS)
+        table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+        await asyncio.to_thread(writer.write_table, table)
+
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        batch = []
+        async for entry in cursor:
+            batch.append(entry_row(entry))
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                await write_row_group(batch)
+                batch = []
+        if batch:
+            await write_row_group(batch)
+    finally:
+        writer.close()
+
+def iter_file(handle, chunk_size: int = 1024 * 1024):
+    try:
+        while chunk := handle.read(chunk_size):
+            yield chunk
+    finally:
+        handle.close()
+
+@api_router.get("/export")
+async def export_entries(
+    request: Request,
+    format: Literal["ndjson", "parquet"] = "ndjson",
+    scope: Literal["user", "org"] = "user",
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    project_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    if scope == "org" and current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    user_id = current_user["id"] if scope == "user" else None
+    start, end = parse_date_range(from_date, to_date)
+    cursor = storage.entries.iter_entries(
+        user_id, start, end, project_id, newest_first=False, batch_size=EXPORT_BATCH_SIZE
+    )
+
+    if format == "parquet":
+        # Parquet writes its footer last, so spool the file (spilling to disk past 64MB) and then stream it
+        sink = tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024)
+        try:
+            await write_parquet_export(cursor, sink)
+        except Exception:
+            sink.close()
+            raise
+        sink.seek(0)
+        return StreamingResponse(
+            iter_file(sink),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": "attachment; filename=time_entries.parquet"}
+        )
+
+    headers = {"Content-Disposition": "attachment; filename=time_entries.ndjson", "Vary": "Accept-Encoding"}
+    body = ndjson_export_chunks(cursor)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        body = gzip_chunks(body)
+
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
+
 # ==================== Admin Routes ====================
 
-@api_router.get("/admin/users", response_model=List[AdminUserStats])
-async def get_all_users(current_user: dict = Depends(get_admin_user)):
-    users = await db.users.find({}, {"_id": 0, "password_hash": 0}).to_list(1000)
-    
-    stats = []
-    for user in users:
-        entries = await db.time_entries.find({"user_id": user["id"]}, {"_id": 0}).to_list(10000)
-        total_duration = sum(e.get("duration", 0) for e in entries if not e.get("is_running"))
-        last_entry = await db.time_entries.find_one(
-            {"user_id": user["id"]},
-            {"_id": 0},
-            sort=[("created_at", -1)]
+@api_router.get("/admin/users", response_model=AdminUserPage)
+async def get_all_users(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    sort_by: Literal["total_duration", "last_activity", "name"] = "total_duration",
+    order: Literal["asc", "desc"] = "desc",
+    current_user: dict = Depends(get_admin_user)
+):
+    users, total = await storage.summaries.admin_user_stats(skip, limit, sort_by, descending=order == "desc")
+
+    stats = [
+        AdminUserStats(
+            user=User(**{**u, "created_at": as_datetime(u["created_at"])}),
+            total_entries=u["total_entries"],
+            total_duration=u["total_duration"],
+            last_activity=u["last_activity"]
         )
-        
-        stats.append(AdminUserStats(
-            user=User(**{**user, "created_at": datetime.fromisoformat(user["created_at"])}),
-            total_entries=len(entries),
-            total_duration=total_duration,
-            last_activity=datetime.fromisoformat(last_entry["created_at"]) if last_entry else None
-        ))
-    
-    return stats
+        for u in users
+    ]
+
+    return AdminUserPage(
+        users=stats,
+        total=total,
+        skip=skip,
+        limit=limit
+    )
 
 @api_router.get("/admin/reports")
-async def get_admin_reports(current_user: dict = Depends(get_admin_user)):
-    # Get all entries
-    all_entries = await db.time_entries.find({}, {"_id": 0}).to_list(10000)
-    
-    total_duration = sum(e.get("duration", 0) for e in all_entries if not e.get("is_running"))
-    total_users = await db.users.count_documents({})
-    
+async def get_admin_reports(
+    from_date: Optional[str] = Query(None, alias="from"),
+    to_date: Optional[str] = Query(None, alias="to"),
+    current_user: dict = Depends(get_admin_user)
+):
+    start, end = parse_date_range(from_date, to_date)
+    report, total_users = await asyncio.gather(
+        storage.summaries.org_report(start, end),
+        storage.users.count()
+    )
+
     return {
-        "total_entries": len(all_entries),
-        "total_duration": total_duration,
+        "total_entries": report["total_entries"],
+        "total_duration": report["total_duration"],
         "total_users": total_users,
-        "average_duration_per_entry": total_duration / len(all_entries) if all_entries else 0
+        "average_duration_per_entry": report["total_duration"] / report["total_entries"] if report["total_entries"] else 0,
+        "from": from_date,
+        "to": to_date,
+        "daily": report["daily"]
     }
 
+@api_router.get("/admin/cache")
+async def get_cache_stats(current_user: dict = Depends(get_admin_user)):
+    return {"users": user_cache.stats(), "suggestions": suggestion_cache.stats()}
+
+# ==================== Metrics ====================
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -595,6 +1530,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so the timings include the CORS handling
+app.add_middleware(MetricsMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -602,16 +1540,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# ✅ STARTUP: MongoDB check (PEHLE)
+# ✅ STARTUP: storage check (PEHLE)
 @app.on_event("startup")
 async def startup_db_check():
-    try:
-        await client.admin.command("ping")
-        print("✅ MongoDB connected successfully")
-    except Exception as e:
-        print("❌ MongoDB connection failed:", e)
+    await storage.startup()
+    await events.start()
+    # Project deletes interrupted by a restart carry on from where they stopped
+    for job in await storage.jobs.list_unfinished():
+        start_job(job)
 
         
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    tasks = list(job_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await events.stop()
+    await storage.shutdown()
+    password_executor.shutdown(wait=False)
\ No newline at end of file
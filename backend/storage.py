@@ -0,0 +1,1960 @@
+"""Storage layer behind the API routes.
+
+Route handlers talk to a ``Storage`` made of six repositories (users,
+projects, time entries, summaries, vocabulary, background jobs). ``MongoStorage`` is the production
+backend; ``MemoryStorage`` keeps everything in process dictionaries so the
+request path can be profiled and benchmarked without a database.
+``create_storage()`` picks one from the STORAGE_BACKEND environment variable.
+
+Documents are plain dicts shaped like the Mongo documents (no ``_id``).
+"""
+
+import asyncio
+import logging
+import os
+import re
+import uuid
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+
+logger = logging.getLogger(__name__)
+
+def as_datetime(value) -> Optional[datetime]:
+    # Dual read: documents not yet migrated still hold ISO strings
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def entry_day(start_time) -> str:
+    # Entries are attributed to the UTC day they started on, matching the summary routes
+    return as_datetime(start_time).astimezone(timezone.utc).date().isoformat()
+
+
+# Zones whose local days are the UTC days the rollups are keyed by
+UTC_ZONES = {"UTC", "Etc/UTC", "GMT", "Etc/GMT"}
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    # Weeks start on Monday, as in the weekly summary
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day + timedelta(days=7)
+    if granularity == "month":
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def local_day_bounds(start_date: date, end_date: date, tz: str) -> Tuple[datetime, datetime]:
+    # UTC instants covering the local days start_date..end_date, both inclusive
+    zone = ZoneInfo(tz)
+    start = datetime.combine(start_date, datetime.min.time(), tzinfo=zone)
+    end = datetime.combine(end_date + timedelta(days=1), datetime.min.time(), tzinfo=zone)
+    return start.astimezone(timezone.utc), end.astimezone(timezone.utc) - timedelta(microseconds=1)
+
+
+# Searchable entry fields and their relevance weight for a whole-word match
+SEARCH_FIELD_WEIGHTS = {"task_name": 3, "tags": 2, "description": 1}
+# Words are indexed by every prefix up to this length; longer query words match on their first characters
+SEARCH_PREFIX_LENGTH = 12
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(text.casefold())
+
+
+def search_fields(entry: dict) -> dict:
+    """Inverted-index fields stored on each entry, derived from its text fields.
+
+    ``search_terms`` (indexed) holds every prefix of every word, so a query
+    word matches entries with a word starting with it; ``search_words`` holds
+    the whole words tagged with their field, which relevance is scored on.
+    """
+    terms = set()
+    words = set()
+    for field in SEARCH_FIELD_WEIGHTS:
+        value = entry.get(field) or ""
+        for word in tokenize(" ".join(value) if isinstance(value, list) else value):
+            words.add(f"{field}:{word}")
+            terms.update(word[:n] for n in range(1, min(len(word), SEARCH_PREFIX_LENGTH) + 1))
+    return {"search_terms": sorted(terms), "search_words": sorted(words)}
+
+
+def _searchable(entry: dict) -> dict:
+    return {**entry, **search_fields(entry)}
+
+
+def _search_prefixes(words: List[str]) -> List[str]:
+    return [word[:SEARCH_PREFIX_LENGTH] for word in words]
+
+
+def _search_score(words: List[str], entry_words) -> int:
+    # Every query word matched at least a prefix; whole-word matches add their field's weight
+    return sum(
+        1 + sum(weight for field, weight in SEARCH_FIELD_WEIGHTS.items() if f"{field}:{word}" in entry_words)
+        for word in words
+    )
+
+
+def _rollup_increments(added: List[dict], removed: List[dict] = ()) -> dict:
+    # Fold a batch into one (duration, count) increment per rollup document
+    increments = {}
+    for entries, sign in ((added, 1), (removed, -1)):
+        for entry in entries:
+            key = (entry["user_id"], entry_day(entry["start_time"]), entry.get("project_id"))
+            duration, count = increments.get(key, (0, 0))
+            increments[key] = (duration + sign * entry.get("duration", 0), count + sign)
+    return {key: value for key, value in increments.items() if value != (0, 0)}
+
+
+def _project_increments(added: List[dict], removed: List[dict] = ()) -> dict:
+    # Same deltas as the rollups, folded per (user, project): (duration, count, latest start of an added entry)
+    increments = {}
+    for entries, sign in ((added, 1), (removed, -1)):
+        for entry in entries:
+            if not entry.get("project_id"):
+                continue
+            key = (entry["user_id"], entry["project_id"])
+            duration, count, last_used = increments.get(key, (0, 0, None))
+            if sign > 0:
+                started = as_datetime(entry["start_time"])
+                last_used = started if last_used is None or started > last_used else last_used
+            increments[key] = (duration + sign * entry.get("duration", 0), count + sign, last_used)
+    return {key: value for key, value in increments.items() if value[:2] != (0, 0) or value[2]}
+
+
+# Upper bound for a prefix range over string keys: sorts after any string starting with the prefix
+_PREFIX_END = chr(0x10FFFF)
+
+
+def _vocabulary_increments(added: List[dict], removed: List[dict] = ()) -> dict:
+    # Fold a batch into one (value, count, last_used) increment per term; terms match case-insensitively
+    increments = {}
+    for entries, sign in ((added, 1), (removed, -1)):
+        for entry in entries:
+            used_at = as_datetime(entry["start_time"]) if sign > 0 else None
+            values = [("task", entry["task_name"])] + [("tag", tag) for tag in entry.get("tags") or []]
+            terms = {(kind, value.strip().casefold()): value.strip() for kind, value in values if value.strip()}
+            for (kind, term_key), value in terms.items():
+                key = (entry["user_id"], kind, term_key)
+                spelling, count, last_used = increments.get(key, (value, 0, None))
+                if used_at and (last_used is None or used_at >= last_used):
+                    # The spelling used most recently is the one suggested
+                    spelling, last_used = value, used_at
+                increments[key] = (spelling, count + sign, last_used)
+    return {key: increment for key, increment in increments.items() if increment[1] != 0}
+
+
+def _merge_vocabulary(totals: dict, increments: dict):
+    # Fold one batch's increments into running totals, keeping the most recently used spelling
+    for key, (value, count, last_used) in increments.items():
+        spelling, total, latest = totals.get(key, (value, 0, None))
+        if last_used and (latest is None or last_used >= latest):
+            spelling, latest = value, last_used
+        totals[key] = (spelling, total + count, latest)
+
+
+class TimerConflict(Exception):
+    """Raised when a timer start keeps losing the race against concurrent starts."""
+
+
+# ==================== Interfaces ====================
+
+class UserRepository(ABC):
+    @abstractmethod
+    async def get(self, user_id: str) -> Optional[dict]:
+        """User document without the password hash."""
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[dict]:
+        """Full user document, including the password hash."""
+
+    @abstractmethod
+    async def create(self, user: dict):
+        ...
+
+    @abstractmethod
+    async def set_password_hash(self, user_id: str, password_hash: str):
+        ...
+
+    @abstractmethod
+    async def count(self) -> int:
+        ...
+
+    @abstractmethod
+    async def get_data_version(self, user_id: str) -> int:
+        """Counter bumped on every write to the user's projects or entries."""
+
+    @abstractmethod
+    async def bump_data_version(self, user_id: str):
+        ...
+
+
+class ProjectRepository(ABC):
+    @abstractmethod
+    async def create(self, project: dict):
+        ...
+
+    @abstractmethod
+    async def get(self, project_id: str, user_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def owned_ids(self, user_id: str, project_ids: Set[str]) -> Set[str]:
+        """The subset of ``project_ids`` that are projects of this user."""
+
+    @abstractmethod
+    async def list_for_user(self, user_id: str) -> List[dict]:
+        """Projects with their total_duration/entries_count/last_used counters, which the
+        summary repository keeps in step with the rollups."""
+
+    @abstractmethod
+    async def delete(self, project_id: str, user_id: str) -> bool:
+        ...
+
+
+class TimeEntryRepository(ABC):
+    @abstractmethod
+    async def insert(self, entry: dict):
+        ...
+
+    @abstractmethod
+    async def insert_many(self, entries: List[dict]) -> List[Tuple[int, str]]:
+        """Unordered insert; returns (index, reason) for each rejected entry."""
+
+    @abstractmethod
+    async def get(self, entry_id: str, user_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def get_running(self, user_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def start(self, entry: dict) -> List[dict]:
+        """Stop the user's running timer and insert ``entry`` as the new one.
+
+        Returns the entries that were stopped (normally zero or one).
+        Raises TimerConflict if concurrent starts keep winning the race.
+        """
+
+    @abstractmethod
+    async def stop_running(self, user_id: str, end_time: datetime) -> Optional[dict]:
+        """Stop the running timer and return it with its final duration, or None."""
+
+    @abstractmethod
+    async def get_many(self, user_id: str, entry_ids: List[str]) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def update_fields(self, entry: dict, fields: dict):
+        """Apply ``fields`` to the stored ``entry``, the caller's current copy of it (the search
+        fields are re-derived from it without another read)."""
+
+    @abstractmethod
+    async def count_for_project(self, user_id: str, project_id: str) -> int:
+        ...
+
+    @abstractmethod
+    async def reassign_project(self, user_id: str, project_id: str, new_project_id: Optional[str], limit: int) -> List[dict]:
+        """Move up to ``limit`` of the user's entries from ``project_id`` to ``new_project_id``
+        (None clears it); returns the moved entries as they were before the move."""
+
+    @abstractmethod
+    async def update_many(self, user_id: str, entries: dict, changes: dict):
+        """Apply ``{entry_id: fields}`` in one write, scoped to the user's entries; ``entries``
+        holds the caller's current copy of each by id, as for update_fields."""
+
+    @abstractmethod
+    async def delete_many(self, user_id: str, entry_ids: List[str]) -> int:
+        ...
+
+    @abstractmethod
+    async def delete(self, entry_id: str, user_id: str) -> Optional[dict]:
+        """Delete and return the entry, or None if it does not exist."""
+
+    @abstractmethod
+    async def list_page(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: Optional[Tuple] = None,
+        newer: bool = False,
+        project_id: Optional[str] = None,
+        tag: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[dict]:
+        """Up to ``limit`` entries ordered by (created_at, id), newest first.
+
+        ``cursor`` is a (created_at, id) key; entries strictly older than it are
+        returned, or strictly newer (oldest first) when ``newer`` is set.
+        """
+
+    @abstractmethod
+    async def search(
+        self,
+        user_id: str,
+        words: List[str],
+        limit: int,
+        offset: int = 0,
+        project_id: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[dict]:
+        """Entries with a word starting with each of ``words`` (lowercase, as from
+        ``tokenize``), best matches first and newest first among equals."""
+
+    @abstractmethod
+    async def list_started_between(self, user_id: str, start: datetime, end: datetime) -> List[dict]:
+        ...
+
+    @abstractmethod
+    def iter_entries(
+        self,
+        user_id: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        project_id: Optional[str] = None,
+        newest_first: bool = True,
+        batch_size: int = 1000
+    ) -> AsyncIterator[dict]:
+        """Stream entries for exports: newest first, or by start_time ascending."""
+
+
+class SummaryRepository(ABC):
+    @abstractmethod
+    async def apply_rollup(self, user_id: str, start_time, project_id: Optional[str], duration: int, count: int = 1):
+        """Adjust one rollup and the project's counters."""
+
+    @abstractmethod
+    async def apply_rollups(self, added: List[dict], removed: List[dict] = ()):
+        """Add and subtract batches of completed entries in one rollup write (and one project counter write)."""
+
+    @abstractmethod
+    async def move_rollup(self, entry: dict, project_id: Optional[str]):
+        """Move a completed entry's time from its current project's rollup to ``project_id``."""
+
+    @abstractmethod
+    async def daily_totals(self, user_id: str, start_date: str, end_date: str) -> dict:
+        """Per-day totals keyed by ISO date, folded across projects."""
+
+    @abstractmethod
+    async def range_totals(self, user_id: str, start_date: date, end_date: date, granularity: str, tz: str) -> dict:
+        """Totals of completed entries per day/week/month bucket of ``tz`` local time,
+        keyed by the ISO date the bucket starts on; empty buckets are left out."""
+
+    @abstractmethod
+    async def breakdown(self, user_id: str, start: Optional[datetime], end: Optional[datetime], by: str) -> dict:
+        """total_duration/entries_count of the completed entries started in the range, and
+        ``groups`` of key/name/color/total_duration/entries_count per project or tag, largest first.
+
+        An entry counts once towards each of its tags; untagged and unassigned time has key None."""
+
+    @abstractmethod
+    async def rebuild_rollups(self, user_id: Optional[str] = None, batch_size: int = 1000) -> int:
+        """Recompute the rollups and, through rebuild_project_stats, the project counters."""
+
+    @abstractmethod
+    async def rebuild_project_stats(self, user_id: Optional[str] = None):
+        ...
+
+    @abstractmethod
+    async def admin_user_stats(self, skip: int, limit: int, sort_by: str, descending: bool) -> Tuple[List[dict], int]:
+        """One page of users (without password hashes) with total_entries,
+        total_duration and last_activity, plus the total user count."""
+
+    @abstractmethod
+    async def org_report(self, start: Optional[datetime], end: Optional[datetime]) -> dict:
+        """Org-wide total_entries/total_duration and a per-day, per-project series."""
+
+
+class VocabularyRepository(ABC):
+    """Per-user tags and task names with usage counts, for autocomplete."""
+
+    @abstractmethod
+    async def apply(self, added: List[dict], removed: List[dict] = ()):
+        """Count the tags and task names of ``added`` entries as used and release those of ``removed`` ones."""
+
+    @abstractmethod
+    async def suggest(self, user_id: str, prefix: str, limit: int) -> dict:
+        """``tags`` and ``tasks`` starting with ``prefix`` (any case), each a list of
+        value/count/last_used, most used first."""
+
+    @abstractmethod
+    async def rebuild(self, user_id: Optional[str] = None, batch_size: int = 1000):
+        """Recount the vocabulary from the stored entries."""
+
+
+class JobRepository(ABC):
+    """Background jobs (currently project-delete cascades), leased to one worker at a time."""
+
+    @abstractmethod
+    async def create(self, job: dict):
+        ...
+
+    @abstractmethod
+    async def get(self, job_id: str, user_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def claim(self, job_id: str, owner: str, lease_seconds: float) -> Optional[dict]:
+        """Mark the job running under ``owner`` until the lease expires; None if it is finished
+        or another owner holds a live lease. The owner renews by claiming again."""
+
+    @abstractmethod
+    async def update(self, job_id: str, fields: dict, processed: int = 0) -> dict:
+        """Set ``fields``, add ``processed`` to the progress count, and return the job."""
+
+    @abstractmethod
+    async def list_unfinished(self) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def is_reassign_target(self, user_id: str, project_id: str) -> bool:
+        """Whether an unfinished job is still moving entries into ``project_id``."""
+
+
+class Storage(ABC):
+    users: UserRepository
+    projects: ProjectRepository
+    entries: TimeEntryRepository
+    summaries: SummaryRepository
+    vocabulary: VocabularyRepository
+    jobs: JobRepository
+    # Bumped whenever a backfill rewrites derived data; part of every ETag, since no user's data version moves
+    data_epoch: int = 0
+
+    async def startup(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
+# ==================== MongoDB ====================
+
+# Indexes every hot query relies on; created idempotently at startup
+REQUIRED_INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "projects": [
+        # Also the merge key when project counters are rebuilt
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("user_id", ASCENDING), ("created_at", ASCENDING)], name="user_created"),
+    ],
+    "time_entries": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="user_created_id"
+        ),
+        # Extends (user_id, start_time) with the fields totals read, so per-project and range totals are covered
+        IndexModel(
+            [("user_id", ASCENDING), ("start_time", ASCENDING), ("is_running", ASCENDING),
+             ("project_id", ASCENDING), ("duration", ASCENDING)],
+            name="user_start_totals"
+        ),
+        IndexModel([("start_time", ASCENDING)], name="start_time"),
+        # Batches of a project-delete cascade
+        IndexModel([("user_id", ASCENDING), ("project_id", ASCENDING)], name="user_project"),
+        # Multikey over the prefixes in search_terms, scoped to the user
+        IndexModel([("user_id", ASCENDING), ("search_terms", ASCENDING)], name="user_search_terms"),
+        # At most one running timer per user; timer start relies on this to detect races
+        IndexModel(
+            [("user_id", ASCENDING)],
+            name="user_running_unique",
+            unique=True,
+            partialFilterExpression={"is_running": True}
+        ),
+    ],
+    "vocabulary": [
+        IndexModel(
+            [("user_id", ASCENDING), ("kind", ASCENDING), ("key", ASCENDING)],
+            name="user_kind_key",
+            unique=True
+        ),
+        # Most used first when there is no prefix to narrow by
+        IndexModel(
+            [("user_id", ASCENDING), ("kind", ASCENDING), ("count", DESCENDING), ("last_used", DESCENDING)],
+            name="user_kind_count"
+        ),
+    ],
+    "jobs": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING)], name="status"),
+        IndexModel([("user_id", ASCENDING), ("reassign_to", ASCENDING)], name="user_reassign_to"),
+    ],
+    "daily_rollups": [
+        IndexModel(
+            [("user_id", ASCENDING), ("date", ASCENDING), ("project_id", ASCENDING)],
+            name="user_date_project",
+            unique=True
+        ),
+    ],
+}
+
+# Representative query shapes issued by the routes, checked against the planner at startup
+ROUTE_QUERIES = [
+    ("POST /auth/login", "users", {"email": ""}, None),
+    ("auth dependency", "users", {"id": ""}, None),
+    ("GET /projects", "projects", {"user_id": ""}, None),
+    ("DELETE /projects/{id}", "projects", {"id": "", "user_id": ""}, None),
+    ("project delete job", "time_entries", {"user_id": "", "project_id": ""}, None),
+    ("GET /jobs/{id}", "jobs", {"id": "", "user_id": ""}, None),
+    ("timer routes", "time_entries", {"user_id": "", "is_running": True}, None),
+    ("GET /entries", "time_entries", {"user_id": ""}, {"created_at": -1, "id": -1}),
+    ("/entries/{id}", "time_entries", {"id": "", "user_id": ""}, None),
+    ("GET /entries/search", "time_entries", {"user_id": "", "search_terms": {"$all": [""]}}, None),
+    ("daily summary, local-time range summary, breakdown", "time_entries", {"user_id": "", "start_time": {"$gte": ""}}, None),
+    ("GET /suggest", "vocabulary", {"user_id": "", "kind": "tag", "key": {"$gte": ""}}, None),
+    ("weekly/monthly summary, UTC range summary", "daily_rollups", {"user_id": "", "date": {"$gte": ""}}, None),
+]
+
+# Timestamp fields converted from ISO strings to native BSON dates by migrate_timestamps()
+TIMESTAMP_FIELDS = {
+    "users": ["created_at"],
+    "projects": ["created_at"],
+    "time_entries": ["start_time", "end_time", "created_at"],
+}
+TIMESTAMP_MIGRATION_ID = "native_datetime_timestamps"
+
+# Search fields are only read by the search query itself, never returned
+ENTRY_PROJECTION = {"_id": 0, "search_terms": 0, "search_words": 0}
+SEARCH_BACKFILL_ID = "entry_search_fields"
+VOCABULARY_BACKFILL_ID = "vocabulary"
+ROLLUP_BACKFILL_ID = "daily_rollups"
+PROJECT_STATS_BACKFILL_ID = "project_stats"
+# A worker running a migration renews its lease; another takes over once the lease lapses
+MIGRATION_LEASE_SECONDS = 120
+MIGRATION_POLL_SECONDS = 5
+
+# Superseded by user_running_unique and user_start_totals
+LEGACY_INDEXES = {"time_entries": ["user_running", "user_start"]}
+
+TIMER_START_ATTEMPTS = 3
+
+
+def _range_bounds(start: Optional[datetime], end: Optional[datetime]) -> dict:
+    return {op: bound for op, bound in (("$gte", start), ("$lte", end)) if bound is not None}
+
+
+def _plan_has_collscan(plan) -> bool:
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            return True
+        return any(_plan_has_collscan(v) for v in plan.values())
+    if isinstance(plan, list):
+        return any(_plan_has_collscan(v) for v in plan)
+    return False
+
+
+class MongoUserRepository(UserRepository):
+    def __init__(self, db):
+        self.db = db
+
+    async def get(self, user_id):
+        return await self.db.users.find_one({"id": user_id}, {"_id": 0, "password_hash": 0})
+
+    async def get_by_email(self, email):
+        return await self.db.users.find_one({"email": email}, {"_id": 0})
+
+    async def create(self, user):
+        # insert_one adds _id to the document it is given
+        await self.db.users.insert_one(dict(user))
+
+    async def set_password_hash(self, user_id, password_hash):
+        await self.db.users.update_one({"id": user_id}, {"$set": {"password_hash": password_hash}})
+
+    async def count(self):
+        return await self.db.users.count_documents({})
+
+    async def get_data_version(self, user_id):
+        user = await self.db.users.find_one({"id": user_id}, {"_id": 0, "data_version": 1})
+        return user.get("data_version", 0) if user else 0
+
+    async def bump_data_version(self, user_id):
+        await self.db.users.update_one({"id": user_id}, {"$inc": {"data_version": 1}})
+
+
+class MongoProjectRepository(ProjectRepository):
+    def __init__(self, db):
+        self.db = db
+
+    async def create(self, project):
+        await self.db.projects.insert_one(dict(project))
+
+    async def get(self, project_id, user_id):
+        return await self.db.projects.find_one({"id": project_id, "user_id": user_id}, {"_id": 0})
+
+    async def owned_ids(self, user_id, project_ids):
+        if not project_ids:
+            return set()
+        projects = await self.db.projects.find(
+            {"id": {"$in": list(project_ids)}, "user_id": user_id}, {"_id": 0, "id": 1}
+        ).to_list(None)
+        return {p["id"] for p in projects}
+
+    async def list_for_user(self, user_id):
+        return await self.db.projects.find({"user_id": user_id}, {"_id": 0}).to_list(1000)
+
+    async def delete(self, project_id, user_id):
+        result = await self.db.projects.delete_one({"id": project_id, "user_id": user_id})
+        return result.deleted_count > 0
+
+
+class MongoTimeEntryRepository(TimeEntryRepository):
+    def __init__(self, storage: "MongoStorage"):
+        self.storage = storage
+        self.db = storage.db
+
+    async def insert(self, entry):
+        await self.db.time_entries.insert_one(_searchable(entry))
+
+    async def insert_many(self, entries):
+        if not entries:
+            return []
+        try:
+            await self.db.time_entries.insert_many([_searchable(e) for e in entries], ordered=False)
+        except BulkWriteError as e:
+            return [(error["index"], error["errmsg"]) for error in e.details["writeErrors"]]
+        return []
+
+    async def get(self, entry_id, user_id):
+        return await self.db.time_entries.find_one({"id": entry_id, "user_id": user_id}, ENTRY_PROJECTION)
+
+    async def get_running(self, user_id):
+        return await self.db.time_entries.find_one({"user_id": user_id, "is_running": True}, ENTRY_PROJECTION)
+
+    async def start(self, entry):
+        stopped = []
+        for _ in range(TIMER_START_ATTEMPTS):
+            previous = await self.stop_running(entry["user_id"], entry["start_time"])
+            if previous:
+                stopped.append(previous)
+            try:
+                await self.db.time_entries.insert_one(_searchable(entry))
+                return stopped
+            except DuplicateKeyError:
+                # A concurrent start inserted its timer between our stop and insert; stop that one too
+                continue
+        raise TimerConflict(entry["user_id"])
+
+    async def stop_running(self, user_id, end_time):
+        # One findAndModify: the duration is computed server-side from the stored start time
+        return await self.db.time_entries.find_one_and_update(
+            {"user_id": user_id, "is_running": True},
+            [{"$set": {
+                "is_running": False,
+                "end_time": end_time,
+                "duration": {"$toInt": {"$trunc": {"$divide": [
+                    {"$subtract": [end_time, {"$toDate": "$start_time"}]}, 1000
+                ]}}}
+            }}],
+            projection=ENTRY_PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def get_many(self, user_id, entry_ids):
+        return await self.db.time_entries.find(
+            {"id": {"$in": entry_ids}, "user_id": user_id}, ENTRY_PROJECTION
+        ).to_list(None)
+
+    @staticmethod
+    def _with_search_fields(entry: dict, fields: dict) -> dict:
+        # Text edits re-derive the search fields from the edited document
+        if SEARCH_FIELD_WEIGHTS.keys() & fields.keys():
+            return {**fields, **search_fields({**entry, **fields})}
+        return fields
+
+    async def count_for_project(self, user_id, project_id):
+        return await self.db.time_entries.count_documents({"user_id": user_id, "project_id": project_id})
+
+    async def reassign_project(self, user_id, project_id, new_project_id, limit):
+        entries = await self.db.time_entries.find(
+            {"user_id": user_id, "project_id": project_id},
+            {"_id": 0, "id": 1, "user_id": 1, "project_id": 1, "start_time": 1, "duration": 1, "is_running": 1}
+        ).limit(limit).to_list(limit)
+        if entries:
+            await self.db.time_entries.update_many(
+                {"id": {"$in": [e["id"] for e in entries]}, "project_id": project_id},
+                {"$set": {"project_id": new_project_id}}
+            )
+        return entries
+
+    async def update_fields(self, entry, fields):
+        await self.db.time_entries.update_one({"id": entry["id"]}, {"$set": self._with_search_fields(entry, fields)})
+
+    async def update_many(self, user_id, entries, changes):
+        if changes:
+            await self.db.time_entries.bulk_write([
+                UpdateOne({"id": entry_id, "user_id": user_id}, {"$set": self._with_search_fields(entries[entry_id], fields)})
+                for entry_id, fields in changes.items()
+            ], ordered=False)
+
+    async def delete_many(self, user_id, entry_ids):
+        result = await self.db.time_entries.delete_many({"id": {"$in": entry_ids}, "user_id": user_id})
+        return result.deleted_count
+
+    async def delete(self, entry_id, user_id):
+        return await self.db.time_entries.find_one_and_delete(
+            {"id": entry_id, "user_id": user_id},
+            projection=ENTRY_PROJECTION
+        )
+
+    def _keyset_filter(self, created_at, entry_id, older):
+        op = "$lt" if older else "$gt"
+        clauses = [
+            {"created_at": {op: created_at}},
+            {"created_at": created_at, "id": {op: entry_id}}
+        ]
+        if not self.storage.timestamps_migrated:
+            # Unmigrated string timestamps sort below every date, so they are older than any date cursor
+            if older and isinstance(created_at, datetime):
+                clauses.append({"created_at": {"$type": "string"}})
+            elif not older and isinstance(created_at, str):
+                clauses.append({"created_at": {"$type": "date"}})
+        return {"$or": clauses}
+
+    def _conditions(self, user_id=None, project_id=None, tag=None, start=None, end=None) -> list:
+        conditions = [{"user_id": user_id}] if user_id else []
+        if project_id:
+            conditions.append({"project_id": project_id})
+        if tag:
+            conditions.append({"tags": tag})
+        bounds = _range_bounds(start, end)
+        if bounds:
+            conditions.append(self.storage.time_filter("start_time", bounds))
+        return conditions
+
+    async def list_page(self, user_id, limit, cursor=None, newer=False, project_id=None, tag=None, start=None, end=None):
+        conditions = self._conditions(user_id, project_id, tag, start, end)
+        if cursor:
+            conditions.append(self._keyset_filter(*cursor, older=not newer))
+
+        # Paging towards newer entries walks the index the other way
+        direction = ASCENDING if newer else DESCENDING
+        return await self.db.time_entries.find(
+            {"$and": conditions},
+            ENTRY_PROJECTION
+        ).sort([("created_at", direction), ("id", direction)]).limit(limit).to_list(limit)
+
+    async def search(self, user_id, words, limit, offset=0, project_id=None, start=None, end=None):
+        conditions = self._conditions(user_id, project_id, None, start, end)
+        conditions.append({"search_terms": {"$all": _search_prefixes(words)}})
+        entry_words = {"$ifNull": ["$search_words", []]}
+        # Same scoring as _search_score, evaluated on the server over the matching entries only
+        score = {"$add": [len(words)] + [
+            {"$cond": [{"$in": [f"{field}:{word}", entry_words]}, weight, 0]}
+            for word in words
+            for field, weight in SEARCH_FIELD_WEIGHTS.items()
+        ]}
+        return await self.db.time_entries.aggregate([
+            {"$match": {"$and": conditions}},
+            {"$set": {"search_score": score}},
+            {"$sort": {"search_score": -1, "created_at": -1, "id": -1}},
+            {"$skip": offset},
+            {"$limit": limit},
+            {"$project": {**ENTRY_PROJECTION, "search_score": 0}}
+        ]).to_list(limit)
+
+    async def list_started_between(self, user_id, start, end):
+        return await self.db.time_entries.find(
+            {"user_id": user_id, **self.storage.time_filter("start_time", _range_bounds(start, end))},
+            ENTRY_PROJECTION
+        ).to_list(1000)
+
+    async def iter_entries(self, user_id=None, start=None, end=None, project_id=None, newest_first=True, batch_size=1000):
+        conditions = self._conditions(user_id, project_id, start=start, end=end)
+        if newest_first:
+            sort = [("created_at", DESCENDING), ("id", DESCENDING)]
+        else:
+            sort = [("start_time", ASCENDING)]
+        cursor = self.db.time_entries.find(
+            {"$and": conditions} if conditions else {},
+            ENTRY_PROJECTION
+        ).sort(sort).batch_size(batch_size)
+        async for entry in cursor:
+            yield entry
+
+
+class MongoSummaryRepository(SummaryRepository):
+    def __init__(self, storage: "MongoStorage"):
+        self.storage = storage
+        self.db = storage.db
+
+    @staticmethod
+    def _rollup_key(user_id, start_time, project_id):
+        return {"user_id": user_id, "date": entry_day(start_time), "project_id": project_id}
+
+    @staticmethod
+    def _project_update(duration, count, last_used) -> dict:
+        update = {"$inc": {"total_duration": duration, "entries_count": count}}
+        if last_used:
+            update["$max"] = {"last_used": last_used}
+        return update
+
+    async def apply_rollup(self, user_id, start_time, project_id, duration, count=1):
+        await self.db.daily_rollups.update_one(
+            self._rollup_key(user_id, start_time, project_id),
+            {"$inc": {"total_duration": duration, "entries_count": count}},
+            upsert=True
+        )
+        if project_id:
+            # Counters of a deleted project have nowhere to go, so no upsert
+            last_used = as_datetime(start_time) if count > 0 else None
+            await self.db.projects.update_one(
+                {"id": project_id, "user_id": user_id}, self._project_update(duration, count, last_used)
+            )
+
+    async def apply_rollups(self, added, removed=()):
+        increments = _rollup_increments(added, removed)
+        if increments:
+            await self.db.daily_rollups.bulk_write([
+                UpdateOne(
+                    {"user_id": user_id, "date": day, "project_id": project_id},
+                    {"$inc": {"total_duration": duration, "entries_count": count}},
+                    upsert=True
+                )
+                for (user_id, day, project_id), (duration, count) in increments.items()
+            ], ordered=False)
+        projects = _project_increments(added, removed)
+        if projects:
+            await self.db.projects.bulk_write([
+                UpdateOne({"id": project_id, "user_id": user_id}, self._project_update(*increment))
+                for (user_id, project_id), increment in projects.items()
+            ], ordered=False)
+
+    async def move_rollup(self, entry, project_id):
+        await self.apply_rollups([{**entry, "project_id": project_id}], [entry])
+
+    async def daily_totals(self, user_id, start_date, end_date):
+        rollups = await self.db.daily_rollups.find(
+            {"user_id": user_id, "date": {"$gte": start_date, "$lte": end_date}},
+            {"_id": 0}
+        ).to_list(None)
+
+        # One document per (day, project); fold projects into per-day totals
+        totals = {}
+        for rollup in rollups:
+            day = totals.setdefault(rollup["date"], {"date": rollup["date"], "total_duration": 0, "entries_count": 0})
+            day["total_duration"] += rollup["total_duration"]
+            day["entries_count"] += rollup["entries_count"]
+        return totals
+
+    async def range_totals(self, user_id, start_date, end_date, granularity, tz):
+        unit = {"unit": granularity, **({"startOfWeek": "monday"} if granularity == "week" else {})}
+        if tz in UTC_ZONES:
+            # Rollup days are UTC days: the cost is one small document per (day, project), not per entry
+            bucket = "$date" if granularity == "day" else {"$dateToString": {
+                "format": "%Y-%m-%d",
+                "date": {"$dateTrunc": {"date": {"$dateFromString": {"dateString": "$date"}}, **unit}}
+            }}
+            collection = self.db.daily_rollups
+            pipeline = [
+                {"$match": {"user_id": user_id, "date": {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()}}},
+                {"$group": {
+                    "_id": bucket,
+                    "total_duration": {"$sum": "$total_duration"},
+                    "entries_count": {"$sum": "$entries_count"}
+                }}
+            ]
+        else:
+            # UTC rollups can't be split into local days, so group the entries in that zone on the server
+            bounds = _range_bounds(*local_day_bounds(start_date, end_date, tz))
+            local_start = {"$dateTrunc": {"date": {"$toDate": "$start_time"}, "timezone": tz, **unit}}
+            collection = self.db.time_entries
+            pipeline = [
+                {"$match": {"user_id": user_id, "is_running": False, **self.storage.time_filter("start_time", bounds)}},
+                {"$group": {
+                    "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": local_start, "timezone": tz}},
+                    "total_duration": {"$sum": "$duration"},
+                    "entries_count": {"$sum": 1}
+                }}
+            ]
+
+        totals = {}
+        async for group in collection.aggregate(pipeline):
+            totals[group["_id"]] = {
+                "date": group["_id"],
+                "total_duration": group["total_duration"],
+                "entries_count": group["entries_count"]
+            }
+        return totals
+
+    async def breakdown(self, user_id, start, end, by):
+        bounds = _range_bounds(start, end)
+        match = {"user_id": user_id, "is_running": False, **(self.storage.time_filter("start_time", bounds) if bounds else {})}
+        totals = {"_id": None, "total_duration": {"$sum": "$duration"}, "entries_count": {"$sum": 1}}
+
+        if by == "project":
+            groups = [
+                {"$group": {**totals, "_id": "$project_id"}},
+                # Only the user's own projects; a foreign project_id is reported without a name
+                {"$lookup": {
+                    "from": "projects",
+                    "let": {"project_id": "$_id"},
+                    "pipeline": [
+                        {"$match": {"user_id": user_id, "$expr": {"$eq": ["$id", "$$project_id"]}}},
+                        {"$project": {"_id": 0, "name": 1, "color": 1}}
+                    ],
+                    "as": "project"
+                }},
+                {"$set": {"project": {"$first": "$project"}}},
+                {"$set": {"name": "$project.name", "color": "$project.color"}},
+            ]
+        else:
+            groups = [
+                # Each tag once per entry; untagged entries stay in as a null group
+                {"$project": {"duration": 1, "tags": {"$setUnion": [{"$ifNull": ["$tags", []]}, []]}}},
+                {"$unwind": {"path": "$tags", "preserveNullAndEmptyArrays": True}},
+                {"$group": {**totals, "_id": "$tags"}},
+                {"$set": {"name": "$_id", "color": None}},
+            ]
+        groups += [
+            {"$sort": {"total_duration": -1, "_id": 1}},
+            {"$project": {
+                "_id": 0,
+                "key": "$_id",
+                "name": {"$ifNull": ["$name", None]},
+                "color": {"$ifNull": ["$color", None]},
+                "total_duration": 1,
+                "entries_count": 1
+            }}
+        ]
+
+        pipeline = [
+            {"$match": match},
+            {"$facet": {"totals": [{"$group": totals}], "groups": groups}}
+        ]
+        result = await self.db.time_entries.aggregate(pipeline).to_list(1)
+        facet = result[0] if result else {"totals": [], "groups": []}
+        overall = facet["totals"][0] if facet["totals"] else {"total_duration": 0, "entries_count": 0}
+        return {
+            "total_duration": overall["total_duration"],
+            "entries_count": overall["entries_count"],
+            "groups": facet["groups"]
+        }
+
+    async def rebuild_rollups(self, user_id=None, batch_size=1000):
+        scope = {"user_id": user_id} if user_id else {}
+        await self.db.daily_rollups.delete_many(scope)
+
+        pipeline = [
+            {"$match": {**scope, "is_running": False}},
+            {"$group": {
+                "_id": {
+                    "user_id": "$user_id",
+                    "date": {"$dateToString": {"format": "%Y-%m-%d", "date": {"$toDate": "$start_time"}}},
+                    "project_id": "$project_id"
+                },
+                "total_duration": {"$sum": "$duration"},
+                "entries_count": {"$sum": 1}
+            }}
+        ]
+
+        written = 0
+        batch = []
+        async for group in self.db.time_entries.aggregate(pipeline, allowDiskUse=True):
+            batch.append(UpdateOne(
+                {**group["_id"], "project_id": group["_id"].get("project_id")},
+                {"$set": {"total_duration": group["total_duration"], "entries_count": group["entries_count"]}},
+                upsert=True
+            ))
+            if len(batch) >= batch_size:
+                await self.db.daily_rollups.bulk_write(batch, ordered=False)
+                written += len(batch)
+                batch = []
+        if batch:
+            await self.db.daily_rollups.bulk_write(batch, ordered=False)
+            written += len(batch)
+        await self.rebuild_project_stats(user_id)
+        return written
+
+    async def rebuild_project_stats(self, user_id=None):
+        scope = {"user_id": user_id} if user_id else {}
+        await self.db.projects.update_many(scope, {"$set": {"total_duration": 0, "entries_count": 0, "last_used": None}})
+        # Grouped and written back by the server in one command. Only entries of the project's own user
+        # count, and projects that no longer exist are skipped.
+        await self.db.time_entries.aggregate([
+            {"$match": {**scope, "is_running": False, "project_id": {"$ne": None}}},
+            {"$group": {
+                "_id": {"user_id": "$user_id", "project_id": "$project_id"},
+                "total_duration": {"$sum": "$duration"},
+                "entries_count": {"$sum": 1},
+                "last_used": {"$max": {"$toDate": "$start_time"}}
+            }},
+            {"$lookup": {
+                "from": "projects",
+                "let": {"user_id": "$_id.user_id", "project_id": "$_id.project_id"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$and": [
+                        {"$eq": ["$id", "$$project_id"]},
+                        {"$eq": ["$user_id", "$$user_id"]}
+                    ]}}},
+                    {"$project": {"_id": 1}}
+                ],
+                "as": "project"
+            }},
+            {"$match": {"project": {"$ne": []}}},
+            {"$project": {"_id": 0, "id": "$_id.project_id", "total_duration": 1, "entries_count": 1, "last_used": 1}},
+            {"$merge": {"into": "projects", "on": "id", "whenMatched": "merge", "whenNotMatched": "discard"}}
+        ]).to_list(None)
+
+    async def admin_user_stats(self, skip, limit, sort_by, descending):
+        direction = -1 if descending else 1
+        page = [{"$skip": skip}, {"$limit": limit}]
+        # Per-user totals are grouped on the server; the lookup uses the user_id index on time_entries
+        lookup = [
+            {"$lookup": {
+                "from": "time_entries",
+                "localField": "id",
+                "foreignField": "user_id",
+                "pipeline": [
+                    {"$group": {
+                        "_id": None,
+                        "total_entries": {"$sum": 1},
+                        "total_duration": {"$sum": {"$cond": ["$is_running", 0, "$duration"]}},
+                        "last_activity": {"$max": {"$toDate": "$created_at"}}
+                    }}
+                ],
+                "as": "stats"
+            }},
+            {"$set": {"stats": {"$ifNull": [{"$first": "$stats"}, {}]}}},
+            {"$set": {
+                "total_entries": {"$ifNull": ["$stats.total_entries", 0]},
+                "total_duration": {"$ifNull": ["$stats.total_duration", 0]},
+                "last_activity": {"$ifNull": ["$stats.last_activity", None]}
+            }},
+            {"$unset": "stats"}
+        ]
+
+        if sort_by == "name":
+            # Sorting by a user field lets us paginate before joining, so only one page is looked up
+            users_pipeline = [{"$sort": {"name": direction, "id": 1}}, *page, *lookup]
+        else:
+            users_pipeline = [*lookup, {"$sort": {sort_by: direction, "id": 1}}, *page]
+
+        pipeline = [
+            {"$project": {"_id": 0, "password_hash": 0}},
+            {"$facet": {
+                "users": users_pipeline,
+                "total": [{"$count": "count"}]
+            }}
+        ]
+        result = await self.db.users.aggregate(pipeline).to_list(1)
+        facet = result[0] if result else {"users": [], "total": []}
+        return facet["users"], facet["total"][0]["count"] if facet["total"] else 0
+
+    async def org_report(self, start, end):
+        bounds = _range_bounds(start, end)
+        match = self.storage.time_filter("start_time", bounds) if bounds else {}
+
+        pipeline = [
+            {"$match": match},
+            {"$facet": {
+                "totals": [
+                    {"$group": {
+                        "_id": None,
+                        "total_entries": {"$sum": 1},
+                        "total_duration": {"$sum": {"$cond": ["$is_running", 0, "$duration"]}}
+                    }}
+                ],
+                "daily": [
+                    {"$match": {"is_running": False}},
+                    {"$group": {
+                        "_id": {
+                            "date": {"$dateTrunc": {"date": {"$toDate": "$start_time"}, "unit": "day"}},
+                            "project_id": "$project_id"
+                        },
+                        "total_duration": {"$sum": "$duration"},
+                        "entries_count": {"$sum": 1}
+                    }},
+                    {"$sort": {"total_duration": -1}},
+                    {"$group": {
+                        "_id": "$_id.date",
+                        "total_duration": {"$sum": "$total_duration"},
+                        "entries_count": {"$sum": "$entries_count"},
+                        "projects": {"$push": {
+                            "project_id": "$_id.project_id",
+                            "total_duration": "$total_duration",
+                            "entries_count": "$entries_count"
+                        }}
+                    }},
+                    {"$sort": {"_id": 1}},
+                    {"$project": {
+                        "_id": 0,
+                        "date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$_id"}},
+                        "total_duration": 1,
+                        "entries_count": 1,
+                        "projects": 1
+                    }}
+                ]
+            }}
+        ]
+
+        result = await self.db.time_entries.aggregate(pipeline).to_list(1)
+        facet = result[0] if result else {"totals": [], "daily": []}
+        totals = facet["totals"][0] if facet["totals"] else {"total_entries": 0, "total_duration": 0}
+        return {
+            "total_entries": totals["total_entries"],
+            "total_duration": totals["total_duration"],
+            "daily": facet["daily"]
+        }
+
+
+class MongoVocabularyRepository(VocabularyRepository):
+    def __init__(self, db):
+        self.db = db
+
+    async def apply(self, added, removed=()):
+        increments = _vocabulary_increments(added, removed)
+        if not increments:
+            return
+
+        operations = []
+        for (user_id, kind, key), (value, count, last_used) in increments.items():
+            update = {"$inc": {"count": count}}
+            if last_used:
+                update.update({"$set": {"value": value}, "$max": {"last_used": last_used}})
+            # Releases never create a term; they only count down one that exists
+            operations.append(UpdateOne({"user_id": user_id, "kind": kind, "key": key}, update, upsert=count > 0))
+        await self.db.vocabulary.bulk_write(operations, ordered=False)
+
+        released = {user_id for (user_id, _, _), (_, count, _) in increments.items() if count < 0}
+        if released:
+            await self.db.vocabulary.delete_many({"user_id": {"$in": list(released)}, "count": {"$lte": 0}})
+
+    async def suggest(self, user_id, prefix, limit):
+        key = prefix.strip().casefold()
+        query = {"user_id": user_id, **({"key": {"$gte": key, "$lt": key + _PREFIX_END}} if key else {})}
+
+        async def top(kind):
+            return await self.db.vocabulary.find(
+                {**query, "kind": kind},
+                {"_id": 0, "value": 1, "count": 1, "last_used": 1}
+            ).sort([("count", DESCENDING), ("last_used", DESCENDING)]).limit(limit).to_list(limit)
+
+        tags, tasks = await asyncio.gather(top("tag"), top("task"))
+        return {"tags": tags, "tasks": tasks}
+
+    async def rebuild(self, user_id=None, batch_size=1000):
+        # Counted in Python so keys are casefolded exactly as incremental updates do. Counts are
+        # written as absolute values per user, so a rerun or an overlapping rebuild cannot add to them
+        user_ids = [user_id] if user_id else await self.db.users.distinct("id")
+        projection = {"_id": 0, "user_id": 1, "task_name": 1, "tags": 1, "start_time": 1}
+        for uid in user_ids:
+            terms = {}
+            batch = []
+            async for entry in self.db.time_entries.find({"user_id": uid}, projection).batch_size(batch_size):
+                batch.append(entry)
+                if len(batch) >= batch_size:
+                    _merge_vocabulary(terms, _vocabulary_increments(batch))
+                    batch = []
+            _merge_vocabulary(terms, _vocabulary_increments(batch))
+
+            if terms:
+                await self.db.vocabulary.bulk_write([
+                    UpdateOne(
+                        {"user_id": term_user, "kind": kind, "key": key},
+                        {"$set": {"value": value, "count": count}, "$max": {"last_used": last_used}},
+                        upsert=True
+                    )
+                    for (term_user, kind, key), (value, count, last_used) in terms.items()
+                ], ordered=False)
+            stale = [
+                doc["_id"] async for doc in self.db.vocabulary.find({"user_id": uid}, {"kind": 1, "key": 1})
+                if (uid, doc["kind"], doc["key"]) not in terms
+            ]
+            if stale:
+                await self.db.vocabulary.delete_many({"_id": {"$in": stale}})
+
+
+class MongoJobRepository(JobRepository):
+    def __init__(self, db):
+        self.db = db
+
+    async def create(self, job):
+        await self.db.jobs.insert_one(dict(job))
+
+    async def get(self, job_id, user_id):
+        return await self.db.jobs.find_one({"id": job_id, "user_id": user_id}, {"_id": 0})
+
+    async def claim(self, job_id, owner, lease_seconds):
+        now = datetime.now(timezone.utc)
+        return await self.db.jobs.find_one_and_update(
+            {
+                "id": job_id,
+                "status": {"$in": ["pending", "running"]},
+                "$or": [{"owner": owner}, {"lease_until": None}, {"lease_until": {"$lt": now}}]
+            },
+            {"$set": {"status": "running", "owner": owner, "lease_until": now + timedelta(seconds=lease_seconds)}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def update(self, job_id, fields, processed=0):
+        return await self.db.jobs.find_one_and_update(
+            {"id": job_id},
+            {"$set": {**fields, "updated_at": datetime.now(timezone.utc)}, "$inc": {"processed": processed}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def list_unfinished(self):
+        return await self.db.jobs.find({"status": {"$in": ["pending", "running"]}}, {"_id": 0}).to_list(None)
+
+    async def is_reassign_target(self, user_id, project_id):
+        return await self.db.jobs.find_one(
+            {"user_id": user_id, "reassign_to": project_id, "status": {"$in": ["pending", "running"]}},
+            {"_id": 1}
+        ) is not None
+
+
+class MongoStorage(Storage):
+    def __init__(self, client, db_name: str):
+        self.client = client
+        self.db = client[db_name]
+        # Flipped once every document stores native dates; until then range filters also match strings
+        self.timestamps_migrated = False
+        self.migration_task = None
+        self.worker_id = uuid.uuid4().hex
+        self.users = MongoUserRepository(self.db)
+        self.projects = MongoProjectRepository(self.db)
+        self.entries = MongoTimeEntryRepository(self)
+        self.summaries = MongoSummaryRepository(self)
+        self.vocabulary = MongoVocabularyRepository(self.db)
+        self.jobs = MongoJobRepository(self.db)
+
+    @classmethod
+    def from_env(cls) -> "MongoStorage":
+        from motor.motor_asyncio import AsyncIOMotorClient
+        import certifi
+
+        # TLS is on for Atlas; MONGO_TLS=false allows a plain local mongod (benchmarks, development)
+        mongo_options = {"tz_aware": True}
+        if os.environ.get('MONGO_TLS', 'true').lower() != 'false':
+            mongo_options.update(tls=True, tlsCAFile=certifi.where())
+
+        client = AsyncIOMotorClient(os.environ['MONGO_URL'], **mongo_options)
+        return cls(client, os.environ['DB_NAME'])
+
+    def time_filter(self, field: str, bounds: dict) -> dict:
+        if self.timestamps_migrated:
+            return {field: bounds}
+        # BSON compares dates and strings in separate type brackets, so match both representations
+        return {"$or": [
+            {field: bounds},
+            {field: {op: bound.isoformat() for op, bound in bounds.items()}}
+        ]}
+
+    async def repair_running_timers(self):
+        """Stop all but the newest running timer for any user who has several.
+
+        Older code could leave duplicates behind under concurrent starts, and
+        the unique running-timer index cannot be built while they exist.
+        """
+        duplicates = self.db.time_entries.aggregate([
+            {"$match": {"is_running": True}},
+            {"$group": {"_id": "$user_id", "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ])
+        async for group in duplicates:
+            running = await self.db.time_entries.find(
+                {"user_id": group["_id"], "is_running": True}, ENTRY_PROJECTION
+            ).to_list(None)
+            running.sort(key=lambda e: as_datetime(e["start_time"]))
+            # Each stale timer ends where the next one started, as a serialized start would have done
+            for entry, successor in zip(running, running[1:]):
+                end_time = as_datetime(successor["start_time"])
+                duration = max(0, int((end_time - as_datetime(entry["start_time"])).total_seconds()))
+                await self.db.time_entries.update_one(
+                    {"id": entry["id"]},
+                    {"$set": {"is_running": False, "end_time": end_time, "duration": duration}}
+                )
+                await self.summaries.apply_rollup(entry["user_id"], entry["start_time"], entry.get("project_id"), duration)
+            logger.warning("Stopped %d duplicate running timers for user %s", len(running) - 1, group["_id"])
+
+    async def ensure_indexes(self):
+        for collection, names in LEGACY_INDEXES.items():
+            existing = await self.db[collection].index_information()
+            for name in names:
+                if name in existing:
+                    await self.db[collection].drop_index(name)
+        await self.repair_running_timers()
+
+        for collection, indexes in REQUIRED_INDEXES.items():
+            try:
+                await self.db[collection].create_indexes(indexes)
+            except OperationFailure as e:
+                # An existing index with the same keys but different options; leave it for the report
+                logger.warning("Could not create indexes on %s: %s", collection, e)
+
+    async def report_index_health(self):
+        for collection, indexes in REQUIRED_INDEXES.items():
+            existing = await self.db[collection].index_information()
+            for index in indexes:
+                name = index.document["name"]
+                if name not in existing:
+                    logger.warning("Missing index %s.%s", collection, name)
+
+        for route, collection, query, sort in ROUTE_QUERIES:
+            find_cmd = {"find": collection, "filter": query}
+            if sort:
+                find_cmd["sort"] = sort
+            explain = await self.db.command({"explain": find_cmd, "verbosity": "queryPlanner"})
+            if _plan_has_collscan(explain.get("queryPlanner", {}).get("winningPlan")):
+                logger.warning("Query for %s on %s would use a collection scan: %s", route, collection, query)
+
+    async def _rewrite_in_batches(self, collection, pending, projection, fields_for, batch_size, pause) -> int:
+        """$set ``fields_for(doc)`` on every document matching ``pending``; returns how many were rewritten."""
+        last_id = None
+        rewritten = 0
+        while True:
+            # Walk _id order so each batch resumes where the last stopped; an unsorted find would rescan
+            # every rewritten document from the start of the collection on every batch
+            query = {**pending, "_id": {"$gt": last_id}} if last_id else pending
+            docs = await self.db[collection].find(query, projection).sort("_id", ASCENDING).limit(batch_size).to_list(batch_size)
+            if not docs:
+                return rewritten
+            await self.db[collection].bulk_write([
+                UpdateOne({"_id": doc["_id"]}, {"$set": fields_for(doc)})
+                for doc in docs
+            ], ordered=False)
+            last_id = docs[-1]["_id"]
+            rewritten += len(docs)
+            # Yield between batches so the migration never starves request handling
+            await asyncio.sleep(pause)
+
+    async def migrate_timestamps(self, batch_size: int = 500, pause: float = 0.05):
+        """Convert ISO-string timestamps to native dates."""
+        for collection, fields in TIMESTAMP_FIELDS.items():
+            converted = await self._rewrite_in_batches(
+                collection,
+                {"$or": [{field: {"$type": "string"}} for field in fields]},
+                {field: 1 for field in fields},
+                lambda doc: {f: as_datetime(doc[f]) for f in fields if isinstance(doc.get(f), str)},
+                batch_size, pause
+            )
+            if converted:
+                logger.info("Converted timestamps on %d %s documents", converted, collection)
+        logger.info("Timestamp migration complete")
+
+    async def backfill_search_fields(self, batch_size: int = 500, pause: float = 0.05):
+        """Derive search fields for entries written before search existed."""
+        indexed = await self._rewrite_in_batches(
+            "time_entries",
+            {"search_terms": {"$exists": False}},
+            {"_id": 1, **{field: 1 for field in SEARCH_FIELD_WEIGHTS}},
+            search_fields,
+            batch_size, pause
+        )
+        logger.info("Search fields backfilled on %d entries", indexed)
+
+    async def backfill_vocabulary(self):
+        await self.vocabulary.rebuild()
+        logger.info("Vocabulary backfilled")
+
+    async def backfill_rollups(self):
+        """Build the daily rollups (and project counters) for history written before rollups existed;
+        until then weekly/monthly summaries count only entries written since. A write landing while
+        this runs can be missed by the rebuild; rebuild_rollups.py repairs that off-peak."""
+        written = await self.summaries.rebuild_rollups()
+        logger.info("Daily rollups backfilled: %d documents", written)
+
+    async def backfill_project_stats(self):
+        await self.summaries.rebuild_project_stats()
+        logger.info("Project counters backfilled")
+
+    async def claim_migration(self, migration_id) -> Optional[bool]:
+        """True if this worker now holds the migration, False if it has completed, None if another worker holds it."""
+        now = datetime.now(timezone.utc)
+        try:
+            # Upserting on _id makes the claim atomic: only one worker can insert or take over the marker
+            await self.db.migrations.find_one_and_update(
+                {
+                    "_id": migration_id,
+                    "completed_at": {"$exists": False},
+                    "$or": [{"owner": self.worker_id}, {"lease_until": {"$lt": now}}]
+                },
+                {"$set": {
+                    "status": "running",
+                    "owner": self.worker_id,
+                    "lease_until": now + timedelta(seconds=MIGRATION_LEASE_SECONDS)
+                }},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            marker = await self.db.migrations.find_one({"_id": migration_id}, {"completed_at": 1})
+            return False if marker and marker.get("completed_at") else None
+
+    async def _renew_migration_lease(self, migration_id):
+        while True:
+            await asyncio.sleep(MIGRATION_LEASE_SECONDS / 3)
+            await self.db.migrations.update_one(
+                {"_id": migration_id, "owner": self.worker_id},
+                {"$set": {"lease_until": datetime.now(timezone.utc) + timedelta(seconds=MIGRATION_LEASE_SECONDS)}}
+            )
+
+    async def run_migration(self, migration_id, migrate):
+        """Run ``migrate`` on exactly one worker; the others wait here until it has completed."""
+        while True:
+            claimed = await self.claim_migration(migration_id)
+            if claimed is False:
+                return
+            if claimed:
+                break
+            await asyncio.sleep(MIGRATION_POLL_SECONDS)
+
+        renewal = asyncio.create_task(self._renew_migration_lease(migration_id))
+        try:
+            await migrate()
+        finally:
+            renewal.cancel()
+        await self.db.migrations.update_one(
+            {"_id": migration_id},
+            {"$set": {"status": "completed", "completed_at": datetime.now(timezone.utc)},
+             "$unset": {"owner": "", "lease_until": ""}}
+        )
+
+    async def run_migrations(self):
+        await self.run_migration(TIMESTAMP_MIGRATION_ID, self.migrate_timestamps)
+        self.timestamps_migrated = True
+        for migration_id, backfill in (
+            (SEARCH_BACKFILL_ID, self.backfill_search_fields),
+            (VOCABULARY_BACKFILL_ID, self.backfill_vocabulary),
+            (ROLLUP_BACKFILL_ID, self.backfill_rollups),
+            (PROJECT_STATS_BACKFILL_ID, self.backfill_project_stats),
+        ):
+            await self.run_migration(migration_id, backfill)
+            # Every worker counts the same completed backfills, so they converge on the same epoch
+            self.data_epoch += 1
+
+    async def startup(self):
+        try:
+            await self.client.admin.command("ping")
+            print("✅ MongoDB connected successfully")
+        except Exception as e:
+            print("❌ MongoDB connection failed:", e)
+            return
+
+        try:
+            await self.ensure_indexes()
+            await self.report_index_health()
+        except Exception as e:
+            logger.error("Index bootstrap failed: %s", e)
+
+        self.migration_task = asyncio.create_task(self.run_migrations())
+
+    async def shutdown(self):
+        if self.migration_task and not self.migration_task.done():
+            self.migration_task.cancel()
+        self.client.close()
+
+
+# ==================== In-memory ====================
+
+def _copy(doc: Optional[dict]) -> Optional[dict]:
+    if doc is None:
+        return None
+    copied = dict(doc)
+    if "tags" in copied:
+        copied["tags"] = list(copied["tags"])
+    return copied
+
+
+def _entry_key(entry: dict) -> tuple:
+    return entry["created_at"], entry["id"]
+
+
+class MemoryUserRepository(UserRepository):
+    def __init__(self, storage: "MemoryStorage"):
+        self.storage = storage
+
+    async def get(self, user_id):
+        user = self.storage.user_docs.get(user_id)
+        if user is None:
+            return None
+        return {k: v for k, v in user.items() if k != "password_hash"}
+
+    async def get_by_email(self, email):
+        user_id = self.storage.user_ids_by_email.get(email)
+        return _copy(self.storage.user_docs.get(user_id)) if user_id else None
+
+    async def create(self, user):
+        if user["email"] in self.storage.user_ids_by_email:
+            raise ValueError(f"Duplicate email: {user['email']}")
+        self.storage.user_docs[user["id"]] = _copy(user)
+        self.storage.user_ids_by_email[user["email"]] = user["id"]
+
+    async def set_password_hash(self, user_id, password_hash):
+        if user_id in self.storage.user_docs:
+            self.storage.user_docs[user_id]["password_hash"] = password_hash
+
+    async def count(self):
+        return len(self.storage.user_docs)
+
+    async def get_data_version(self, user_id):
+        user = self.storage.user_docs.get(user_id)
+        return user.get("data_version", 0) if user else 0
+
+    async def bump_data_version(self, user_id):
+        user = self.storage.user_docs.get(user_id)
+        if user is not None:
+            user["data_version"] = user.get("data_version", 0) + 1
+
+
+class MemoryProjectRepository(ProjectRepository):
+    def __init__(self, storage: "MemoryStorage"):
+        self.storage = storage
+
+    async def create(self, project):
+        self.storage.project_docs[project["id"]] = _copy(project)
+
+    async def get(self, project_id, user_id):
+        project = self.storage.project_docs.get(project_id)
+        return _copy(project) if project and project["user_id"] == user_id else None
+
+    async def owned_ids(self, user_id, project_ids):
+        return {
+            project_id for project_id in project_ids
+            if project_id in self.storage.project_docs and self.storage.project_docs[project_id]["user_id"] == user_id
+        }
+
+    async def list_for_user(self, user_id):
+        return [_copy(p) for p in self.storage.project_docs.values() if p["user_id"] == user_id]
+
+    async def delete(self, project_id, user_id):
+        project = self.storage.project_docs.get(project_id)
+        if project is None or project["user_id"] != user_id:
+            return False
+        del self.storage.project_docs[project_id]
+        return True
+
+
+class MemoryTimeEntryRepository(TimeEntryRepository):
+    def __init__(self, storage: "MemoryStorage"):
+        self.storage = storage
+
+    def _user_entries(self, user_id) -> dict:
+        return self.storage.entry_docs_by_user.setdefault(user_id, {})
+
+    async def insert(self, entry):
+        if entry["id"] in self.storage.entry_docs:
+            raise ValueError(f"Duplicate entry id: {entry['id']}")
+        if entry.get("is_running") and any(e.get("is_running") for e in self._user_entries(entry["user_id"]).values()):
+            raise ValueError(f"User {entry['user_id']} already has a running timer")
+        stored = _searchable(_copy(entry))
+        self.storage.entry_docs[entry["id"]] = stored
+        self._user_entries(entry["user_id"])[entry["id"]] = stored
+
+    async def insert_many(self, entries):
+        failed = []
+        for index, entry in enumerate(entries):
+            try:
+                await self.insert(entry)
+            except ValueError as e:
+                failed.append((index, str(e)))
+        return failed
+
+    async def get(self, entry_id, user_id):
+        return _copy(self._user_entries(user_id).get(entry_id))
+
+    async def get_many(self, user_id, entry_ids):
+        entries = self._user_entries(user_id)
+        return [_copy(entries[entry_id]) for entry_id in entry_ids if entry_id in entries]
+
+    async def get_running(self, user_id):
+        for entry in self._user_entries(user_id).values():
+            if entry.get("is_running"):
+                return _copy(entry)
+        return None
+
+    async def start(self, entry):
+        # No awaits between the stop and the insert, so this is atomic on the event loop
+        previous = await self.stop_running(entry["user_id"], entry["start_time"])
+        await self.insert(entry)
+        return [previous] if previous else []
+
+    async def stop_running(self, user_id, end_time):
+        for entry in self._user_entries(user_id).values():
+            if entry.get("is_running"):
+                duration = int((end_time - as_datetime(entry["start_time"])).total_seconds())
+                entry.update(is_running=False, end_time=end_time, duration=duration)
+                return _copy(entry)
+        return None
+
+    async def update_fields(self, entry, fields):
+        entry = self.storage.entry_docs.get(entry["id"])
+        if entry is not None:
+            entry.update(_copy(fields))
+            entry.update(search_fields(entry))
+
+    async def count_for_project(self, user_id, project_id):
+        return sum(1 for e in self._user_entries(user_id).values() if e.get("project_id") == project_id)
+
+    async def reassign_project(self, user_id, project_id, new_project_id, limit):
+        moved = []
+        for entry in self._user_entries(user_id).values():
+            if len(moved) == limit:
+                break
+            if entry.get("project_id") == project_id:
+                moved.append(_copy(entry))
+                entry["project_id"] = new_project_id
+        return moved
+
+    async def update_many(self, user_id, entries, changes):
+        for entry_id, fields in changes.items():
+            entry = self._user_entries(user_id).get(entry_id)
+            if entry is not None:
+                entry.update(_copy(fields))
+                entry.update(search_fields(entry))
+
+    async def delete_many(self, user_id, entry_ids):
+        deleted = 0
+        for entry_id in entry_ids:
+            if await self.delete(entry_id, user_id):
+                deleted += 1
+        return deleted
+
+    async def delete(self, entry_id, user_id):
+        entry = self._user_entries(user_id).pop(entry_id, None)
+        if entry is not None:
+            del self.storage.entry_docs[entry_id]
+        return entry
+
+    @staticmethod
+    def _matches(entry, project_id=None, tag=None, start=None, end=None) -> bool:
+        if project_id and entry.get("project_id") != project_id:
+            return False
+        if tag and tag not in entry.get("tags", []):
+            return False
+        if start and entry["start_time"] < start:
+            return False
+        if end and entry["start_time"] > end:
+            return False
+        return True
+
+    async def list_page(self, user_id, limit, cursor=None, newer=False, project_id=None, tag=None, start=None, end=None):
+        entries = [e for e in self._user_entries(user_id).values() if self._matches(e, project_id, tag, start, end)]
+        if cursor:
+            key = tuple(cursor)
+            entries = [e for e in entries if (_entry_key(e) > key if newer else _entry_key(e) < key)]
+        entries.sort(key=_entry_key, reverse=not newer)
+        return [_copy(e) for e in entries[:limit]]
+
+    async def search(self, user_id, words, limit, offset=0, project_id=None, start=None, end=None):
+        prefixes = _search_prefixes(words)
+        scored = []
+        for entry in self._user_entries(user_id).values():
+            if not self._matches(entry, project_id, None, start, end):
+                continue
+            terms = entry.get("search_terms", ())
+            if all(prefix in terms for prefix in prefixes):
+                scored.append((_search_score(words, entry.get("search_words", ())), entry))
+        scored.sort(key=lambda pair: _entry_key(pair[1]), reverse=True)
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [_copy(entry) for _, entry in scored[offset:offset + limit]]
+
+    async def list_started_between(self, user_id, start, end):
+        return [_copy(e) for e in self._user_entries(user_id).values() if self._matches(e, start=start, end=end)]
+
+    async def iter_entries(self, user_id=None, start=None, end=None, project_id=None, newest_first=True, batch_size=1000):
+        source = self._user_entries(user_id).values() if user_id else self.storage.entry_docs.values()
+        entries = [e for e in source if self._matches(e, project_id, start=start, end=end)]
+        if newest_first:
+            entries.sort(key=_entry_key, reverse=True)
+        else:
+            entries.sort(key=lambda e: e["start_time"])
+        for i, entry in enumerate(entries):
+            yield _copy(entry)
+            if i % batch_size == batch_size - 1:
+                # Give other tasks a turn between batches, as a cursor round trip would
+                await asyncio.sleep(0)
+
+
+class MemorySummaryRepository(SummaryRepository):
+    def __init__(self, storage: "MemoryStorage"):
+        self.storage = storage
+
+    def _apply_project_increments(self, increments: dict):
+        for (user_id, project_id), (duration, count, last_used) in increments.items():
+            project = self.storage.project_docs.get(project_id)
+            if project is None or project["user_id"] != user_id:
+                continue
+            project["total_duration"] = project.get("total_duration", 0) + duration
+            project["entries_count"] = project.get("entries_count", 0) + count
+            if last_used and (project.get("last_used") is None or last_used > project["last_used"]):
+                project["last_used"] = last_used
+
+    async def apply_rollup(self, user_id, start_time, project_id, duration, count=1):
+        rollup = self.storage.rollups.setdefault(
+            (user_id, entry_day(start_time), project_id),
+            {"total_duration": 0, "entries_count": 0}
+        )
+        rollup["total_duration"] += duration
+        rollup["entries_count"] += count
+        if project_id:
+            last_used = as_datetime(start_time) if count > 0 else None
+            self._apply_project_increments({(user_id, project_id): (duration, count, last_used)})
+
+    async def apply_rollups(self, added, removed=()):
+        for (user_id, day, project_id), (duration, count) in _rollup_increments(added, removed).items():
+            rollup = self.storage.rollups.setdefault((user_id, day, project_id), {"total_duration": 0, "entries_count": 0})
+            rollup["total_duration"] += duration
+            rollup["entries_count"] += count
+        self._apply_project_increments(_project_increments(added, removed))
+
+    async def move_rollup(self, entry, project_id):
+        await self.apply_rollups([{**entry, "project_id": project_id}], [entry])
+
+    async def daily_totals(self, user_id, start_date, end_date):
+        totals = {}
+        for (rollup_user, day_key, _), rollup in self.storage.rollups.items():
+            if rollup_user != user_id or not start_date <= day_key <= end_date:
+                continue
+            day = totals.setdefault(day_key, {"date": day_key, "total_duration": 0, "entries_count": 0})
+            day["total_duration"] += rollup["total_duration"]
+            day["entries_count"] += rollup["entries_count"]
+        return totals
+
+    async def range_totals(self, user_id, start_date, end_date, granularity, tz):
+        totals = {}
+
+        def add(day, duration, count):
+            key = bucket_start(day, granularity).isoformat()
+            bucket = totals.setdefault(key, {"date": key, "total_duration": 0, "entries_count": 0})
+            bucket["total_duration"] += duration
+            bucket["entries_count"] += count
+
+        if tz in UTC_ZONES:
+            first, last = start_date.isoformat(), end_date.isoformat()
+            for (rollup_user, day_key, _), rollup in self.storage.rollups.items():
+                if rollup_user == user_id and first <= day_key <= last:
+                    add(date.fromisoformat(day_key), rollup["total_duration"], rollup["entries_count"])
+        else:
+            zone = ZoneInfo(tz)
+            start, end = local_day_bounds(start_date, end_date, tz)
+            for entry in self.storage.entry_docs_by_user.get(user_id, {}).values():
+                if entry.get("is_running") or not MemoryTimeEntryRepository._matches(entry, start=start, end=end):
+                    continue
+                add(as_datetime(entry["start_time"]).astimezone(zone).date(), entry.get("duration", 0), 1)
+        return {key: bucket for key, bucket in totals.items() if bucket["entries_count"]}
+
+    async def breakdown(self, user_id, start, end, by):
+        total_duration = entries_count = 0
+        groups = {}
+        for entry in self.storage.entry_docs_by_user.get(user_id, {}).values():
+            if entry.get("is_running") or not MemoryTimeEntryRepository._matches(entry, start=start, end=end):
+                continue
+            duration = entry.get("duration", 0)
+            total_duration += duration
+            entries_count += 1
+            keys = [entry.get("project_id")] if by == "project" else sorted(set(entry.get("tags") or [])) or [None]
+            for key in keys:
+                group = groups.setdefault(key, {"key": key, "total_duration": 0, "entries_count": 0})
+                group["total_duration"] += duration
+                group["entries_count"] += 1
+
+        for group in groups.values():
+            if by == "project":
+                project = self.storage.project_docs.get(group["key"]) or {}
+                if project.get("user_id") != user_id:
+                    project = {}
+                group.update(name=project.get("name"), color=project.get("color"))
+            else:
+                group.update(name=group["key"], color=None)
+        ordered = sorted(groups.values(), key=lambda g: (g["key"] is not None, g["key"] or ""))
+        ordered.sort(key=lambda g: g["total_duration"], reverse=True)
+        return {"total_duration": total_duration, "entries_count": entries_count, "groups": ordered}
+
+    async def rebuild_rollups(self, user_id=None, batch_size=1000):
+        for key in [k for k in self.storage.rollups if user_id is None or k[0] == user_id]:
+            del self.storage.rollups[key]
+        entries = [
+            entry for entry in self.storage.entry_docs.values()
+            if not entry.get("is_running") and (user_id is None or entry["user_id"] == user_id)
+        ]
+        for key, (duration, count) in _rollup_increments(entries).items():
+            rollup = self.storage.rollups.setdefault(key, {"total_duration": 0, "entries_count": 0})
+            rollup["total_duration"] += duration
+            rollup["entries_count"] += count
+        await self.rebuild_project_stats(user_id)
+        return len(self.storage.rollups)
+
+    async def rebuild_project_stats(self, user_id=None):
+        for project in self.storage.project_docs.values():
+            if user_id is None or project["user_id"] == user_id:
+                project.update(total_duration=0, entries_count=0, last_used=None)
+        self._apply_project_increments(_project_increments([
+            entry for entry in self.storage.entry_docs.values()
+            if not entry.get("is_running") and (user_id is None or entry["user_id"] == user_id)
+        ]))
+
+    async def admin_user_stats(self, skip, limit, sort_by, descending):
+        rows = []
+        for user in self.storage.user_docs.values():
+            entries = self.storage.entry_docs_by_user.get(user["id"], {}).values()
+            rows.append({
+                **{k: v for k, v in user.items() if k != "password_hash"},
+                "total_entries": len(entries),
+                "total_duration": sum(e.get("duration", 0) for e in entries if not e.get("is_running")),
+                "last_activity": max((e["created_at"] for e in entries), default=None)
+            })
+        # Missing values sort lowest, as they do in Mongo
+        rows.sort(key=lambda r: r["id"])
+        rows.sort(key=lambda r: (r[sort_by] is not None, r[sort_by]), reverse=descending)
+        return rows[skip:skip + limit], len(rows)
+
+    async def org_report(self, start, end):
+        total_entries = 0
+        total_duration = 0
+        buckets = {}
+        for entry in self.storage.entry_docs.values():
+            if not MemoryTimeEntryRepository._matches(entry, start=start, end=end):
+                continue
+            total_entries += 1
+            if entry.get("is_running"):
+                continue
+            total_duration += entry.get("duration", 0)
+            day = buckets.setdefault(entry_day(entry["start_time"]), {})
+            project = day.setdefault(entry.get("project_id"), {"total_duration": 0, "entries_count": 0})
+            project["total_duration"] += entry.get("duration", 0)
+            project["entries_count"] += 1
+
+        daily = []
+        for day_key in sorted(buckets):
+            projects = sorted(
+                ({"project_id": pid, **totals} for pid, totals in buckets[day_key].items()),
+                key=lambda p: p["total_duration"],
+                reverse=True
+            )
+            daily.append({
+                "date": day_key,
+                "total_duration": sum(p["total_duration"] for p in projects),
+                "entries_count": sum(p["entries_count"] for p in projects),
+                "projects": projects
+            })
+        return {"total_entries": total_entries, "total_duration": total_duration, "daily": daily}
+
+
+class MemoryVocabularyRepository(VocabularyRepository):
+    def __init__(self, storage: "MemoryStorage"):
+        self.storage = storage
+
+    async def apply(self, added, removed=()):
+        for (user_id, kind, key), (value, count, last_used) in _vocabulary_increments(added, removed).items():
+            terms = self.storage.vocabulary_terms.setdefault(user_id, {})
+            term = terms.get((kind, key))
+            if term is None:
+                if count <= 0:
+                    continue
+                term = terms[(kind, key)] = {"value": value, "count": 0, "last_used": last_used}
+            term["count"] += count
+            if last_used:
+                term["value"] = value
+                term["last_used"] = max(term["last_used"], last_used)
+            if term["count"] <= 0:
+                del terms[(kind, key)]
+
+    async def suggest(self, user_id, prefix, limit):
+        key = prefix.strip().casefold()
+        matches = {"tag": [], "task": []}
+        for (kind, term_key), term in self.storage.vocabulary_terms.get(user_id, {}).items():
+            if term_key.startswith(key):
+                matches[kind].append(dict(term))
+        for terms in matches.values():
+            terms.sort(key=lambda t: (t["count"], t["last_used"]), reverse=True)
+        return {"tags": matches["tag"][:limit], "tasks": matches["task"][:limit]}
+
+    async def rebuild(self, user_id=None, batch_size=1000):
+        if user_id:
+            self.storage.vocabulary_terms.pop(user_id, None)
+            entries = list(self.storage.entry_docs_by_user.get(user_id, {}).values())
+        else:
+            self.storage.vocabulary_terms.clear()
+            entries = list(self.storage.entry_docs.values())
+        await self.apply(entries)
+
+
+class MemoryJobRepository(JobRepository):
+    def __init__(self, storage: "MemoryStorage"):
+        self.storage = storage
+
+    async def create(self, job):
+        self.storage.job_docs[job["id"]] = _copy(job)
+
+    async def get(self, job_id, user_id):
+        job = self.storage.job_docs.get(job_id)
+        return _copy(job) if job and job["user_id"] == user_id else None
+
+    async def claim(self, job_id, owner, lease_seconds):
+        job = self.storage.job_docs.get(job_id)
+        now = datetime.now(timezone.utc)
+        if job is None or job["status"] not in ("pending", "running"):
+            return None
+        if job.get("owner") not in (None, owner) and job.get("lease_until") and job["lease_until"] >= now:
+            return None
+        job.update(status="running", owner=owner, lease_until=now + timedelta(seconds=lease_seconds))
+        return _copy(job)
+
+    async def update(self, job_id, fields, processed=0):
+        job = self.storage.job_docs[job_id]
+        job.update(_copy(fields), updated_at=datetime.now(timezone.utc))
+        job["processed"] = job.get("processed", 0) + processed
+        return _copy(job)
+
+    async def list_unfinished(self):
+        return [_copy(job) for job in self.storage.job_docs.values() if job["status"] in ("pending", "running")]
+
+    async def is_reassign_target(self, user_id, project_id):
+        return any(
+            job["user_id"] == user_id and job.get("reassign_to") == project_id and job["status"] in ("pending", "running")
+            for job in self.storage.job_docs.values()
+        )
+
+
+class MemoryStorage(Storage):
+    """Process-local storage for benchmarks and tests; nothing is persisted."""
+
+    def __init__(self):
+        self.user_docs = {}
+        self.user_ids_by_email = {}
+        self.project_docs = {}
+        self.entry_docs = {}
+        self.entry_docs_by_user = {}
+        self.rollups = {}
+        self.vocabulary_terms = {}
+        self.job_docs = {}
+        self.users = MemoryUserRepository(self)
+        self.projects = MemoryProjectRepository(self)
+        self.entries = MemoryTimeEntryRepository(self)
+        self.summaries = MemorySummaryRepository(self)
+        self.vocabulary = MemoryVocabularyRepository(self)
+        self.jobs = MemoryJobRepository(self)
+
+
+def create_storage() -> Storage:
+    backend = os.environ.get('STORAGE_BACKEND', 'mongo').lower()
+    if backend == 'mongo':
+        return MongoStorage.from_env()
+    if backend == 'memory':
+        return MemoryStorage()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Bulk import throughput benchmark.
+
+Generates a synthetic history in the chosen upload format, posts it to
+POST /api/entries/bulk on the in-process app and reports rows/sec. A few
+invalid rows are mixed in to exercise per-row error reporting, and the
+daily rollups are checked against the number of rows written.
+
+Usage: python benchmarks/bulk_import.py [--storage memory|mongo] [--rows N]
+                                        [--format json|csv|ndjson] [--json]
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+TASK_NAMES = ["Code review", "Standup", "Bug triage", "Feature work", "Planning", "Docs", "Support", "Research"]
+TAGS = ["frontend", "backend", "meeting", "urgent", "client", "internal", "ops"]
+CONTENT_TYPES = {"json": "application/json", "csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def generate_rows(count, invalid_every, seed):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        start = now - timedelta(days=365) * rng.random()
+        end = start + timedelta(seconds=rng.randint(300, 4 * 3600))
+        if invalid_every and i % invalid_every == invalid_every - 1:
+            # End before start: rejected by validation, reported per row
+            start, end = end, start
+        rows.append({
+            "task_name": rng.choice(TASK_NAMES),
+            "description": "",
+            "tags": rng.sample(TAGS, rng.randint(0, 3)),
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+        })
+    return rows
+
+
+def encode(rows, fmt):
+    if fmt == "json":
+        return json.dumps(rows).encode()
+    if fmt == "ndjson":
+        return "".join(json.dumps(row) + "\n" for row in rows).encode()
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["task_name", "description", "tags", "start_time", "end_time"])
+    for row in rows:
+        writer.writerow([row["task_name"], row["description"], ", ".join(row["tags"]), row["start_time"], row["end_time"]])
+    return output.getvalue().encode()
+
+
+async def run(server, args, body):
+    import httpx
+
+    await server.app.router.startup()
+    try:
+        migration = getattr(server.storage, "migration_task", None)
+        if migration:
+            await migration
+
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+            response = await http.post("/api/auth/register", json={
+                "email": f"import-{time.time_ns()}@bench.example.com",
+                "password": "BenchPass123!",
+                "name": "Import Benchmark"
+            })
+            response.raise_for_status()
+            user_id = response.json()["user"]["id"]
+            headers = {
+                "Authorization": f"Bearer {response.json()['access_token']}",
+                "Content-Type": CONTENT_TYPES[args.format]
+            }
+
+            started = time.perf_counter()
+            response = await http.post("/api/entries/bulk", content=body, headers=headers)
+            elapsed = time.perf_counter() - started
+            response.raise_for_status()
+            result = response.json()
+
+        totals = await server.storage.summaries.daily_totals(user_id, "0000-01-01", "9999-12-31")
+        return {
+            "storage": args.storage,
+            "format": args.format,
+            "rows": args.rows,
+            "upload_bytes": len(body),
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(args.rows / elapsed, 1),
+            "inserted": result["inserted"],
+            "failed": result["failed"],
+            "first_error": result["errors"][0] if result["errors"] else None,
+            "rolled_up": sum(day["entries_count"] for day in totals.values()),
+        }
+    finally:
+        if args.storage == "mongo" and not args.keep_data:
+            await server.storage.client.drop_database(server.storage.db.name)
+        await server.app.router.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--storage", choices=["memory", "mongo"], default="memory")
+    parser.add_argument("--mongo-url", default=os.environ.get("BENCH_MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default=f"timekeeper_import_bench_{int(time.time())}")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--format", choices=sorted(CONTENT_TYPES), default="ndjson")
+    parser.add_argument("--invalid-every", type=int, default=1000, help="make every Nth row invalid (0 for none)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="emit the report as JSON")
+    parser.add_argument("--keep-data", action="store_true")
+    args = parser.parse_args()
+
+    os.environ["STORAGE_BACKEND"] = args.storage
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = args.db_name
+    os.environ.setdefault("MONGO_TLS", "false")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    import server
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    body = encode(generate_rows(args.rows, args.invalid_every, args.seed), args.format)
+    report = asyncio.run(run(server, args, body))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"📥 Imported {report['rows']} {report['format']} rows ({report['upload_bytes'] / 1e6:.1f} MB) "
+              f"into {report['storage']} in {report['elapsed_seconds']}s: {report['rows_per_second']} rows/s")
+        print(f"   inserted {report['inserted']}  failed {report['failed']}  rolled up {report['rolled_up']}")
+        if report["first_error"]:
+            print(f"   first error: row {report['first_error']['row']}: {report['first_error']['error']}")
+    return 0 if report["rolled_up"] == report["inserted"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
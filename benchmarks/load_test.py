@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""In-process load test and latency benchmark for the backend API.
+
+Runs the FastAPI app in this process (no HTTP server) against the in-memory
+storage backend or a local MongoDB, seeds a configurable data volume, then drives concurrent virtual users through
+realistic scenarios and writes a machine-readable report with per-endpoint
+p50/p95/p99 latency, requests/sec and (for MongoDB) command counts.
+
+Usage: python benchmarks/load_test.py [--storage memory|mongo] [--users N] [--entries-per-user N]
+                                      [--duration SECONDS] [--concurrency N] [--output report.json]
+
+With --storage mongo, the database named by --db-name (a fresh timestamped
+one by default) is dropped after the run unless --keep-data is given.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from pymongo import monitoring
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+TASK_NAMES = ["Code review", "Standup", "Bug triage", "Feature work", "Planning", "Docs", "Support", "Research"]
+TAGS = ["frontend", "backend", "meeting", "urgent", "client", "internal", "ops"]
+PROJECT_COLORS = ["#4F46E5", "#059669", "#D97706", "#DC2626", "#7C3AED"]
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts MongoDB commands by name and collection."""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        label = f"{event.command_name} {collection}" if isinstance(collection, str) else event.command_name
+        self.counts[label] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def reset(self):
+        self.counts.clear()
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LoadTest:
+    def __init__(self, server, args):
+        self.server = server
+        self.args = args
+        self.storage = server.storage
+        self.rng = random.Random(args.seed)
+        self.users = []
+        self.admin_token = None
+        self.latencies = defaultdict(list)
+        self.errors = Counter()
+
+    # ---------- seeding ----------
+
+    async def seed(self):
+        password_hash = self.server.pwd_context.hash("BenchPass123!")
+        now = datetime.now(timezone.utc)
+
+        admin_id = str(uuid.uuid4())
+        user_docs = [{
+            "id": admin_id,
+            "email": f"admin-{admin_id}@bench.example.com",
+            "name": "Bench Admin",
+            "password_hash": password_hash,
+            "role": "admin",
+            "created_at": now
+        }]
+        self.admin_token = self.server.create_access_token({"sub": admin_id})
+
+        for i in range(self.args.users):
+            user_id = str(uuid.uuid4())
+            user_docs.append({
+                "id": user_id,
+                "email": f"user{i}-{user_id}@bench.example.com",
+                "name": f"Bench User {i}",
+                "password_hash": password_hash,
+                "role": "user",
+                "created_at": now
+            })
+            project_ids = [str(uuid.uuid4()) for _ in range(self.args.projects_per_user)]
+            self.users.append({
+                "id": user_id,
+                "token": self.server.create_access_token({"sub": user_id}),
+                "project_ids": project_ids
+            })
+
+        for user_doc in user_docs:
+            await self.storage.users.create(user_doc)
+        for user in self.users:
+            for n, project_id in enumerate(user["project_ids"]):
+                await self.storage.projects.create({
+                    "id": project_id,
+                    "user_id": user["id"],
+                    "name": f"Project {n}",
+                    "color": PROJECT_COLORS[n % len(PROJECT_COLORS)],
+                    "created_at": now
+                })
+
+        history = timedelta(days=self.args.history_days)
+        for user in self.users:
+            entries = []
+            for _ in range(self.args.entries_per_user):
+                start = now - history * self.rng.random()
+                duration = self.rng.randint(300, 4 * 3600)
+                entries.append({
+                    "id": str(uuid.uuid4()),
+                    "user_id": user["id"],
+                    "task_name": self.rng.choice(TASK_NAMES),
+                    "description": "",
+                    "project_id": self.rng.choice(user["project_ids"] + [None]),
+                    "tags": self.rng.sample(TAGS, self.rng.randint(0, 3)),
+                    "start_time": start,
+                    "end_time": start + timedelta(seconds=duration),
+                    "duration": duration,
+                    "is_running": False,
+                    "created_at": start
+                })
+            await self.storage.entries.insert_many(entries)
+
+        await self.storage.summaries.rebuild_rollups()
+        await self.storage.vocabulary.rebuild()
+
+    # ---------- scenarios ----------
+
+    async def request(self, http, label, method, url, token, **kwargs):
+        started = time.perf_counter()
+        # Non-streaming requests read the whole body, so exports are timed to their last byte
+        response = await http.request(method, url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+        self.latencies[label].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+    async def timer_churn(self, http, user):
+        # The timer widget asks for suggestions while the task name is typed
+        await self.request(http, "GET /suggest", "GET", "/api/suggest", user["token"], params={"prefix": "co"})
+        body = {
+            "task_name": self.rng.choice(TASK_NAMES),
+            "project_id": self.rng.choice(user["project_ids"] + [None]),
+            "tags": self.rng.sample(TAGS, 1)
+        }
+        await self.request(http, "POST /timer/start", "POST", "/api/timer/start", user["token"], json=body)
+        await self.request(http, "GET /timer/current", "GET", "/api/timer/current", user["token"])
+        await self.request(http, "POST /timer/stop", "POST", "/api/timer/stop", user["token"])
+
+    async def dashboard(self, http, user):
+        await self.request(http, "GET /dashboard", "GET", "/api/dashboard?limit=10", user["token"])
+
+    async def reports(self, http, user):
+        await asyncio.gather(
+            self.request(http, "GET /entries/summary/daily", "GET", "/api/entries/summary/daily", user["token"]),
+            self.request(http, "GET /entries/summary/weekly", "GET", "/api/entries/summary/weekly", user["token"]),
+            self.request(http, "GET /entries/summary/monthly", "GET", "/api/entries/summary/monthly", user["token"]),
+            self.request(http, "GET /entries/summary", "GET", "/api/entries/summary", user["token"],
+                         params={"granularity": "week", "tz": "America/New_York"}),
+            self.request(http, "GET /entries/breakdown", "GET", "/api/entries/breakdown", user["token"],
+                         params={"by": self.rng.choice(["project", "tag"])})
+        )
+
+    async def entries_scroll(self, http, user):
+        cursor = None
+        for _ in range(3):
+            params = {"limit": 50, **({"after": cursor} if cursor else {})}
+            response = await self.request(http, "GET /entries", "GET", "/api/entries", user["token"], params=params)
+            cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+            if not cursor:
+                break
+
+    async def search(self, http, user):
+        # A partly typed word, as the search box sends while the user types
+        query = self.rng.choice(TASK_NAMES + TAGS).split()[0].lower()[:self.rng.randint(2, 5)]
+        await self.request(http, "GET /entries/search", "GET", "/api/entries/search", user["token"], params={"q": query})
+
+    async def export(self, http, user):
+        await self.request(http, "GET /export/csv", "GET", "/api/export/csv", user["token"])
+
+    async def admin(self, http, user):
+        await asyncio.gather(
+            self.request(http, "GET /admin/users", "GET", "/api/admin/users", self.admin_token),
+            self.request(http, "GET /admin/reports", "GET", "/api/admin/reports", self.admin_token)
+        )
+
+    def scenarios(self):
+        return [
+            (self.timer_churn, 30),
+            (self.dashboard, 30),
+            (self.reports, 15),
+            (self.entries_scroll, 15),
+            (self.search, 10),
+            (self.export, 5),
+            (self.admin, 5),
+        ]
+
+    async def virtual_user(self, http, index, deadline):
+        scenarios, weights = zip(*self.scenarios())
+        # Each virtual user acts as one seeded account so timer start/stop pairs don't interleave
+        user = self.users[index % len(self.users)]
+        while time.perf_counter() < deadline:
+            scenario = self.rng.choices(scenarios, weights)[0]
+            await scenario(http, user)
+            if self.args.think_time:
+                await asyncio.sleep(self.rng.random() * self.args.think_time)
+
+    # ---------- run ----------
+
+    async def run(self, counter):
+        import httpx
+
+        await self.server.app.router.startup()
+        try:
+            # Let the startup hook's background migration settle before seeding
+            migration = getattr(self.storage, "migration_task", None)
+            if migration:
+                await migration
+            seed_started = time.perf_counter()
+            await self.seed()
+            seed_seconds = time.perf_counter() - seed_started
+
+            counter.reset()
+            transport = httpx.ASGITransport(app=self.server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+                started = time.perf_counter()
+                deadline = started + self.args.duration
+                await asyncio.gather(*(self.virtual_user(http, i, deadline) for i in range(self.args.concurrency)))
+                elapsed = time.perf_counter() - started
+
+            return self.report(elapsed, seed_seconds, counter)
+        finally:
+            if self.args.storage == "mongo" and not self.args.keep_data:
+                await self.storage.client.drop_database(self.storage.db.name)
+            await self.server.app.router.shutdown()
+
+    def report(self, elapsed, seed_seconds, counter):
+        endpoints = {}
+        for label, samples in sorted(self.latencies.items()):
+            endpoints[label] = {
+                "count": len(samples),
+                "errors": self.errors[label],
+                "requests_per_second": round(len(samples) / elapsed, 2),
+                "p50_ms": round(percentile(samples, 50) * 1000, 3),
+                "p95_ms": round(percentile(samples, 95) * 1000, 3),
+                "p99_ms": round(percentile(samples, 99) * 1000, 3),
+            }
+        total = sum(len(samples) for samples in self.latencies.values())
+        return {
+            "config": {
+                "users": self.args.users,
+                "entries_per_user": self.args.entries_per_user,
+                "projects_per_user": self.args.projects_per_user,
+                "history_days": self.args.history_days,
+                "concurrency": self.args.concurrency,
+                "duration_seconds": self.args.duration,
+                "seed": self.args.seed,
+            },
+            "seed_seconds": round(seed_seconds, 2),
+            "elapsed_seconds": round(elapsed, 2),
+            "total_requests": total,
+            "requests_per_second": round(total / elapsed, 2),
+            "endpoints": endpoints,
+            "storage": self.args.storage,
+            "mongo_commands": dict(counter.counts.most_common()),
+            "mongo_commands_per_request": round(sum(counter.counts.values()) / total, 2) if total else 0.0,
+        }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--storage", choices=["memory", "mongo"], default="memory")
+    parser.add_argument("--mongo-url", default=os.environ.get("BENCH_MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default=f"timekeeper_bench_{int(time.time())}")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--entries-per-user", type=int, default=2000)
+    parser.add_argument("--projects-per-user", type=int, default=5)
+    parser.add_argument("--history-days", type=int, default=365)
+    parser.add_argument("--concurrency", type=int, default=20, help="number of virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to drive load")
+    parser.add_argument("--think-time", type=float, default=0.0, help="max random pause between scenarios")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--keep-data", action="store_true")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Configure storage before the app is imported and creates it
+    os.environ["STORAGE_BACKEND"] = args.storage
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = args.db_name
+    os.environ.setdefault("MONGO_TLS", "false")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+    counter = CommandCounter()
+    monitoring.register(counter)
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    import server
+
+    report = asyncio.run(LoadTest(server, args).run(counter))
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n")
+        print(f"✅ Report written to {args.output}")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
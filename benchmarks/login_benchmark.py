@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Login throughput benchmark.
+
+Drives concurrent logins against a running backend and, at the same time,
+probes a cheap authenticated route to measure how much password hashing
+stalls unrelated requests.
+
+Usage: python benchmarks/login_benchmark.py [--base-url URL] [--logins-concurrency N]
+                                            [--duration SECONDS] [--json]
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples, elapsed):
+    return {
+        "count": len(samples),
+        "per_second": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2) if samples else 0.0,
+    }
+
+
+class LoginBenchmark:
+    def __init__(self, base_url, concurrency, duration):
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.duration = duration
+        timestamp = datetime.now().strftime('%H%M%S%f')
+        self.credentials = {"email": f"loginbench{timestamp}@timekeeper.com", "password": "BenchPass123!"}
+        self.token = None
+
+    def setup(self):
+        response = requests.post(
+            f"{self.base_url}/api/auth/register",
+            json={**self.credentials, "name": "Login Benchmark"}
+        )
+        response.raise_for_status()
+        self.token = response.json()["access_token"]
+
+    def probe(self, stop, samples):
+        session = requests.Session()
+        headers = {"Authorization": f"Bearer {self.token}"}
+        while not stop.is_set():
+            started = time.perf_counter()
+            session.get(f"{self.base_url}/api/auth/me", headers=headers).raise_for_status()
+            samples.append(time.perf_counter() - started)
+
+    def login_worker(self, stop, samples, errors):
+        session = requests.Session()
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = session.post(f"{self.base_url}/api/auth/login", json=self.credentials)
+            if response.status_code == 200:
+                samples.append(time.perf_counter() - started)
+            else:
+                errors.append(response.status_code)
+
+    def run_phase(self, with_logins):
+        stop = threading.Event()
+        probe_samples, login_samples, errors = [], [], []
+        workers = self.concurrency if with_logins else 0
+        with ThreadPoolExecutor(max_workers=workers + 1) as pool:
+            started = time.perf_counter()
+            pool.submit(self.probe, stop, probe_samples)
+            for _ in range(workers):
+                pool.submit(self.login_worker, stop, login_samples, errors)
+            time.sleep(self.duration)
+            stop.set()
+        elapsed = time.perf_counter() - started
+
+        result = {"probe": summarize(probe_samples, elapsed)}
+        if with_logins:
+            result["login"] = summarize(login_samples, elapsed)
+            result["login_errors"] = len(errors)
+        return result
+
+    def run(self):
+        self.setup()
+        return {
+            "base_url": self.base_url,
+            "login_concurrency": self.concurrency,
+            "duration_seconds": self.duration,
+            "baseline": self.run_phase(with_logins=False),
+            "under_login_load": self.run_phase(with_logins=True),
+        }
+
+
+def print_report(report):
+    print(f"🔐 Login benchmark against {report['base_url']}")
+    print(f"   {report['login_concurrency']} concurrent logins for {report['duration_seconds']}s per phase\n")
+    login = report["under_login_load"]["login"]
+    print(f"Logins: {login['per_second']}/s  p50 {login['p50_ms']}ms  p95 {login['p95_ms']}ms  "
+          f"p99 {login['p99_ms']}ms  errors {report['under_login_load']['login_errors']}")
+    for phase in ("baseline", "under_login_load"):
+        probe = report[phase]["probe"]
+        print(f"GET /auth/me ({phase}): p50 {probe['p50_ms']}ms  p95 {probe['p95_ms']}ms  "
+              f"p99 {probe['p99_ms']}ms  max {probe['max_ms']}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--logins-concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--json", action="store_true", help="emit the report as JSON")
+    args = parser.parse_args()
+
+    report = LoginBenchmark(args.base_url, args.logins_concurrency, args.duration).run()
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
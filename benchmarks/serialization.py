@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for entry list serialization.
+
+Compares, per 1,000 entries, the cost of turning stored entry documents
+into a GET /api/entries response body:
+
+  before: merged dict + TimeEntry(...) per row, then FastAPI's response_model
+          validation and serialization and a stdlib JSONResponse
+  after:  entry_row() per row rendered by EntryJSONResponse (orjson)
+
+Both paths are run on documents with native datetimes and on documents
+still holding ISO strings (not yet migrated), and their JSON output is
+checked for equality.
+
+Usage: python benchmarks/serialization.py [--entries N] [--repeat N] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+
+def make_docs(count, as_strings):
+    now = datetime.now(timezone.utc)
+    docs = []
+    for i in range(count):
+        start = now - timedelta(minutes=30 * i, microseconds=i)
+        end = start + timedelta(minutes=25)
+        doc = {
+            "id": str(uuid.uuid4()),
+            "user_id": "bench-user",
+            "task_name": f"Task {i}",
+            "description": "Reviewing pull requests and answering questions",
+            "project_id": None if i % 3 else str(uuid.uuid4()),
+            "tags": ["backend", "review"][: i % 3],
+            "start_time": start,
+            "end_time": end,
+            "duration": 1500,
+            "is_running": False,
+            "created_at": start,
+        }
+        if as_strings:
+            for field in ("start_time", "end_time", "created_at"):
+                doc[field] = doc[field].isoformat()
+        docs.append(doc)
+    return docs
+
+
+def route_field(server, path, method="GET"):
+    for route in server.app.routes:
+        if getattr(route, "path", None) == path and method in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+
+async def before(server, field, docs):
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    as_datetime = server.as_datetime
+    page = server.TimeEntryPage(
+        entries=[
+            server.TimeEntry(
+                **{
+                    **e,
+                    "start_time": as_datetime(e["start_time"]),
+                    "end_time": as_datetime(e.get("end_time")),
+                    "created_at": as_datetime(e["created_at"])
+                }
+            )
+            for e in docs
+        ],
+        next_cursor=None,
+        prev_cursor=None
+    )
+    content = await serialize_response(field=field, response_content=page)
+    return JSONResponse(content).body
+
+
+async def after(server, field, docs):
+    return server.EntryJSONResponse({
+        "entries": [server.entry_row(e) for e in docs],
+        "next_cursor": None,
+        "prev_cursor": None
+    }).body
+
+
+async def measure(fn, server, field, docs, repeat):
+    # Best of N, reported per 1,000 entries
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn(server, field, docs)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000 / len(docs) * 1000
+
+
+async def run(server, args):
+    field = route_field(server, "/api/entries")
+    results = {}
+    for label, as_strings in (("native_datetimes", False), ("iso_strings", True)):
+        docs = make_docs(args.entries, as_strings)
+        old_body = await before(server, field, docs)
+        new_body = await after(server, field, docs)
+        if json.loads(old_body) != json.loads(new_body):
+            raise SystemExit(f"❌ Output differs between paths for {label}")
+
+        before_ms = await measure(before, server, field, docs, args.repeat)
+        after_ms = await measure(after, server, field, docs, args.repeat)
+        results[label] = {
+            "before_ms_per_1000": round(before_ms, 3),
+            "after_ms_per_1000": round(after_ms, 3),
+            "speedup": round(before_ms / after_ms, 2),
+            "body_bytes": len(new_body),
+        }
+    return {"entries": args.entries, "repeat": args.repeat, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="emit the report as JSON")
+    args = parser.parse_args()
+
+    # Nothing touches storage; the memory backend avoids needing a database
+    os.environ["STORAGE_BACKEND"] = "memory"
+    sys.path.insert(0, str(BACKEND_DIR))
+    import server
+
+    report = asyncio.run(run(server, args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"🧮 Entry list serialization, {report['entries']} entries, best of {report['repeat']}")
+        for label, stats in report["results"].items():
+            print(f"{label}: before {stats['before_ms_per_1000']}ms  after {stats['after_ms_per_1000']}ms "
+                  f"per 1,000 entries ({stats['speedup']}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Timer start/stop concurrency check.
+
+Runs the FastAPI app in this process and, for each of a few users, fires
+bursts of parallel /timer/start and /timer/stop requests (as several browser
+tabs or client retries would). Afterwards it verifies that every user has at
+most one running timer and that the daily rollups account for every stopped
+entry exactly once. Against MongoDB it also reports the database commands
+issued per timer request.
+
+Usage: python benchmarks/timer_concurrency.py [--storage memory|mongo] [--users N]
+                                              [--parallel N] [--rounds N] [--json]
+
+Exits non-zero if an invariant is violated. With --storage mongo the
+database named by --db-name is dropped afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from pymongo import monitoring
+
+from load_test import CommandCounter, percentile
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+
+class TimerConcurrency:
+    def __init__(self, server, args):
+        self.server = server
+        self.args = args
+        self.storage = server.storage
+        self.rng = random.Random(args.seed)
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    async def register(self, http, i):
+        response = await http.post("/api/auth/register", json={
+            "email": f"timer{i}-{time.time_ns()}@bench.example.com",
+            "password": "BenchPass123!",
+            "name": f"Timer User {i}"
+        })
+        response.raise_for_status()
+        body = response.json()
+        return body["user"]["id"], {"Authorization": f"Bearer {body['access_token']}"}
+
+    async def call(self, http, label, path, headers, **kwargs):
+        started = time.perf_counter()
+        response = await http.post(path, headers=headers, **kwargs)
+        self.latencies[label].append(time.perf_counter() - started)
+        self.statuses[label][response.status_code] += 1
+
+    async def hammer(self, http, headers):
+        for round_number in range(self.args.rounds):
+            calls = []
+            for n in range(self.args.parallel):
+                if self.rng.random() < 0.6:
+                    body = {"task_name": f"Burst {round_number}.{n}", "tags": []}
+                    calls.append(self.call(http, "POST /timer/start", "/api/timer/start", headers, json=body))
+                else:
+                    calls.append(self.call(http, "POST /timer/stop", "/api/timer/stop", headers))
+            await asyncio.gather(*calls)
+
+    async def commands_per_request(self, http, headers, counter):
+        # Sequential calls so each command count belongs to exactly one request
+        counts = {}
+        for label, path, kwargs in (
+            ("POST /timer/start (idle)", "/api/timer/start", {"json": {"task_name": "Probe", "tags": []}}),
+            ("POST /timer/start (running)", "/api/timer/start", {"json": {"task_name": "Probe", "tags": []}}),
+            ("POST /timer/stop", "/api/timer/stop", {}),
+        ):
+            counter.reset()
+            await http.post(path, headers=headers, **kwargs)
+            # The auth lookup is served from the user cache after the first request
+            counts[label] = dict(counter.counts)
+        return counts
+
+    async def count_entries(self, user_id):
+        running = stopped = 0
+        async for entry in self.storage.entries.iter_entries(user_id=user_id):
+            if entry.get("is_running"):
+                running += 1
+            else:
+                stopped += 1
+        return running, stopped
+
+    async def check_invariants(self, http, user_id, headers):
+        running, _ = await self.count_entries(user_id)
+        # Settle on a stopped timer so every entry should be in the rollups
+        await http.post("/api/timer/stop", headers=headers)
+        _, stopped = await self.count_entries(user_id)
+        totals = await self.storage.summaries.daily_totals(user_id, "0000-01-01", "9999-12-31")
+        rolled_up = sum(day["entries_count"] for day in totals.values())
+        return {"running": running, "stopped": stopped, "rolled_up": rolled_up}
+
+    async def run(self, counter):
+        import httpx
+
+        await self.server.app.router.startup()
+        try:
+            migration = getattr(self.storage, "migration_task", None)
+            if migration:
+                await migration
+
+            transport = httpx.ASGITransport(app=self.server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+                users = await asyncio.gather(*(self.register(http, i) for i in range(self.args.users)))
+
+                started = time.perf_counter()
+                await asyncio.gather(*(self.hammer(http, headers) for _, headers in users))
+                elapsed = time.perf_counter() - started
+
+                checks = {user_id: await self.check_invariants(http, user_id, headers) for user_id, headers in users}
+
+                commands = None
+                if self.args.storage == "mongo":
+                    commands = await self.commands_per_request(http, users[0][1], counter)
+
+            return self.report(elapsed, checks, commands)
+        finally:
+            if self.args.storage == "mongo" and not self.args.keep_data:
+                await self.storage.client.drop_database(self.storage.db.name)
+            await self.server.app.router.shutdown()
+
+    def report(self, elapsed, checks, commands):
+        violations = [
+            {"user_id": user_id, **check}
+            for user_id, check in checks.items()
+            if check["running"] > 1 or check["rolled_up"] != check["stopped"]
+        ]
+        return {
+            "config": {
+                "storage": self.args.storage,
+                "users": self.args.users,
+                "parallel": self.args.parallel,
+                "rounds": self.args.rounds,
+            },
+            "elapsed_seconds": round(elapsed, 2),
+            "endpoints": {
+                label: {
+                    "count": len(samples),
+                    "statuses": dict(self.statuses[label]),
+                    "p50_ms": round(percentile(samples, 50) * 1000, 3),
+                    "p99_ms": round(percentile(samples, 99) * 1000, 3),
+                }
+                for label, samples in sorted(self.latencies.items())
+            },
+            "mongo_commands_per_request": commands,
+            "violations": violations,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--storage", choices=["memory", "mongo"], default="memory")
+    parser.add_argument("--mongo-url", default=os.environ.get("BENCH_MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default=f"timekeeper_timer_bench_{int(time.time())}")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--parallel", type=int, default=8, help="concurrent timer requests per user per round")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="emit the report as JSON")
+    parser.add_argument("--keep-data", action="store_true")
+    args = parser.parse_args()
+
+    os.environ["STORAGE_BACKEND"] = args.storage
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = args.db_name
+    os.environ.setdefault("MONGO_TLS", "false")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+    counter = CommandCounter()
+    monitoring.register(counter)
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    import server
+
+    # One log line per request would drown the report
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    report = asyncio.run(TimerConcurrency(server, args).run(counter))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"⏱️  Timer concurrency on {args.storage}: {args.users} users x {args.parallel} parallel x {args.rounds} rounds")
+        for label, stats in report["endpoints"].items():
+            print(f"{label}: {stats['count']} requests  p50 {stats['p50_ms']}ms  p99 {stats['p99_ms']}ms  "
+                  f"statuses {stats['statuses']}")
+        for label, counts in (report["mongo_commands_per_request"] or {}).items():
+            print(f"{label}: {sum(counts.values())} commands {counts}")
+        if report["violations"]:
+            print(f"❌ {len(report['violations'])} users violate the timer invariants: {report['violations']}")
+        else:
+            print("✅ At most one running timer per user and rollups match stopped entries")
+    return 1 if report["violations"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
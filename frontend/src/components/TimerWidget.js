@@ -1,12 +1,35 @@
-import { useState } from 'react';
+import { useState, useEffect } from 'react';
+import axios from 'axios';
+import { useAuth } from '@/contexts/AuthContext';
 import { useTimer } from '@/contexts/TimerContext';
 import { Play, Square } from 'lucide-react';
 import { toast } from 'sonner';
 
+const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
+
 export default function TimerWidget({ onTimerUpdate }) {
   const { currentEntry, elapsed, startTimer, stopTimer, formatTime, isRunning } = useTimer();
   const [taskName, setTaskName] = useState('');
   const [description, setDescription] = useState('');
+  const [suggestions, setSuggestions] = useState([]);
+  const { getAuthHeaders } = useAuth();
+
+  useEffect(() => {
+    if (isRunning) return;
+    // Task names used before, most used first, once typing pauses
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.get(`${API}/suggest`, {
+          headers: getAuthHeaders(),
+          params: { prefix: taskName.trim(), limit: 8 }
+        });
+        setSuggestions(response.data.tasks);
+      } catch (error) {
+        setSuggestions([]);
+      }
+    }, 150);
+    return () => clearTimeout(timer);
+  }, [taskName, isRunning]);
 
   const handleStart = async (e) => {
     e.preventDefault();
@@ -80,9 +103,16 @@ export default function TimerWidget({ onTimerUpdate }) {
               value={taskName}
               onChange={(e) => setTaskName(e.target.value)}
               placeholder="What are you working on?"
+              list="task-name-suggestions"
+              autoComplete="off"
               data-testid="task-name-input"
               className="w-full h-12 px-4 rounded-lg bg-slate-800 border border-slate-700 text-white placeholder-slate-500 focus:bg-slate-750 focus:ring-2 focus:ring-indigo-500/50 focus:border-indigo-500 outline-none transition-all"
             />
+            <datalist id="task-name-suggestions">
+              {suggestions.map((suggestion) => (
+                <option key={suggestion.value} value={suggestion.value} />
+              ))}
+            </datalist>
           </div>
           
           <div>
@@ -6,6 +6,7 @@ import { toast } from 'sonner';
 const TimerContext = createContext();
 
 const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
+const STREAM_RECONNECT_MS = 3000;
 
 export const useTimer = () => {
   const context = useContext(TimerContext);
@@ -21,10 +22,61 @@ export const TimerProvider = ({ children }) => {
   const [elapsed, setElapsed] = useState(0);
   const intervalRef = useRef(null);
 
+  // Timer state is pushed over the per-user event stream, so other tabs and devices stay in sync without polling.
+  // The stream opens with a timer.state snapshot. Its URL carries a one-minute token minted just for the stream,
+  // never the session token, so every (re)connect fetches a fresh one rather than letting EventSource retry.
   useEffect(() => {
-    if (token) {
-      fetchCurrentTimer();
+    if (!token) {
+      setCurrentEntry(null);
+      return;
     }
+
+    let source = null;
+    let retry = null;
+    let closed = false;
+    const reconnect = () => {
+      if (!closed) retry = setTimeout(connect, STREAM_RECONNECT_MS);
+    };
+
+    const connect = async () => {
+      try {
+        const response = await axios.post(`${API}/events/token`, null, { headers: getAuthHeaders() });
+        if (closed) return;
+        source = new EventSource(`${API}/events?token=${encodeURIComponent(response.data.token)}`);
+      } catch (error) {
+        console.error('Failed to open event stream:', error);
+        reconnect();
+        return;
+      }
+      const on = (type, handler) => source.addEventListener(type, (event) => handler(JSON.parse(event.data)));
+
+      on('timer.state', ({ entry }) => setCurrentEntry(entry));
+      on('timer.started', ({ entry }) => setCurrentEntry(entry));
+      on('timer.stopped', ({ entry }) => {
+        setCurrentEntry(prev => (prev && prev.id === entry.id ? null : prev));
+      });
+      on('entry.updated', ({ entry }) => {
+        setCurrentEntry(prev => (prev && prev.id === entry.id ? entry : prev));
+      });
+      on('entry.deleted', ({ id }) => {
+        setCurrentEntry(prev => (prev && prev.id === id ? null : prev));
+      });
+      // Sent when this connection fell too far behind and events were dropped
+      on('resync', () => fetchCurrentTimer());
+
+      source.onerror = () => {
+        // EventSource's own retry would reuse the expired token
+        source.close();
+        reconnect();
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      if (source) source.close();
+    };
   }, [token]);
 
   useEffect(() => {
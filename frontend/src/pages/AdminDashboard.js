@@ -6,25 +6,34 @@ import { toast } from 'sonner';
 import { Users, Clock, TrendingUp, Activity } from 'lucide-react';
 
 const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
+const PAGE_SIZE = 50;
 
 export default function AdminDashboard() {
   const { getAuthHeaders } = useAuth();
   const [users, setUsers] = useState([]);
+  const [totalUsers, setTotalUsers] = useState(0);
+  const [page, setPage] = useState(0);
+  const [sortBy, setSortBy] = useState('total_duration');
   const [reports, setReports] = useState(null);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
     fetchAdminData();
-  }, []);
+  }, [page, sortBy]);
 
   const fetchAdminData = async () => {
     try {
+      const order = sortBy === 'name' ? 'asc' : 'desc';
       const [usersRes, reportsRes] = await Promise.all([
-        axios.get(`${API}/admin/users`, { headers: getAuthHeaders() }),
-        axios.get(`${API}/admin/reports`, { headers: getAuthHeaders() })
+        axios.get(`${API}/admin/users`, {
+          headers: getAuthHeaders(),
+          params: { skip: page * PAGE_SIZE, limit: PAGE_SIZE, sort_by: sortBy, order }
+        }),
+        reports ? Promise.resolve({ data: reports }) : axios.get(`${API}/admin/reports`, { headers: getAuthHeaders() })
       ]);
       
-      setUsers(usersRes.data);
+      setUsers(usersRes.data.users);
+      setTotalUsers(usersRes.data.total);
       setReports(reportsRes.data);
     } catch (error) {
       console.error('Failed to fetch admin data:', error);
@@ -107,8 +116,18 @@ export default function AdminDashboard() {
 
             {/* Users Table */}
             <div className="bg-white rounded-xl border border-slate-200 shadow-sm overflow-hidden">
-              <div className="p-6 border-b border-slate-200">
+              <div className="p-6 border-b border-slate-200 flex items-center justify-between">
                 <h2 className="text-xl font-semibold text-slate-900">All Users</h2>
+                <select
+                  value={sortBy}
+                  onChange={(e) => { setPage(0); setSortBy(e.target.value); }}
+                  data-testid="admin-users-sort"
+                  className="px-3 py-2 border border-slate-200 rounded-lg text-sm text-slate-700"
+                >
+                  <option value="total_duration">Sort by total time</option>
+                  <option value="last_activity">Sort by last activity</option>
+                  <option value="name">Sort by name</option>
+                </select>
               </div>
               
               <div className="overflow-x-auto">
@@ -147,6 +166,32 @@ export default function AdminDashboard() {
                   </tbody>
                 </table>
               </div>
+
+              {totalUsers > PAGE_SIZE && (
+                <div className="px-6 py-4 border-t border-slate-200 flex items-center justify-between text-sm text-slate-600">
+                  <span>
+                    {page * PAGE_SIZE + 1}–{Math.min((page + 1) * PAGE_SIZE, totalUsers)} of {totalUsers}
+                  </span>
+                  <div className="flex gap-2">
+                    <button
+                      onClick={() => setPage(page - 1)}
+                      disabled={page === 0}
+                      data-testid="admin-users-prev"
+                      className="px-3 py-1 border border-slate-200 rounded-lg disabled:opacity-50"
+                    >
+                      Previous
+                    </button>
+                    <button
+                      onClick={() => setPage(page + 1)}
+                      disabled={(page + 1) * PAGE_SIZE >= totalUsers}
+                      data-testid="admin-users-next"
+                      className="px-3 py-1 border border-slate-200 rounded-lg disabled:opacity-50"
+                    >
+                      Next
+                    </button>
+                  </div>
+                </div>
+              )}
             </div>
           </div>
         )}
@@ -24,15 +24,12 @@ export default function Dashboard() {
 
   const fetchDashboardData = async () => {
     try {
-      const [entriesRes, projectsRes, summaryRes] = await Promise.all([
-        axios.get(`${API}/entries?limit=10`, { headers: getAuthHeaders() }),
-        axios.get(`${API}/projects`, { headers: getAuthHeaders() }),
-        axios.get(`${API}/entries/summary/daily`, { headers: getAuthHeaders() })
-      ]);
-      
-      setEntries(entriesRes.data);
-      setProjects(projectsRes.data);
-      setDailySummary(summaryRes.data);
+      // One request; the backend runs the underlying queries concurrently
+      const response = await axios.get(`${API}/dashboard?limit=10`, { headers: getAuthHeaders() });
+
+      setEntries(response.data.entries);
+      setProjects(response.data.projects);
+      setDailySummary(response.data.summary);
     } catch (error) {
       console.error('Failed to fetch dashboard data:', error);
     } finally {
@@ -13,11 +13,12 @@ export default function EODReport() {
   const [eodData, setEodData] = useState([]);
   const [projects, setProjects] = useState([]);
   const [loading, setLoading] = useState(true);
-  const [editingId, setEditingId] = useState(null);
-  const [editForm, setEditForm] = useState({});
+  // Pending edits keyed by entry id; several rows can be edited and saved together
+  const [edits, setEdits] = useState({});
   const [showPreview, setShowPreview] = useState(false);
 
   useEffect(() => {
+    setEdits({});
     fetchEODData();
     fetchProjects();
   }, [selectedDate]);
@@ -47,47 +48,62 @@ export default function EODReport() {
   };
 
   const startEdit = (entry) => {
-    setEditingId(entry.id);
-    setEditForm({
-      task_name: entry.task_name,
-      description: entry.description,
-      project_id: entry.project_id || '',
-      start_time: new Date(entry.start_time).toISOString().slice(0, 16),
-      end_time: entry.end_time ? new Date(entry.end_time).toISOString().slice(0, 16) : ''
-    });
+    setEdits(prev => ({
+      ...prev,
+      [entry.id]: {
+        task_name: entry.task_name,
+        description: entry.description,
+        project_id: entry.project_id || ''
+      }
+    }));
   };
 
-  const cancelEdit = () => {
-    setEditingId(null);
-    setEditForm({});
+  const updateEdit = (entryId, field, value) => {
+    setEdits(prev => ({ ...prev, [entryId]: { ...prev[entryId], [field]: value } }));
   };
 
-  const saveEdit = async (entryId) => {
-    try {
-      // Calculate new duration based on edited times
-      const start = new Date(editForm.start_time);
-      const end = new Date(editForm.end_time);
-      const duration = Math.floor((end - start) / 1000);
+  const cancelEdit = (entryId) => {
+    setEdits(prev => {
+      const { [entryId]: _, ...rest } = prev;
+      return rest;
+    });
+  };
 
-      await axios.put(
-        `${API}/entries/${entryId}`,
+  const saveEdits = async (entryIds) => {
+    try {
+      // One request for every edited row
+      const response = await axios.patch(
+        `${API}/entries`,
         {
-          task_name: editForm.task_name,
-          description: editForm.description,
-          project_id: editForm.project_id || null
+          entries: entryIds.map(id => ({
+            id,
+            task_name: edits[id].task_name,
+            description: edits[id].description,
+            project_id: edits[id].project_id || null
+          }))
         },
         { headers: getAuthHeaders() }
       );
 
-      toast.success('Entry updated successfully!');
-      setEditingId(null);
-      setEditForm({});
+      const missing = response.data.results.filter(r => r.status === 'not_found').length;
+      if (missing) {
+        toast.error(`${missing} ${missing === 1 ? 'entry was' : 'entries were'} no longer found`);
+      } else {
+        toast.success(entryIds.length === 1 ? 'Entry updated successfully!' : `${entryIds.length} entries updated!`);
+      }
+      setEdits(prev => {
+        const rest = { ...prev };
+        entryIds.forEach(id => delete rest[id]);
+        return rest;
+      });
       fetchEODData();
     } catch (error) {
-      toast.error('Failed to update entry');
+      toast.error('Failed to update entries');
     }
   };
 
+  const pendingEditIds = Object.keys(edits);
+
   const getProjectName = (projectId) => {
     const project = projects.find(p => p.id === projectId);
     return project?.name || 'No Project';
@@ -150,6 +166,16 @@ export default function EODReport() {
           </div>
           
           <div className="flex items-center gap-3">
+            {pendingEditIds.length > 1 && !showPreview && (
+              <button
+                onClick={() => saveEdits(pendingEditIds)}
+                data-testid="save-all-edits"
+                className="flex items-center gap-2 h-11 px-6 bg-green-600 text-white rounded-full font-medium hover:bg-green-700 transition-all duration-200"
+              >
+                <Save className="w-4 h-4" />
+                Save All ({pendingEditIds.length})
+              </button>
+            )}
             <button
               onClick={() => setShowPreview(!showPreview)}
               data-testid="toggle-preview"
@@ -264,12 +290,12 @@ export default function EODReport() {
                         <td className="px-4 py-4 text-sm text-slate-700">{selectedDate}</td>
                         <td className="px-4 py-4 text-sm text-slate-700">{user?.name}</td>
                         
-                        {editingId === entry.id ? (
+                        {edits[entry.id] ? (
                           <>
                             <td className="px-4 py-4">
                               <select
-                                value={editForm.project_id}
-                                onChange={(e) => setEditForm({ ...editForm, project_id: e.target.value })}
+                                value={edits[entry.id].project_id}
+                                onChange={(e) => updateEdit(entry.id, 'project_id', e.target.value)}
                                 className="w-full h-9 px-3 rounded-lg border border-slate-200 bg-white text-sm focus:ring-2 focus:ring-indigo-500/20 focus:border-indigo-500 outline-none"
                               >
                                 <option value="">No Project</option>
@@ -281,16 +307,16 @@ export default function EODReport() {
                             <td className="px-4 py-4">
                               <input
                                 type="text"
-                                value={editForm.task_name}
-                                onChange={(e) => setEditForm({ ...editForm, task_name: e.target.value })}
+                                value={edits[entry.id].task_name}
+                                onChange={(e) => updateEdit(entry.id, 'task_name', e.target.value)}
                                 className="w-full h-9 px-3 rounded-lg border border-slate-200 bg-white text-sm focus:ring-2 focus:ring-indigo-500/20 focus:border-indigo-500 outline-none"
                               />
                             </td>
                             <td className="px-4 py-4">
                               <input
                                 type="text"
-                                value={editForm.description}
-                                onChange={(e) => setEditForm({ ...editForm, description: e.target.value })}
+                                value={edits[entry.id].description}
+                                onChange={(e) => updateEdit(entry.id, 'description', e.target.value)}
                                 className="w-full h-9 px-3 rounded-lg border border-slate-200 bg-white text-sm focus:ring-2 focus:ring-indigo-500/20 focus:border-indigo-500 outline-none"
                               />
                             </td>
@@ -300,14 +326,14 @@ export default function EODReport() {
                             <td className="px-4 py-4">
                               <div className="flex gap-2">
                                 <button
-                                  onClick={() => saveEdit(entry.id)}
+                                  onClick={() => saveEdits([entry.id])}
                                   data-testid={`save-edit-${entry.id}`}
                                   className="p-2 text-green-600 hover:bg-green-50 rounded-lg transition-colors"
                                 >
                                   <Save className="w-4 h-4" />
                                 </button>
                                 <button
-                                  onClick={cancelEdit}
+                                  onClick={() => cancelEdit(entry.id)}
                                   className="p-2 text-red-600 hover:bg-red-50 rounded-lg transition-colors"
                                 >
                                   <X className="w-4 h-4" />
@@ -3,27 +3,41 @@ import { useAuth } from '@/contexts/AuthContext';
 import axios from 'axios';
 import Layout from '@/components/Layout';
 import { toast } from 'sonner';
-import { Trash2, Edit2, Clock } from 'lucide-react';
+import { Trash2, Edit2, Clock, Search } from 'lucide-react';
 
 const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
+const PAGE_SIZE = 50;
 
 export default function Entries() {
   const { getAuthHeaders } = useAuth();
   const [entries, setEntries] = useState([]);
   const [projects, setProjects] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [query, setQuery] = useState('');
+  const [nextOffset, setNextOffset] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
-    fetchData();
-  }, []);
+    const q = query.trim();
+    if (!q) {
+      fetchData();
+      return;
+    }
+    // Search once typing pauses rather than on every keystroke
+    const timer = setTimeout(() => searchEntries(q), 250);
+    return () => clearTimeout(timer);
+  }, [query]);
 
   const fetchData = async () => {
     try {
       const [entriesRes, projectsRes] = await Promise.all([
-        axios.get(`${API}/entries?limit=500`, { headers: getAuthHeaders() }),
+        axios.get(`${API}/entries?limit=${PAGE_SIZE}`, { headers: getAuthHeaders() }),
         axios.get(`${API}/projects`, { headers: getAuthHeaders() })
       ]);
-      setEntries(entriesRes.data);
+      setEntries(entriesRes.data.entries);
+      setNextCursor(entriesRes.data.next_cursor);
+      setNextOffset(null);
       setProjects(projectsRes.data);
     } catch (error) {
       console.error('Failed to fetch entries:', error);
@@ -33,13 +47,52 @@ export default function Entries() {
     }
   };
 
+  const searchEntries = async (q, offset = 0) => {
+    try {
+      const response = await axios.get(`${API}/entries/search`, {
+        headers: getAuthHeaders(),
+        params: { q, limit: PAGE_SIZE, offset }
+      });
+      setEntries((prev) => (offset ? [...prev, ...response.data.entries] : response.data.entries));
+      setNextOffset(response.data.next_offset);
+      setNextCursor(null);
+    } catch (error) {
+      toast.error('Search failed');
+    }
+  };
+
+  const loadMore = async () => {
+    setLoadingMore(true);
+    if (query.trim()) {
+      await searchEntries(query.trim(), nextOffset);
+      setLoadingMore(false);
+      return;
+    }
+    try {
+      const response = await axios.get(`${API}/entries`, {
+        headers: getAuthHeaders(),
+        params: { limit: PAGE_SIZE, after: nextCursor }
+      });
+      setEntries((prev) => [...prev, ...response.data.entries]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      toast.error('Failed to load more entries');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const deleteEntry = async (entryId) => {
     if (!window.confirm('Are you sure you want to delete this entry?')) return;
     
     try {
       await axios.delete(`${API}/entries/${entryId}`, { headers: getAuthHeaders() });
       toast.success('Entry deleted');
-      fetchData();
+      if (query.trim()) {
+        searchEntries(query.trim());
+      } else {
+        fetchData();
+      }
     } catch (error) {
       toast.error('Failed to delete entry');
     }
@@ -79,6 +132,17 @@ export default function Entries() {
             <h1 className="text-4xl font-bold text-slate-900 tracking-tight">Time Entries</h1>
             <p className="text-slate-600 mt-2">View and manage all your tracked time</p>
           </div>
+          <div className="relative w-72">
+            <Search className="w-4 h-4 text-slate-400 absolute left-3 top-1/2 -translate-y-1/2" />
+            <input
+              type="search"
+              value={query}
+              onChange={(e) => setQuery(e.target.value)}
+              placeholder="Search tasks, descriptions, tags"
+              data-testid="entries-search-input"
+              className="w-full pl-9 pr-3 py-2 border border-slate-300 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-indigo-500"
+            />
+          </div>
         </div>
 
         {loading ? (
@@ -88,8 +152,14 @@ export default function Entries() {
         ) : entries.length === 0 ? (
           <div className="text-center py-16 bg-slate-50 rounded-xl border border-slate-200">
             <Clock className="w-16 h-16 text-slate-300 mx-auto mb-4" />
-            <h3 className="text-lg font-semibold text-slate-900 mb-2">No time entries yet</h3>
-            <p className="text-slate-600">Start tracking your time from the dashboard!</p>
+            {query.trim() ? (
+              <h3 className="text-lg font-semibold text-slate-900 mb-2">No entries match "{query.trim()}"</h3>
+            ) : (
+              <>
+                <h3 className="text-lg font-semibold text-slate-900 mb-2">No time entries yet</h3>
+                <p className="text-slate-600">Start tracking your time from the dashboard!</p>
+              </>
+            )}
           </div>
         ) : (
           <div className="bg-white rounded-xl border border-slate-200 shadow-sm overflow-hidden">
@@ -159,6 +229,19 @@ export default function Entries() {
                 </tbody>
               </table>
             </div>
+
+            {(nextCursor || nextOffset) && (
+              <div className="px-6 py-4 border-t border-slate-200 text-center">
+                <button
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  data-testid="load-more-entries"
+                  className="px-4 py-2 text-sm font-medium text-indigo-600 hover:bg-indigo-50 rounded-lg transition-colors disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </div>
@@ -7,6 +7,9 @@ import { Plus, Trash2, Folder } from 'lucide-react';
 
 const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
 
+// How often a project delete's background job is checked while its entries are moved
+const JOB_POLL_MS = 1000;
+
 const PRESET_COLORS = [
   '#4F46E5', '#7C3AED', '#DB2777', '#DC2626', '#EA580C',
   '#D97706', '#CA8A04', '#65A30D', '#16A34A', '#059669',
@@ -50,13 +53,35 @@ export default function Projects() {
     }
   };
 
+  const formatDuration = (seconds) => {
+    const hours = Math.floor(seconds / 3600);
+    const minutes = Math.floor((seconds % 3600) / 60);
+    return `${hours}h ${minutes}m`;
+  };
+
+  const waitForJob = async (job) => {
+    // The project is removed at once; its entries are moved off it in the background
+    const toastId = toast.loading(`Clearing project from entries (0/${job.total})`);
+    while (job.status === 'pending' || job.status === 'running') {
+      await new Promise((resolve) => setTimeout(resolve, JOB_POLL_MS));
+      const response = await axios.get(`${API}/jobs/${job.id}`, { headers: getAuthHeaders() });
+      job = response.data;
+      toast.loading(`Clearing project from entries (${job.processed}/${job.total})`, { id: toastId });
+    }
+    if (job.status === 'failed') {
+      toast.error('Project deleted, but some entries could not be updated', { id: toastId });
+    } else {
+      toast.success('Project deleted', { id: toastId });
+    }
+  };
+
   const deleteProject = async (projectId) => {
     if (!window.confirm('Are you sure you want to delete this project?')) return;
     
     try {
-      await axios.delete(`${API}/projects/${projectId}`, { headers: getAuthHeaders() });
-      toast.success('Project deleted');
-      fetchProjects();
+      const response = await axios.delete(`${API}/projects/${projectId}`, { headers: getAuthHeaders() });
+      setProjects((current) => current.filter((project) => project.id !== projectId));
+      await waitForJob(response.data.job);
     } catch (error) {
       toast.error('Failed to delete project');
     }
@@ -167,7 +192,14 @@ export default function Projects() {
                     </div>
                     <div>
                       <h3 className="font-semibold text-slate-900">{project.name}</h3>
-                      <p className="text-sm text-slate-500">Active</p>
+                      <p className="text-sm text-slate-500">
+                        {formatDuration(project.total_duration)} · {project.entries_count} {project.entries_count === 1 ? 'entry' : 'entries'}
+                      </p>
+                      {project.last_used && (
+                        <p className="text-xs text-slate-400">
+                          Last used {new Date(project.last_used).toLocaleDateString()}
+                        </p>
+                      )}
                     </div>
                   </div>
                   
@@ -7,6 +7,9 @@ import { Download, TrendingUp, Clock, Calendar } from 'lucide-react';
 
 const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
 
+const toISODate = (date) =>
+  `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}-${String(date.getDate()).padStart(2, '0')}`;
+
 export default function Reports() {
   const { getAuthHeaders } = useAuth();
   const [view, setView] = useState('weekly'); // daily, weekly, monthly
@@ -21,15 +24,28 @@ export default function Reports() {
 
   const fetchSummaries = async () => {
     try {
+      // Week and month are bucketed by the browser's local days
+      const tz = Intl.DateTimeFormat().resolvedOptions().timeZone;
+      const now = new Date();
+      const monday = new Date(now.getFullYear(), now.getMonth(), now.getDate() - ((now.getDay() + 6) % 7));
+      const sunday = new Date(monday.getFullYear(), monday.getMonth(), monday.getDate() + 6);
+      const monthStart = new Date(now.getFullYear(), now.getMonth(), 1);
+
       const [daily, weekly, monthly] = await Promise.all([
         axios.get(`${API}/entries/summary/daily`, { headers: getAuthHeaders() }),
-        axios.get(`${API}/entries/summary/weekly`, { headers: getAuthHeaders() }),
-        axios.get(`${API}/entries/summary/monthly`, { headers: getAuthHeaders() })
+        axios.get(`${API}/entries/summary`, {
+          headers: getAuthHeaders(),
+          params: { from: toISODate(monday), to: toISODate(sunday), granularity: 'day', tz }
+        }),
+        axios.get(`${API}/entries/summary`, {
+          headers: getAuthHeaders(),
+          params: { from: toISODate(monthStart), to: toISODate(now), granularity: 'day', tz }
+        })
       ]);
       
       setDailySummary(daily.data);
-      setWeeklySummary(weekly.data);
-      setMonthlySummary(monthly.data);
+      setWeeklySummary({ summaries: weekly.data.buckets });
+      setMonthlySummary({ summaries: monthly.data.buckets.filter((day) => day.entries_count > 0) });
     } catch (error) {
       console.error('Failed to fetch summaries:', error);
       toast.error('Failed to load reports');
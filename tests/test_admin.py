@@ -0,0 +1,88 @@
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def admin(client):
+    # The admin address gets the admin role on registration; later tests log in instead
+    credentials = {"email": "admin@timekeeper.com", "password": "AdminPass123!"}
+    response = await client.post("/api/auth/register", json={**credentials, "name": "Admin"})
+    if response.status_code != 200:
+        response = await client.post("/api/auth/login", json=credentials)
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def named_user(client):
+    async def register(name):
+        response = await client.post("/api/auth/register", json={
+            "email": f"user-{uuid.uuid4().hex}@test.example.com", "password": "TestPass123!", "name": name
+        })
+        body = response.json()
+        return body["user"]["id"], {"Authorization": f"Bearer {body['access_token']}"}
+    return register
+
+
+async def all_users(client, headers, page_size, **params):
+    users, skip = [], 0
+    while True:
+        page = (await client.get("/api/admin/users", params={**params, "skip": skip, "limit": page_size}, headers=headers)).json()
+        users += page["users"]
+        skip += page_size
+        if skip >= page["total"]:
+            return users, page["total"]
+
+
+async def test_admin_users_sort_and_page(client, admin, named_user, import_entries, entry_row):
+    ours = {}
+    for name, hours in (("Carol", 3), ("Alice", 1), ("Bob", 2)):
+        user_id, headers = await named_user(name)
+        await import_entries(headers, [entry_row("Work", 1, hours=hours)])
+        ours[user_id] = name
+
+    first = (await client.get("/api/admin/users", params={"limit": 2}, headers=admin)).json()
+    assert len(first["users"]) == 2 and (first["skip"], first["limit"]) == (0, 2)
+
+    # Pages put together list every user exactly once
+    users, total = await all_users(client, admin, 2, sort_by="total_duration", order="desc")
+    assert len(users) == total == len({u["user"]["id"] for u in users})
+    stats = [(u["user"]["name"], u["total_duration"], u["total_entries"]) for u in users if u["user"]["id"] in ours]
+    assert stats == [("Carol", 3 * 3600, 1), ("Bob", 2 * 3600, 1), ("Alice", 3600, 1)]
+
+    users, _ = await all_users(client, admin, 50, sort_by="name", order="asc")
+    assert [u["user"]["name"] for u in users if u["user"]["id"] in ours] == ["Alice", "Bob", "Carol"]
+
+
+async def test_admin_users_needs_the_admin_role(client, user):
+    _, headers = user
+    assert (await client.get("/api/admin/users", headers=headers)).status_code == 403
+
+
+async def test_admin_report_totals_and_days(client, admin, make_user, import_entries, create_project):
+    def row(day, hours, **fields):
+        return {"task_name": "Work", "start_time": f"2025-06-{day:02d}T09:00:00Z", "end_time": f"2025-06-{day:02d}T{9 + hours:02d}:00:00Z", **fields}
+
+    _, first = await make_user()
+    _, second = await make_user()
+    project = await create_project(first, "Client")
+    await import_entries(first, [row(10, 2, project_id=project), row(10, 1), row(12, 1)])
+    await import_entries(second, [row(10, 3, project_id=None), row(11, 1)])
+
+    response = await client.get("/api/admin/reports", params={"from": "2025-06-10", "to": "2025-06-11"}, headers=admin)
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["total_entries"], report["total_duration"]) == (4, 7 * 3600)
+    assert report["average_duration_per_entry"] == 7 * 3600 / 4
+    # Per day, then per project, largest first
+    assert [(d["date"], d["entries_count"], d["total_duration"]) for d in report["daily"]] == [
+        ("2025-06-10", 3, 6 * 3600), ("2025-06-11", 1, 3600)
+    ]
+    assert [(p["project_id"], p["total_duration"]) for p in report["daily"][0]["projects"]] == [(None, 4 * 3600), (project, 2 * 3600)]
+
+
+async def test_admin_reports_need_the_admin_role(client, user):
+    _, headers = user
+    assert (await client.get("/api/admin/reports", headers=headers)).status_code == 403
@@ -0,0 +1,21 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_password_rehash_drops_the_cached_user(client, monkeypatch):
+    email = "rehash@test.example.com"
+    body = (await client.post("/api/auth/register", json={"email": email, "password": "TestPass123!", "name": "Rehash"})).json()
+    user_id = body["user"]["id"]
+    await client.get("/api/projects", headers={"Authorization": f"Bearer {body['access_token']}"})
+    assert server.user_cache.get(user_id) is not None
+
+    async def needs_rehash(password, password_hash):
+        return True, password_hash
+
+    monkeypatch.setattr(server, "verify_password", needs_rehash)
+    response = await client.post("/api/auth/login", json={"email": email, "password": "TestPass123!"})
+    assert response.status_code == 200
+    assert server.user_cache.get(user_id) is None
@@ -0,0 +1,52 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def entry_ids(client, headers):
+    return {e["task_name"]: e["id"] for e in (await client.get("/api/entries", headers=headers)).json()["entries"]}
+
+
+async def test_batch_update_reports_each_item(client, user, import_entries, entry_row):
+    _, headers = user
+    await import_entries(headers, [entry_row("First", 1), entry_row("Second", 2)])
+    ids = await entry_ids(client, headers)
+
+    response = await client.patch("/api/entries", json={"entries": [
+        {"id": ids["First"], "tags": ["billable"]},
+        {"id": "missing", "task_name": "Nope"},
+        {"id": ids["Second"], "description": "notes"},
+    ]}, headers=headers)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(r["id"], r["status"]) for r in results] == [
+        (ids["First"], "updated"), ("missing", "not_found"), (ids["Second"], "updated")
+    ]
+    assert results[0]["entry"]["tags"] == ["billable"]
+    assert (await client.get(f"/api/entries/{ids['Second']}", headers=headers)).json()["description"] == "notes"
+
+
+async def test_batch_update_rejects_repeats_and_oversized_batches(client, user):
+    _, headers = user
+    response = await client.patch("/api/entries", json={"entries": [{"id": "a"}, {"id": "a"}]}, headers=headers)
+    assert response.status_code == 400
+    response = await client.patch("/api/entries", json={"entries": [{"id": str(i)} for i in range(server.BATCH_MAX_ENTRIES + 1)]}, headers=headers)
+    assert response.status_code == 422
+    assert (await client.patch("/api/entries", json={"entries": []}, headers=headers)).status_code == 422
+
+
+async def test_batch_delete_is_scoped_to_the_user(client, make_user, import_entries, entry_row):
+    _, owner = await make_user()
+    _, other = await make_user()
+    await import_entries(owner, [entry_row("Mine", 1), entry_row("Also mine", 2)])
+    ids = await entry_ids(client, owner)
+
+    response = await client.post("/api/entries/delete", json={"ids": [ids["Mine"]]}, headers=other)
+    assert response.json()["results"] == [{"id": ids["Mine"], "status": "not_found", "entry": None}]
+
+    # Repeated ids are answered once
+    response = await client.post("/api/entries/delete", json={"ids": [ids["Mine"], ids["Mine"], "missing"]}, headers=owner)
+    assert [(r["id"], r["status"]) for r in response.json()["results"]] == [(ids["Mine"], "deleted"), ("missing", "not_found")]
+    assert list(await entry_ids(client, owner)) == ["Also mine"]
@@ -0,0 +1,54 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def breakdown(client, headers, **params):
+    response = await client.get("/api/entries/breakdown", params=params, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_breakdown_by_project(client, user, import_entries, entry_row, create_project):
+    _, headers = user
+    alpha = await create_project(headers, "Alpha")
+    beta = await create_project(headers, "Beta")
+    await import_entries(headers, [
+        entry_row("A1", 1, hours=3, project_id=alpha),
+        entry_row("A2", 2, hours=1, project_id=alpha),
+        entry_row("B1", 3, hours=3, project_id=beta),
+        entry_row("Loose", 4, hours=1),
+    ])
+    # A running timer is not counted yet
+    await client.post("/api/timer/start", json={"task_name": "Live", "project_id": beta, "tags": []}, headers=headers)
+
+    body = await breakdown(client, headers, by="project")
+    assert (body["total_duration"], body["entries_count"]) == (8 * 3600, 4)
+    assert [(g["key"], g["name"], g["total_duration"], g["entries_count"], g["share"]) for g in body["groups"]] == [
+        (alpha, "Alpha", 4 * 3600, 2, 0.5),
+        (beta, "Beta", 3 * 3600, 1, 0.375),
+        (None, None, 3600, 1, 0.125),
+    ]
+
+
+async def test_breakdown_by_tag_counts_each_tag(client, user, import_entries, entry_row):
+    _, headers = user
+    await import_entries(headers, [
+        entry_row("Both", 1, hours=2, tags=["ops", "billable"]),
+        entry_row("Ops", 2, hours=1, tags=["ops"]),
+        entry_row("Untagged", 3, hours=1),
+    ])
+
+    body = await breakdown(client, headers, by="tag")
+    assert body["total_duration"] == 4 * 3600
+    groups = {g["key"]: (g["total_duration"], g["entries_count"]) for g in body["groups"]}
+    assert groups == {"ops": (3 * 3600, 2), "billable": (2 * 3600, 1), None: (3600, 1)}
+    # Tag shares can add up to more than 1
+    assert sum(g["share"] for g in body["groups"]) == 1.5
+
+
+async def test_breakdown_range_is_inclusive(client, user, import_entries, entry_row):
+    _, headers = user
+    await import_entries(headers, [entry_row(f"Day {day}", day) for day in (1, 2, 3)])
+    body = await breakdown(client, headers, **{"from": "2026-03-02", "to": "2026-03-03"})
+    assert (body["entries_count"], body["total_duration"]) == (2, 2 * 3600)
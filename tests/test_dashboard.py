@@ -0,0 +1,23 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_dashboard_matches_the_separate_endpoints(client, user, import_entries, entry_row, create_project):
+    _, headers = user
+    project = await create_project(headers, "Client")
+    await import_entries(headers, [entry_row(f"Task {day}", day, project_id=project) for day in range(1, 5)])
+    await client.post("/api/timer/start", json={"task_name": "Live", "project_id": project, "tags": []}, headers=headers)
+
+    async def get(path, **params):
+        response = await client.get(path, params=params, headers=headers)
+        assert response.status_code == 200
+        return response.json()
+
+    dashboard = await get("/api/dashboard", limit=3)
+    assert dashboard["entries"] == (await get("/api/entries", limit=3))["entries"]
+    assert [p["id"] for p in dashboard["projects"]] == [p["id"] for p in await get("/api/projects")]
+    assert dashboard["current_timer"] == await get("/api/timer/current")
+    assert dashboard["summary"] == await get("/api/entries/summary/daily")
+    # Today's running timer is listed but not yet counted
+    assert (dashboard["summary"]["entries_count"], dashboard["summary"]["total_duration"]) == (1, 0)
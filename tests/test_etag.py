@@ -0,0 +1,70 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_unchanged_data_is_not_modified(client, user):
+    _, headers = user
+    first = await client.get("/api/entries", headers=headers)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+
+    again = await client.get("/api/entries", headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.content == b""
+
+    # Weak comparison, and any tag in the list
+    assert (await client.get("/api/entries", headers={**headers, "If-None-Match": f'"other", W/{etag}'})).status_code == 304
+    # The ETag belongs to the URL it was issued for
+    assert (await client.get("/api/projects", headers={**headers, "If-None-Match": etag})).status_code == 200
+
+
+async def test_writes_retire_etags(client, user):
+    _, headers = user
+    etag = (await client.get("/api/entries/summary/weekly", headers=headers)).headers["etag"]
+
+    await client.post("/api/timer/start", json={"task_name": "Work", "tags": []}, headers=headers)
+    await client.post("/api/timer/stop", headers=headers)
+
+    response = await client.get("/api/entries/summary/weekly", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+async def test_etag_is_not_bumped_before_derived_writes(client, user, monkeypatch):
+    # A read between the version bump and the rollup write would cache a stale body under the new ETag
+    user_id, headers = user
+    seen = []
+    apply_rollup = server.storage.summaries.apply_rollup
+
+    async def record_version(*args, **kwargs):
+        seen.append(await server.storage.users.get_data_version(user_id))
+        await apply_rollup(*args, **kwargs)
+
+    await client.post("/api/timer/start", json={"task_name": "Work", "tags": []}, headers=headers)
+    before = await server.storage.users.get_data_version(user_id)
+    monkeypatch.setattr(server.storage.summaries, "apply_rollup", record_version)
+    await client.post("/api/timer/stop", headers=headers)
+
+    assert seen == [before]
+    assert await server.storage.users.get_data_version(user_id) != before
+
+
+async def test_etags_are_per_user(client, make_user):
+    _, first = await make_user()
+    _, second = await make_user()
+    etag = (await client.get("/api/entries", headers=first)).headers["etag"]
+    assert (await client.get("/api/entries", headers={**second, "If-None-Match": etag})).status_code == 200
+
+
+async def test_backfills_retire_etags(client, user, monkeypatch):
+    # Backfills rewrite derived data without touching any user's data version
+    _, headers = user
+    etag = (await client.get("/api/suggest", headers=headers)).headers["etag"]
+    monkeypatch.setattr(server.storage, "data_epoch", server.storage.data_epoch + 1)
+    response = await client.get("/api/suggest", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
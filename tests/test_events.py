@@ -0,0 +1,36 @@
+import jwt
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def stream_token(client, headers):
+    response = await client.post("/api/events/token", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_stream_accepts_only_its_own_short_lived_token(client, user):
+    user_id, headers = user
+    body = await stream_token(client, headers)
+    assert body["expires_in"] == server.STREAM_TOKEN_EXPIRE_SECONDS
+
+    assert (await server.get_stream_user(body["token"]))["id"] == user_id
+    # The session token never goes in the stream URL
+    session_token = headers["Authorization"].removeprefix("Bearer ")
+    assert (await client.get("/api/events", params={"token": session_token})).status_code == 401
+
+
+async def test_stream_token_is_not_a_session_token(client, user):
+    _, headers = user
+    token = (await stream_token(client, headers))["token"]
+    response = await client.get("/api/entries", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+
+async def test_expired_stream_token_is_rejected(client, user):
+    user_id, _ = user
+    token = jwt.encode({"sub": user_id, "scope": server.STREAM_TOKEN_SCOPE, "exp": 0}, server.SECRET_KEY, algorithm=server.ALGORITHM)
+    assert (await client.get("/api/events", params={"token": token})).status_code == 401
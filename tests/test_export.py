@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_csv_export_streams_every_row(client, user, import_entries, entry_row, monkeypatch):
+    # Several flushes, and no row cap
+    monkeypatch.setattr(server, "EXPORT_BATCH_SIZE", 2)
+    _, headers = user
+    await import_entries(headers, [entry_row(f"Task {day}", day, tags=["a", "b"]) for day in range(1, 6)])
+
+    response = await client.get("/api/export/csv", headers=headers)
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == server.CSV_EXPORT_HEADER
+    assert [r[0] for r in rows[1:]] == [f"Task {day}" for day in range(5, 0, -1)]
+    assert rows[1][4:] == ["1.0", "a, b"]
+
+    # Compressed on request; the client decodes it back to the same CSV
+    gzipped = await client.get("/api/export/csv", headers={**headers, "Accept-Encoding": "gzip"})
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.text == response.text
+
+
+async def test_csv_export_range(client, user, import_entries, entry_row):
+    _, headers = user
+    await import_entries(headers, [entry_row(f"Task {day}", day) for day in range(1, 6)])
+    response = await client.get("/api/export/csv", params={"from": "2026-03-02", "to": "2026-03-03"}, headers=headers)
+    assert [r[0] for r in csv.reader(io.StringIO(response.text))][1:] == ["Task 3", "Task 2"]
+
+
+async def test_ndjson_export_oldest_first(client, user, import_entries, entry_row):
+    user_id, headers = user
+    await import_entries(headers, [entry_row(f"Task {day}", day) for day in (3, 1, 2)])
+
+    response = await client.get("/api/export", params={"format": "ndjson"}, headers=headers)
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["task_name"] for r in rows] == ["Task 1", "Task 2", "Task 3"]
+    assert {r["user_id"] for r in rows} == {user_id}
+    assert datetime.fromisoformat(rows[0]["start_time"]) == datetime(2026, 3, 1, 9, tzinfo=timezone.utc)
+
+
+async def test_org_export_needs_the_admin_role(client, user):
+    _, headers = user
+    assert (await client.get("/api/export", params={"scope": "org"}, headers=headers)).status_code == 403
+
+
+async def test_parquet_export(client, user, import_entries, entry_row, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(server, "EXPORT_BATCH_SIZE", 2)
+    _, headers = user
+    await import_entries(headers, [entry_row(f"Task {day}", day, tags=["x"]) for day in range(1, 6)])
+
+    response = await client.get("/api/export", params={"format": "parquet"}, headers=headers)
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column_names == server.EXPORT_FIELDS
+    assert table.column("task_name").to_pylist() == [f"Task {day}" for day in range(1, 6)]
+    assert table.column("tags").to_pylist()[0] == ["x"]
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+
+import server
+from metrics import MongoCommandMetrics
+
+pytestmark = pytest.mark.anyio
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+async def test_requests_are_labelled_by_route_template(client, user):
+    _, headers = user
+    labels = {"method": "GET", "route": "/api/entries/{entry_id}", "status": "404"}
+    before = sample("http_requests_total", **labels)
+
+    await client.get("/api/entries/some-raw-id", headers=headers)
+
+    assert sample("http_requests_total", **labels) == before + 1
+    body = (await client.get("/metrics")).text
+    assert "some-raw-id" not in body
+    assert 'route="/api/entries/{entry_id}"' in body
+
+
+async def test_metrics_token(client, monkeypatch):
+    monkeypatch.setattr(server, "METRICS_TOKEN", "secret")
+    assert (await client.get("/metrics")).status_code == 401
+    assert (await client.get("/metrics", headers={"Authorization": "Bearer secret"})).status_code == 200
+
+
+def test_mongo_commands_are_labelled_by_collection():
+    listener = MongoCommandMetrics()
+    before = sample("mongo_command_duration_seconds_count", command="getMore", collection="time_entries")
+    failures = sample("mongo_command_failures_total", command="ping", collection="")
+
+    # getMore names its collection in a field of its own; database commands have none
+    listener.started(SimpleNamespace(connection_id=("db", 1), request_id=1, command_name="getMore", command={"getMore": 42, "collection": "time_entries"}))
+    listener.succeeded(SimpleNamespace(connection_id=("db", 1), request_id=1, command_name="getMore", duration_micros=1500))
+    listener.started(SimpleNamespace(connection_id=("db", 1), request_id=2, command_name="ping", command={"ping": 1}))
+    listener.failed(SimpleNamespace(connection_id=("db", 1), request_id=2, command_name="ping", duration_micros=100))
+
+    assert sample("mongo_command_duration_seconds_count", command="getMore", collection="time_entries") == before + 1
+    assert sample("mongo_command_failures_total", command="ping", collection="") == failures + 1
+    assert listener.collections == {}
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from storage import MongoStorage
+
+pytestmark = pytest.mark.anyio
+
+
+class MarkerCollection:
+    """migrations stand-in with the claim semantics of an _id upsert: a marker that exists but does
+    not match the filter makes the upsert fail with DuplicateKeyError."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one_and_update(self, query, update, upsert=False):
+        doc = self.docs.get(query["_id"])
+        if doc is None:
+            self.docs[query["_id"]] = {"_id": query["_id"], **update["$set"]}
+            return None
+        # Leases here never lapse within a test, so only the owner can reclaim
+        if "completed_at" in doc or doc.get("owner") != update["$set"]["owner"]:
+            raise DuplicateKeyError("E11000 duplicate key error index: _id_")
+        doc.update(update["$set"])
+        return doc
+
+    async def find_one(self, query, projection=None):
+        return self.docs.get(query["_id"])
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs[query["_id"]]
+        doc.update(update.get("$set", {}))
+        for field in update.get("$unset", {}):
+            doc.pop(field, None)
+
+
+def worker(db):
+    return MongoStorage({"app": db}, "app")
+
+
+async def test_each_migration_runs_on_one_worker(monkeypatch):
+    monkeypatch.setattr("storage.MIGRATION_POLL_SECONDS", 0.01)
+    db = type("FakeDB", (), {"migrations": MarkerCollection()})()
+    runs = []
+
+    async def migrate():
+        runs.append("migrated")
+        await asyncio.sleep(0.05)
+
+    first, second = worker(db), worker(db)
+    await asyncio.gather(first.run_migration("m", migrate), second.run_migration("m", migrate))
+
+    assert runs == ["migrated"]
+    assert db.migrations.docs["m"]["status"] == "completed"
+    # A later startup finds the marker completed and skips it
+    await worker(db).run_migration("m", migrate)
+    assert runs == ["migrated"]
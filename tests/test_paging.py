@@ -0,0 +1,33 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cursor_paging_both_directions(client, user, import_entries, entry_row):
+    _, headers = user
+    await import_entries(headers, [entry_row(f"Task {day}", day) for day in range(1, 8)])
+
+    pages = []
+    params = {"limit": 3}
+    while True:
+        page = (await client.get("/api/entries", params=params, headers=headers)).json()
+        pages.append([e["task_name"] for e in page["entries"]])
+        if not page["next_cursor"]:
+            break
+        params = {"limit": 3, "after": page["next_cursor"]}
+
+    # Newest first, no gaps or repeats across pages
+    assert pages == [["Task 7", "Task 6", "Task 5"], ["Task 4", "Task 3", "Task 2"], ["Task 1"]]
+
+    # Walking back from the last page returns the page before it, still newest first
+    back = (await client.get("/api/entries", params={"limit": 3, "before": page["prev_cursor"]}, headers=headers)).json()
+    assert [e["task_name"] for e in back["entries"]] == ["Task 4", "Task 3", "Task 2"]
+    back = (await client.get("/api/entries", params={"limit": 3, "before": back["prev_cursor"]}, headers=headers)).json()
+    assert [e["task_name"] for e in back["entries"]] == ["Task 7", "Task 6", "Task 5"]
+    assert back["prev_cursor"] is None
+
+
+async def test_paging_rejects_both_cursors(client, user):
+    _, headers = user
+    response = await client.get("/api/entries", params={"after": "x", "before": "y"}, headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def projects_by_id(client, headers):
+    return {p["id"]: p for p in (await client.get("/api/projects", headers=headers)).json()}
+
+
+async def wait_for_job(client, headers, job_id):
+    for _ in range(100):
+        job = (await client.get(f"/api/jobs/{job_id}", headers=headers)).json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+async def test_foreign_projects_are_rejected(client, make_user, import_entries, entry_row, create_project):
+    _, owner = await make_user()
+    _, other = await make_user()
+    project = await create_project(owner, "Private")
+
+    response = await client.post("/api/timer/start", json={"task_name": "x", "project_id": project, "tags": []}, headers=other)
+    assert response.status_code == 400
+    result = await import_entries(other, [entry_row("x", 1, project_id=project)])
+    assert (result["inserted"], result["failed"]) == (0, 1)
+
+    counters = (await projects_by_id(client, owner))[project]
+    assert (counters["entries_count"], counters["total_duration"]) == (0, 0)
+
+
+async def test_project_delete_cascade_reassigns_in_batches(client, user, import_entries, entry_row, create_project, assert_consistent, monkeypatch):
+    monkeypatch.setattr(server, "PROJECT_DELETE_BATCH_SIZE", 3)
+    user_id, headers = user
+    old = await create_project(headers, "Old")
+    new = await create_project(headers, "New")
+    await import_entries(headers, [entry_row(f"Task {day}", day, project_id=old) for day in range(1, 9)])
+
+    response = await client.delete(f"/api/projects/{old}", params={"reassign_to": new}, headers=headers)
+    assert response.status_code == 202
+    job = await wait_for_job(client, headers, response.json()["job"]["id"])
+
+    assert (job["status"], job["processed"], job["total"]) == ("completed", 8, 8)
+    projects = await projects_by_id(client, headers)
+    assert list(projects) == [new]
+    assert projects[new]["entries_count"] == 8
+    assert await server.storage.entries.count_for_project(user_id, old) == 0
+    await assert_consistent(user_id)
+
+
+async def test_project_delete_clears_project_without_target(client, user, import_entries, entry_row, create_project, assert_consistent):
+    user_id, headers = user
+    project = await create_project(headers, "Gone")
+    await import_entries(headers, [entry_row("Task", 1, project_id=project)])
+
+    response = await client.delete(f"/api/projects/{project}", headers=headers)
+    await wait_for_job(client, headers, response.json()["job"]["id"])
+
+    entries = (await client.get("/api/entries", headers=headers)).json()["entries"]
+    assert [e["project_id"] for e in entries] == [None]
+    await assert_consistent(user_id)
+
+
+async def test_project_delete_validates_target(client, user, create_project):
+    _, headers = user
+    project = await create_project(headers, "Solo")
+    response = await client.delete(f"/api/projects/{project}", params={"reassign_to": project}, headers=headers)
+    assert response.status_code == 400
+    response = await client.delete("/api/projects/missing", headers=headers)
+    assert response.status_code == 404
+
+
+async def test_reassign_target_cannot_be_deleted_mid_cascade(client, user, import_entries, entry_row, create_project, assert_consistent, monkeypatch):
+    user_id, headers = user
+    old = await create_project(headers, "Old")
+    new = await create_project(headers, "New")
+    await import_entries(headers, [entry_row("Task", 1, project_id=old)])
+
+    # Hold the job before its first batch
+    release = asyncio.Event()
+    reassign_project = server.storage.entries.reassign_project
+
+    async def held(*args, **kwargs):
+        await release.wait()
+        return await reassign_project(*args, **kwargs)
+
+    monkeypatch.setattr(server.storage.entries, "reassign_project", held)
+    job = (await client.delete(f"/api/projects/{old}", params={"reassign_to": new}, headers=headers)).json()["job"]
+
+    assert (await client.delete(f"/api/projects/{new}", headers=headers)).status_code == 409
+    release.set()
+    await wait_for_job(client, headers, job["id"])
+
+    assert (await projects_by_id(client, headers))[new]["entries_count"] == 1
+    await assert_consistent(user_id)
+
+
+async def test_cascade_falls_back_when_target_disappears(client, user, import_entries, entry_row, create_project, monkeypatch):
+    user_id, headers = user
+    old = await create_project(headers, "Old")
+    new = await create_project(headers, "New")
+    await import_entries(headers, [entry_row("Task", 1, project_id=old)])
+
+    # The target vanishes between the job's creation and its first batch, as in a race with the 409 check
+    claim = server.storage.jobs.claim
+
+    async def delete_target_then_claim(*args, **kwargs):
+        await server.storage.projects.delete(new, user_id)
+        return await claim(*args, **kwargs)
+
+    monkeypatch.setattr(server.storage.jobs, "claim", delete_target_then_claim)
+    job = (await client.delete(f"/api/projects/{old}", params={"reassign_to": new}, headers=headers)).json()["job"]
+    await wait_for_job(client, headers, job["id"])
+
+    entries = (await client.get("/api/entries", headers=headers)).json()["entries"]
+    assert [e["project_id"] for e in entries] == [None]
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def projects_by_id(client, headers):
+    return {p["id"]: p for p in (await client.get("/api/projects", headers=headers)).json()}
+
+
+async def test_rollups_and_counters_follow_every_write(client, user, import_entries, entry_row, create_project, assert_consistent):
+    user_id, headers = user
+    alpha = await create_project(headers, "Alpha")
+    beta = await create_project(headers, "Beta")
+    await import_entries(headers, [entry_row(f"Task {day}", day, project_id=alpha) for day in range(1, 6)])
+    await assert_consistent(user_id)
+
+    projects = await projects_by_id(client, headers)
+    assert (projects[alpha]["entries_count"], projects[alpha]["total_duration"]) == (5, 5 * 3600)
+    assert projects[alpha]["last_used"].startswith("2026-03-05")
+
+    entries = (await client.get("/api/entries", headers=headers)).json()["entries"]
+
+    # PUT moves one entry between projects
+    await client.put(f"/api/entries/{entries[0]['id']}", json={"project_id": beta}, headers=headers)
+    await assert_consistent(user_id)
+
+    # Batch PATCH moves two more
+    await client.patch("/api/entries", json={"entries": [
+        {"id": entries[1]["id"], "project_id": beta},
+        {"id": entries[2]["id"], "task_name": "Renamed"},
+    ]}, headers=headers)
+    await assert_consistent(user_id)
+
+    # Single and batch deletes
+    await client.delete(f"/api/entries/{entries[3]['id']}", headers=headers)
+    await client.post("/api/entries/delete", json={"ids": [entries[0]["id"]]}, headers=headers)
+    await assert_consistent(user_id)
+
+    # A stopped timer counts; a running one doesn't yet
+    await client.post("/api/timer/start", json={"task_name": "Live", "project_id": alpha, "tags": []}, headers=headers)
+    await client.post("/api/timer/stop", headers=headers)
+    await client.post("/api/timer/start", json={"task_name": "Live", "project_id": alpha, "tags": []}, headers=headers)
+    await assert_consistent(user_id)
+
+    projects = await projects_by_id(client, headers)
+    assert projects[alpha]["entries_count"] == 3
+    assert projects[beta]["entries_count"] == 1
+
+
+async def test_weekly_summary_reads_the_rollups(client, user, import_entries):
+    user_id, headers = user
+    today = datetime.now(timezone.utc).date()
+    monday = today - timedelta(days=today.weekday())
+    await import_entries(headers, [
+        {"task_name": task, "start_time": f"{day}T00:00:00Z", "end_time": f"{day}T01:00:00Z"}
+        for task, day in (("Monday", monday), ("Also Monday", monday), ("Today", today))
+    ])
+
+    async def weekly():
+        summaries = (await client.get("/api/entries/summary/weekly", headers=headers)).json()["summaries"]
+        return {s["date"]: (s["entries_count"], s["total_duration"]) for s in summaries if s["entries_count"]}
+
+    expected = {}
+    for day in (monday, monday, today):
+        count, duration = expected.get(day.isoformat(), (0, 0))
+        expected[day.isoformat()] = (count + 1, duration + 3600)
+    assert await weekly() == expected
+
+    # Lost rollups are what rebuild_rollups.py repairs
+    for key in [key for key in server.storage.rollups if key[0] == user_id]:
+        del server.storage.rollups[key]
+    assert await weekly() == {}
+    await server.storage.summaries.rebuild_rollups(user_id)
+    assert await weekly() == expected
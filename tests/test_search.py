@@ -0,0 +1,44 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_search_ranks_by_field_weight(client, user, import_entries, entry_row):
+    _, headers = user
+    await import_entries(headers, [
+        entry_row("Weekly sync", 1, description="quarterly numbers"),
+        entry_row("Planning", 2, tags=["quarterly"]),
+        entry_row("Quarterly report", 3),
+        entry_row("Unrelated", 4),
+    ])
+
+    response = await client.get("/api/entries/search", params={"q": "quarterly"}, headers=headers)
+    assert response.status_code == 200
+    # task_name outweighs tags, which outweigh description
+    assert [e["task_name"] for e in response.json()["entries"]] == ["Quarterly report", "Planning", "Weekly sync"]
+
+    # A prefix matches too, and whole-word matches rank above prefix-only ones
+    response = await client.get("/api/entries/search", params={"q": "quart report"}, headers=headers)
+    assert [e["task_name"] for e in response.json()["entries"]][0] == "Quarterly report"
+
+
+async def test_search_follows_edits(client, user, import_entries, entry_row):
+    _, headers = user
+    await import_entries(headers, [entry_row("Old name", 1)])
+    entry = (await client.get("/api/entries/search", params={"q": "old"}, headers=headers)).json()["entries"][0]
+
+    await client.put(f"/api/entries/{entry['id']}", json={"task_name": "Xylophone audit"}, headers=headers)
+
+    assert (await client.get("/api/entries/search", params={"q": "old"}, headers=headers)).json()["entries"] == []
+    found = (await client.get("/api/entries/search", params={"q": "xylo"}, headers=headers)).json()["entries"]
+    assert [e["id"] for e in found] == [entry["id"]]
+    assert "search_terms" not in found[0]
+
+
+async def test_search_is_scoped_to_the_user(client, make_user, import_entries, entry_row):
+    _, owner = await make_user()
+    _, other = await make_user()
+    await import_entries(owner, [entry_row("Confidential merger", 1)])
+
+    response = await client.get("/api/entries/search", params={"q": "merger"}, headers=other)
+    assert response.json()["entries"] == []
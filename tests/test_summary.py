@@ -0,0 +1,57 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def row(task_name, start, end):
+    return {"task_name": task_name, "start_time": start, "end_time": end}
+
+
+async def summary(client, headers, **params):
+    response = await client.get("/api/entries/summary", params=params, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_local_days_across_a_dst_change(client, user, import_entries):
+    _, headers = user
+    # New York moves to EDT at 02:00 on 2026-03-08, so that local day is 23 hours long
+    await import_entries(headers, [
+        row("Late Saturday", "2026-03-08T04:30:00Z", "2026-03-08T05:00:00Z"),    # 23:30 EST, 7 March
+        row("Early Sunday", "2026-03-08T05:30:00Z", "2026-03-08T06:00:00Z"),     # 00:30 EST, 8 March
+        row("Late Sunday", "2026-03-09T03:30:00Z", "2026-03-09T04:00:00Z"),      # 23:30 EDT, 8 March
+        row("Late Monday", "2026-03-10T03:30:00Z", "2026-03-10T04:00:00Z"),      # 23:30 EDT, 9 March
+        row("Early Tuesday", "2026-03-10T04:30:00Z", "2026-03-10T05:00:00Z"),    # 00:30 EDT, 10 March
+    ])
+
+    body = await summary(client, headers, **{"from": "2026-03-07", "to": "2026-03-09", "tz": "America/New_York"})
+    assert [(b["date"], b["entries_count"]) for b in body["buckets"]] == [
+        ("2026-03-07", 1), ("2026-03-08", 2), ("2026-03-09", 1)
+    ]
+    # 'to' includes all of its local day and nothing after it
+    assert (body["to"], body["entries_count"], body["total_duration"]) == ("2026-03-09", 4, 4 * 1800)
+
+
+async def test_to_is_inclusive_and_buckets_widen(client, user, import_entries, entry_row):
+    _, headers = user
+    await import_entries(headers, [entry_row("Monday", 2), entry_row("Sunday", 8), entry_row("Next Monday", 9)])
+
+    body = await summary(client, headers, **{"from": "2026-03-02", "to": "2026-03-08"})
+    assert body["entries_count"] == 2
+
+    # A week bucket is reported whole even when the range ends inside it
+    body = await summary(client, headers, **{"from": "2026-03-04", "to": "2026-03-09", "granularity": "week"})
+    assert (body["from"], body["to"]) == ("2026-03-02", "2026-03-15")
+    assert [(b["date"], b["entries_count"]) for b in body["buckets"]] == [("2026-03-02", 2), ("2026-03-09", 1)]
+
+
+@pytest.mark.parametrize("params", [
+    {"from": "9999-12-30", "to": "9999-12-31"},
+    {"from": "9999-12-01", "to": "9999-12-31", "granularity": "month"},
+    {"from": "9999-12-27", "to": "9999-12-29", "granularity": "week"},
+    {"to": "0001-01-05"},
+])
+async def test_out_of_range_dates_are_rejected(client, user, params):
+    _, headers = user
+    response = await client.get("/api/entries/summary", params=params, headers=headers)
+    assert response.status_code == 400
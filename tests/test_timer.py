@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+import server
+from storage import TIMER_START_ATTEMPTS, MongoTimeEntryRepository, TimerConflict
+
+pytestmark = pytest.mark.anyio
+
+
+class RacingCollection:
+    """time_entries stand-in where other requests start timers between our stop and insert.
+
+    ``racing_starts`` inserts fail with DuplicateKeyError (the running-timer index), each leaving
+    behind the concurrent timer that won, which the next stop then finds.
+    """
+
+    def __init__(self, racing_starts):
+        self.racing_starts = racing_starts
+        self.running = None
+        self.inserted = []
+
+    async def find_one_and_update(self, query, update, **kwargs):
+        previous, self.running = self.running, None
+        return previous
+
+    async def insert_one(self, doc):
+        if self.racing_starts:
+            self.racing_starts -= 1
+            self.running = {"id": f"concurrent-{self.racing_starts}", "user_id": doc["user_id"]}
+            raise DuplicateKeyError("E11000 duplicate key error index: user_running")
+        self.inserted.append(doc)
+        self.running = doc
+
+
+class FakeStorage:
+    def __init__(self, collection):
+        self.db = type("FakeDB", (), {"time_entries": collection})()
+
+
+def new_timer():
+    now = datetime.now(timezone.utc)
+    return {"id": "mine", "user_id": "u1", "task_name": "Work", "description": "", "tags": [], "start_time": now}
+
+
+async def test_start_retries_after_losing_the_race():
+    collection = RacingCollection(racing_starts=1)
+    stopped = await MongoTimeEntryRepository(FakeStorage(collection)).start(new_timer())
+
+    assert [doc["id"] for doc in collection.inserted] == ["mine"]
+    # The timer that won the race is stopped rather than left running next to ours
+    assert [entry["id"] for entry in stopped] == ["concurrent-0"]
+
+
+async def test_start_gives_up_after_repeated_races():
+    collection = RacingCollection(racing_starts=TIMER_START_ATTEMPTS)
+    with pytest.raises(TimerConflict):
+        await MongoTimeEntryRepository(FakeStorage(collection)).start(new_timer())
+    assert collection.inserted == []
+
+
+async def test_start_conflict_returns_409(client, user, monkeypatch):
+    async def lose_every_race(entry):
+        raise TimerConflict(entry["user_id"])
+
+    monkeypatch.setattr(server.storage.entries, "start", lose_every_race)
+    _, headers = user
+    response = await client.post("/api/timer/start", json={"task_name": "Work", "tags": []}, headers=headers)
+    assert response.status_code == 409
+
+
+async def test_start_stops_the_running_timer(client, user):
+    _, headers = user
+    first = (await client.post("/api/timer/start", json={"task_name": "First", "tags": []}, headers=headers)).json()
+    second = (await client.post("/api/timer/start", json={"task_name": "Second", "tags": []}, headers=headers)).json()
+
+    assert (await client.get(f"/api/entries/{first['id']}", headers=headers)).json()["is_running"] is False
+    assert (await client.get("/api/timer/current", headers=headers)).json()["id"] == second["id"]
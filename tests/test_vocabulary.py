@@ -0,0 +1,68 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def suggest(client, headers, prefix):
+    response = await client.get("/api/suggest", params={"prefix": prefix}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    return {t["value"]: t["count"] for t in body["tasks"]}, {t["value"]: t["count"] for t in body["tags"]}
+
+
+async def test_vocabulary_counts_follow_writes(client, user, import_entries, entry_row):
+    _, headers = user
+    await import_entries(headers, [
+        entry_row("Deploy", 1, tags=["ops"]),
+        entry_row("deploy", 2, tags=["ops", "Ops"]),
+        entry_row("Design review", 3),
+    ])
+
+    # Case-insensitive keys; a tag counts once per entry
+    tasks, tags = await suggest(client, headers, "de")
+    assert tasks == {"deploy": 2, "Design review": 1}
+    assert tags == {}
+    tasks, tags = await suggest(client, headers, "op")
+    assert tags == {"Ops": 2}
+
+    entries = {e["task_name"]: e for e in (await client.get("/api/entries", headers=headers)).json()["entries"]}
+
+    # Renames release the old term and count the new one
+    await client.put(f"/api/entries/{entries['Deploy']['id']}", json={"task_name": "Rollback"}, headers=headers)
+    tasks, _ = await suggest(client, headers, "")
+    assert tasks == {"deploy": 1, "Design review": 1, "Rollback": 1}
+
+    # Deletes release; a term whose count reaches zero disappears
+    await client.delete(f"/api/entries/{entries['deploy']['id']}", headers=headers)
+    tasks, tags = await suggest(client, headers, "")
+    assert tasks == {"Design review": 1, "Rollback": 1}
+    # The spelling shown is the most recently used one
+    assert tags == {"Ops": 1}
+
+    await client.patch("/api/entries", json={"entries": [{"id": entries["Deploy"]["id"], "tags": []}]}, headers=headers)
+    _, tags = await suggest(client, headers, "")
+    assert tags == {}
+
+
+async def test_timer_start_counts_its_task(client, user):
+    _, headers = user
+    await client.post("/api/timer/start", json={"task_name": "Standup", "tags": ["meeting"]}, headers=headers)
+    tasks, tags = await suggest(client, headers, "st")
+    assert tasks == {"Standup": 1}
+    _, tags = await suggest(client, headers, "meet")
+    assert tags == {"meeting": 1}
+
+
+async def test_rebuild_matches_maintained_counts(client, user, import_entries, entry_row):
+    user_id, headers = user
+    await import_entries(headers, [entry_row("Deploy", 1, tags=["ops"]), entry_row("deploy", 2), entry_row("Review", 3)])
+    entry = (await client.get("/api/entries", headers=headers)).json()["entries"][0]
+    await client.put(f"/api/entries/{entry['id']}", json={"task_name": "Retro"}, headers=headers)
+    maintained = await suggest(client, headers, "")
+
+    # Rebuilding, and rebuilding again, arrives at the same counts rather than adding to them
+    await server.storage.vocabulary.rebuild(user_id)
+    await server.storage.vocabulary.rebuild(user_id)
+    assert await suggest(client, headers, "") == maintained